@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Per-box cost of building a `BoundingBox` and reading its extents and tile grid, with and without the cached extents.
+
+Usage: python benchmarks/bench_box.py [--number N]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from webmercator import BoundingBox, Grid, Point  # noqa: E402
+
+CENTER = Point(latitude=35.771834, longitude=-78.677972)
+
+
+class UncachedBoundingBox(BoundingBox):
+    """ The extent and corner properties as they were before caching: every read reruns `_bound_vertices` """
+
+    @property
+    def min_longitude(self):
+        return min([v.longitude for v in self.box_vertices])
+
+    @property
+    def max_longitude(self):
+        return max([v.longitude for v in self.box_vertices])
+
+    @property
+    def min_latitude(self):
+        return min([v.latitude for v in self.box_vertices])
+
+    @property
+    def max_latitude(self):
+        return max([v.latitude for v in self.box_vertices])
+
+    @property
+    def vertex_top_left(self):
+        return Point(latitude=self.max_latitude, longitude=self.min_longitude, zoom_level=self.zoom_level)
+
+    @property
+    def vertex_bottom_right(self):
+        return Point(latitude=self.min_latitude, longitude=self.max_longitude, zoom_level=self.zoom_level)
+
+    @property
+    def min_pixel_x(self):
+        return self.vertex_top_left.pixel_x
+
+    @property
+    def max_pixel_x(self):
+        return self.vertex_bottom_right.pixel_x
+
+    @property
+    def min_pixel_y(self):
+        return self.vertex_top_left.pixel_y
+
+    @property
+    def max_pixel_y(self):
+        return self.vertex_bottom_right.pixel_y
+
+    @property
+    def min_tile_x(self):
+        return self.vertex_top_left.tile_x
+
+    @property
+    def max_tile_x(self):
+        return self.vertex_bottom_right.tile_x
+
+    @property
+    def min_tile_y(self):
+        return self.vertex_top_left.tile_y
+
+    @property
+    def max_tile_y(self):
+        return self.vertex_bottom_right.tile_y
+
+    @property
+    def pixel_width(self):
+        return max(int(self.vertex_bottom_right.pixel_x - self.vertex_top_left.pixel_x), 1)
+
+    @property
+    def pixel_height(self):
+        return max(int(self.vertex_bottom_right.pixel_y - self.vertex_top_left.pixel_y), 1)
+
+    @property
+    def tile_grid(self):
+        return Grid(vertex=(self.min_tile_x, self.min_tile_y), width=self.tile_width, height=self.tile_height,
+                    zoom_level=self.zoom_level)
+
+
+def box_request(radius, zoom_level, box_type=BoundingBox):
+    """ What a radius search request does with its box """
+    bb = box_type(CENTER, radius=radius, zoom_level=zoom_level)
+    bb.min_latitude, bb.max_latitude, bb.min_longitude, bb.max_longitude
+    bb.min_pixel_x, bb.min_pixel_y, bb.max_pixel_x, bb.max_pixel_y
+    bb.tile_width, bb.tile_height, bb.pixel_width, bb.pixel_height
+    return bb.tile_grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000, help='boxes per measurement')
+    args = parser.parse_args(argv)
+
+    print('{:>8} {:>6} {:>16} {:>16}'.format('radius', 'zoom', 'uncached usec', 'cached usec'))
+    for radius in (0.5, 2.5, 25):
+        for zoom_level in (10, 14, 18):
+            costs = []
+            for box_type in (UncachedBoundingBox, BoundingBox):
+                best = min(timeit.repeat(lambda: box_request(radius, zoom_level, box_type), number=args.number,
+                                         repeat=3))
+                costs.append(best / args.number * 1e6)
+            print('{:>8} {:>6} {:>16.1f} {:>16.1f}'.format(radius, zoom_level, *costs))
+
+
+if __name__ == '__main__':
+    main()
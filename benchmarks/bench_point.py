@@ -0,0 +1,78 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Memory per `Point` and throughput of repeated derived-coordinate reads.
+
+Usage: python benchmarks/bench_point.py [--count N]
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from webmercator import Point  # noqa: E402
+
+
+def make_points(count, seed=8):
+    rand = random.Random(seed)
+    return [Point(latitude=rand.uniform(-80, 80), longitude=rand.uniform(-180, 180)) for _ in range(count)]
+
+
+def read_all(points):
+    """ What a tile bucketing loop does per point """
+    for p in points:
+        p.pixel_x, p.pixel_y, p.tile_x, p.tile_y, p.meter_x, p.meter_y
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000, help='points per measurement')
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    points = make_points(args.count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('bytes per point (incl. coordinate floats): {:.1f}'.format(current / args.count))
+
+    # keep collector pauses over millions of live objects out of the timings
+    gc.disable()
+    first = min(timeit.repeat(lambda: read_all(points), number=1, repeat=1))
+    again = min(timeit.repeat(lambda: read_all(points), number=1, repeat=3))
+    print('first read of six derived values: {:.2f} usec per point'.format(first / args.count * 1e6))
+    print('repeated reads of six derived values: {:.2f} usec per point'.format(again / args.count * 1e6))
+
+    build = min(timeit.repeat(lambda: make_points(args.count // 10), number=1, repeat=3))
+    gc.enable()
+    print('construction: {:.2f} usec per point'.format(build / (args.count // 10) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,482 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmark suite for the Point, BoundingBox and Grid hot paths.
+
+Every case reports the best time per operation over several repeats and the tracemalloc peak of one run.
+
+Usage:
+    python benchmarks/suite.py                               # run everything, print a table
+    python benchmarks/suite.py --output results.json         # also save results
+    python benchmarks/suite.py --compare base.json           # show change against saved results
+    python benchmarks/suite.py --filter grid --quick         # subset, smaller workloads
+"""
+from __future__ import division, print_function
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from webmercator import BoundingBox, ClusterIndex, Grid, Heatmap, Point, PointArray, TileIndex, TileSet, \
+    buffers, instrument, tiles  # noqa: E402
+from webmercator.batch import BACKENDS  # noqa: E402
+
+CASES = []
+
+
+def case(name):
+    """ Register a case; the decorated function takes a size scale and returns (workload, operations) """
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+def coordinates(count, seed=9):
+    rand = random.Random(seed)
+    return [(rand.uniform(-80, 80), rand.uniform(-180, 180)) for _ in range(count)]
+
+
+# Point: each workload builds fresh points, so cached derived values never hide the conversion cost
+
+@case('point.geo_to_meter')
+def geo_to_meter(scale):
+    coords = coordinates(10000 * scale)
+
+    def run():
+        for lat, lon in coords:
+            p = Point(latitude=lat, longitude=lon)
+            p.meter_x, p.meter_y
+    return run, len(coords)
+
+
+@case('point.geo_to_pixel')
+def geo_to_pixel(scale):
+    coords = coordinates(10000 * scale)
+
+    def run():
+        for lat, lon in coords:
+            p = Point(latitude=lat, longitude=lon)
+            p.pixel_x, p.pixel_y
+    return run, len(coords)
+
+
+@case('point.geo_to_tile')
+def geo_to_tile(scale):
+    coords = coordinates(10000 * scale)
+
+    def run():
+        for lat, lon in coords:
+            p = Point(latitude=lat, longitude=lon)
+            p.tile_x, p.tile_y
+    return run, len(coords)
+
+
+def register_precision_cases():
+    for name in ('fast', 'e7'):
+        def geo_to_tile_precision(scale, name=name):
+            coords = coordinates(10000 * scale)
+
+            def run():
+                for lat, lon in coords:
+                    p = Point(latitude=lat, longitude=lon, precision=name)
+                    p.tile_x, p.tile_y
+            return run, len(coords)
+
+        case('point.geo_to_tile[{}]'.format(name))(geo_to_tile_precision)
+
+
+register_precision_cases()
+
+
+@case('point.meter_to_geo')
+def meter_to_geo(scale):
+    meters = [(Point(latitude=lat, longitude=lon).meter_x, Point(latitude=lat, longitude=lon).meter_y)
+              for lat, lon in coordinates(10000 * scale)]
+
+    def run():
+        for x, y in meters:
+            p = Point(meter_x=x, meter_y=y)
+            p.latitude, p.longitude
+    return run, len(meters)
+
+
+@case('point.pixel_to_geo')
+def pixel_to_geo(scale):
+    pixels = [(p.pixel_x, p.pixel_y) for p in (Point(latitude=lat, longitude=lon)
+                                               for lat, lon in coordinates(10000 * scale))]
+
+    def run():
+        for x, y in pixels:
+            p = Point(pixel_x=x, pixel_y=y)
+            p.latitude, p.longitude
+    return run, len(pixels)
+
+
+@case('point.tile_to_geo')
+def tile_to_geo(scale):
+    tiles = [(p.tile_x, p.tile_y) for p in (Point(latitude=lat, longitude=lon)
+                                            for lat, lon in coordinates(10000 * scale))]
+
+    def run():
+        for x, y in tiles:
+            p = Point(tile_x=x, tile_y=y)
+            p.latitude, p.longitude
+    return run, len(tiles)
+
+
+def box_cases():
+    for radius in (0.5, 5, 50):
+        for zoom_level in (10, 14, 18):
+            yield radius, zoom_level
+
+
+def register_box_cases():
+    center = Point(latitude=35.771834, longitude=-78.677972)
+
+    for radius, zoom_level in box_cases():
+        def build(scale, radius=radius, zoom_level=zoom_level):
+            count = 500 * scale
+
+            def run():
+                for _ in range(count):
+                    bb = BoundingBox(center, radius=radius, zoom_level=zoom_level)
+                    bb.min_latitude, bb.max_latitude, bb.min_longitude, bb.max_longitude
+                    bb.min_tile_x, bb.max_tile_x, bb.min_tile_y, bb.max_tile_y
+                    bb.pixel_width, bb.pixel_height
+            return run, count
+
+        case('box.extents[r={},z={}]'.format(radius, zoom_level))(build)
+
+
+register_box_cases()
+
+
+def register_grid_cases():
+    for side in (100, 1000):
+        def iterate(scale, side=side):
+            grid = Grid(vertex=(1000, 1000), width=side - 1, height=side - 1)
+
+            def run():
+                for _ in grid:
+                    pass
+            return run, len(grid)
+
+        def chunks(scale, side=side):
+            grid = Grid(vertex=(1000, 1000), width=side - 1, height=side - 1)
+
+            def run():
+                for _ in grid.chunks():
+                    pass
+            return run, len(grid)
+
+        case('grid.iterate[{0}x{0}]'.format(side))(iterate)
+        case('grid.chunks[{0}x{0}]'.format(side))(chunks)
+
+        for order in ('morton', 'hilbert'):
+            def walk(scale, side=side, order=order):
+                grid = Grid(vertex=(1000, 1000), width=side - 1, height=side - 1, zoom_level=16)
+
+                def run():
+                    for _ in grid.walk(order):
+                        pass
+                return run, len(grid)
+
+            case('grid.walk[{1},{0}x{0}]'.format(side, order))(walk)
+
+
+register_grid_cases()
+
+
+@case('box.tile_grid[r=50,z=16]')
+def box_tile_grid(scale):
+    bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=50, zoom_level=16)
+
+    def run():
+        for _ in bb.tile_grid:
+            pass
+    return run, len(bb.tile_grid)
+
+
+@case('box.tile_grid[instrumented]')
+def box_tile_grid_instrumented(scale):
+    bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=50, zoom_level=16)
+
+    def run():
+        with instrument.recording():
+            for _ in bb.tile_grid:
+                pass
+    return run, len(bb.tile_grid)
+
+
+@case('tileset.union[boxes,z=18]')
+def tileset_union(scale):
+    rand = random.Random(6)
+    grids = [BoundingBox(Point(latitude=rand.uniform(35, 36), longitude=rand.uniform(-79, -78)), radius=5,
+                         zoom_level=18).tile_grid for _ in range(50 * scale)]
+
+    def run():
+        combined = TileSet(zoom_level=18)
+        for grid in grids:
+            combined |= TileSet.from_grid(grid)
+        len(combined)
+    return run, len(grids)
+
+
+def hot_tiles(scale, seed=4):
+    """ Tile requests at zoom 14, most of them for a few hundred popular tiles """
+    rand = random.Random(seed)
+    popular = [(rand.randrange(2 ** 14), rand.randrange(2 ** 14)) for _ in range(300)]
+    return [rand.choice(popular) if rand.random() < 0.9 else (rand.randrange(2 ** 14), rand.randrange(2 ** 14))
+            for _ in range(10000 * scale)]
+
+
+@case('tiles.geo_bounds')
+def tile_geo_bounds(scale):
+    requests = hot_tiles(scale)
+
+    def run():
+        for x, y in requests:
+            tiles.geo_bounds(x, y, 14)
+    return run, len(requests)
+
+
+@case('tiles.geo_bounds[cached]')
+def tile_geo_bounds_cached(scale):
+    requests = hot_tiles(scale)
+
+    def run():
+        cache = tiles.TileBoundsCache(maxsize=1024)
+        for x, y in requests:
+            cache.geo_bounds(x, y, 14)
+    return run, len(requests)
+
+
+def register_batch_cases():
+    for backend in sorted(BACKENDS):
+        def geo_to_tile_batch(scale, backend=backend):
+            coords = coordinates(10000 * scale)
+            latitudes, longitudes = [c[0] for c in coords], [c[1] for c in coords]
+
+            def run():
+                pa = PointArray(latitude=latitudes, longitude=longitudes, backend=backend)
+                pa.tile_x, pa.tile_y
+            return run, len(coords)
+
+        case('batch.geo_to_tile[{}]'.format(backend))(geo_to_tile_batch)
+
+        def geo_to_tile_fast(scale, backend=backend):
+            coords = coordinates(10000 * scale)
+            latitudes, longitudes = [c[0] for c in coords], [c[1] + 720 for c in coords]
+
+            def run():
+                pa = PointArray(latitude=latitudes, longitude=longitudes, backend=backend, precision='fast')
+                pa.tile_x, pa.tile_y
+            return run, len(coords)
+
+        case('batch.geo_to_tile[{},fast]'.format(backend))(geo_to_tile_fast)
+
+        def distances_batch(scale, backend=backend):
+            coords = coordinates(10000 * scale)
+            pa = PointArray(latitude=[c[0] for c in coords], longitude=[c[1] for c in coords], backend=backend)
+            origin = Point(latitude=35.771834, longitude=-78.677972)
+
+            def run():
+                pa.distance_to(origin)
+            return run, len(coords)
+
+        case('batch.distances[{}]'.format(backend))(distances_batch)
+
+        def convert_into(scale, backend=backend):
+            coords = coordinates(10000 * scale)
+            values = array('d', [v for c in coords for v in c])
+            out = buffers.allocate(len(coords))
+
+            def run():
+                buffers.convert_into(values, out, target='tile', backend=backend, chunk_size=4096)
+            return run, len(coords)
+
+        case('buffers.convert_into[{}]'.format(backend))(convert_into)
+
+        def heatmap_add(scale, backend=backend):
+            rand = random.Random(8)
+            coords = [(rand.uniform(35, 37), rand.uniform(-80, -78)) for _ in range(10000 * scale)]
+            points = PointArray(latitude=[c[0] for c in coords], longitude=[c[1] for c in coords], backend=backend)
+
+            def run():
+                Heatmap(range(10, 15), backend=backend).add(points)
+            return run, len(coords)
+
+        case('heatmap.add[{},z=10..14]'.format(backend))(heatmap_add)
+
+
+register_batch_cases()
+
+
+def fleet(scale):
+    """ TileIndex at zoom 12 holding 20000 * scale points around North America """
+    rand = random.Random(5)
+    count = 20000 * scale
+    index = TileIndex(zoom_level=12)
+    index.load(range(count), [rand.uniform(25, 50) for _ in range(count)],
+               [rand.uniform(-125, -65) for _ in range(count)])
+    queries = [Point(latitude=rand.uniform(25, 50), longitude=rand.uniform(-125, -65)) for _ in range(200)]
+    return index, queries
+
+
+@case('index.within[r=10]')
+def index_within(scale):
+    index, queries = fleet(scale)
+
+    def run():
+        for q in queries:
+            index.within(q, 10)
+    return run, len(queries)
+
+
+@case('index.nearest[k=10]')
+def index_nearest(scale):
+    index, queries = fleet(scale)
+
+    def run():
+        for q in queries:
+            index.nearest(q, 10)
+    return run, len(queries)
+
+
+@case('cluster.load[z=16]')
+def cluster_load(scale):
+    rand = random.Random(5)
+    count = 20000 * scale
+    ids = list(range(count))
+    latitudes = [rand.uniform(25, 50) for _ in range(count)]
+    longitudes = [rand.uniform(-125, -65) for _ in range(count)]
+
+    def run():
+        ClusterIndex(max_zoom=16).load(ids, latitudes, longitudes)
+    return run, count
+
+
+@case('cluster.clusters[z=4..12]')
+def cluster_clusters(scale):
+    rand = random.Random(5)
+    count = 20000 * scale
+    index = ClusterIndex(max_zoom=16)
+    index.load(range(count), [rand.uniform(25, 50) for _ in range(count)],
+               [rand.uniform(-125, -65) for _ in range(count)])
+    boxes = [BoundingBox(Point(latitude=rand.uniform(30, 45), longitude=rand.uniform(-115, -75)), radius=200,
+                         zoom_level=zoom_level) for zoom_level in range(4, 13) for _ in range(10)]
+
+    def run():
+        for bb in boxes:
+            index.clusters(bb)
+    return run, len(boxes)
+
+
+def measure(setup, scale, repeat):
+    run, operations = setup(scale)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    gc.collect()
+    gc.disable()
+    try:
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+    finally:
+        gc.enable()
+
+    return {
+        'operations': operations,
+        'seconds': best,
+        'ns_per_op': best / operations * 1e9,
+        'peak_bytes': peak,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT,
+                                         cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--quick', action='store_true', help='smaller workloads, fewer repeats')
+    parser.add_argument('--repeat', type=int, default=None, help='timing repeats per case')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='JSON file from an earlier run to compare against')
+    args = parser.parse_args(argv)
+
+    scale = 1 if args.quick else 5
+    repeat = args.repeat or (3 if args.quick else 5)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    print('{:<32} {:>14} {:>14} {:>10}'.format('case', 'ns per op', 'peak KiB', 'change'))
+    for name, setup in CASES:
+        if args.filter not in name:
+            continue
+
+        result = results[name] = measure(setup, scale, repeat)
+        change = ''
+        if name in baseline:
+            change = '{:+.1f}%'.format((result['ns_per_op'] / baseline[name]['ns_per_op'] - 1) * 100)
+        print('{:<32} {:>14.1f} {:>14.1f} {:>10}'.format(name, result['ns_per_op'], result['peak_bytes'] / 1024,
+                                                         change))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'scale': scale, 'results': results}, f, indent=2,
+                      sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
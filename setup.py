@@ -44,6 +44,11 @@ setup(
         'tests'
     ],
     long_description=read('README.rst'),
+    entry_points={
+        'console_scripts': [
+            'webmercator = webmercator.cli:main',
+        ],
+    },
     classifiers=[
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python :: 2.7',
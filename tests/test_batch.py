@@ -0,0 +1,309 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+import unittest
+
+from webmercator import BoundingBox
+from webmercator import BoundingBoxArray
+from webmercator import Point
+from webmercator import PointArray
+from webmercator.batch import BACKENDS, get_backend
+
+
+class BackendParityMixin(object):
+    """ Checks a batch result against `Point`, element by element """
+
+    backend = None
+
+    def assertParity(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            self.assertEqual(a, e)
+
+
+class TestPointArrayArray(BackendParityMixin, unittest.TestCase):
+
+    backend = 'array'
+
+    def setUp(self):
+        self.latitudes = [35.771834, -33.8688, 0.0, 51.477928, 89.9, -90.0, 85.05112878, 12.123456789]
+        self.longitudes = [-78.677972, 151.2093, 0.0, -0.001545, 540.25, -719.5, 180.0, -180.0]
+        self.zoom_levels = [1, 5, 14, 23]
+
+        self.points = [Point(latitude=lat, longitude=lon) for lat, lon in zip(self.latitudes, self.longitudes)]
+        self.pa = PointArray(latitude=self.latitudes, longitude=self.longitudes, backend=self.backend)
+
+    def test_init_missing_coordinates(self):
+        with self.assertRaises(AttributeError):
+            PointArray(latitude=self.latitudes, backend=self.backend)
+
+    def test_init_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            PointArray(latitude=self.latitudes, longitude=self.longitudes[1:], backend=self.backend)
+
+    def test_init_zoom_level_out_of_bounds(self):
+        self.assertEqual(PointArray(latitude=[0], longitude=[0], zoom_level=-1, backend=self.backend).zoom_level, 1)
+        self.assertEqual(PointArray(latitude=[0], longitude=[0], zoom_level=25, backend=self.backend).zoom_level, 23)
+
+    def test_backend(self):
+        self.assertEqual(self.pa.backend, self.backend)
+
+    def test_len(self):
+        self.assertEqual(len(self.pa), len(self.latitudes))
+
+    def test_getitem(self):
+        pt = self.pa[0]
+        self.assertIsInstance(pt, Point)
+        self.assertEqual(pt.latitude, self.points[0].latitude)
+        self.assertEqual(pt.longitude, self.points[0].longitude)
+
+    def test_from_points(self):
+        pa = PointArray.from_points(self.points, backend=self.backend)
+        self.assertParity(pa.latitude, [p.latitude for p in self.points])
+        self.assertParity(pa.longitude, [p.longitude for p in self.points])
+
+    def test_latitude_clamping(self):
+        self.assertParity(self.pa.latitude, [p.latitude for p in self.points])
+
+    def test_longitude_wrapping(self):
+        self.assertParity(self.pa.longitude, [p.longitude for p in self.points])
+
+    def test_meter(self):
+        self.assertParity(self.pa.meter_x, [p.meter_x for p in self.points])
+        self.assertParity(self.pa.meter_y, [p.meter_y for p in self.points])
+
+    def test_rounding_matches_point(self):
+        rand = random.Random(1)
+        latitudes = [rand.uniform(-85, 85) for _ in range(5000)]
+        longitudes = [rand.uniform(-180, 180) for _ in range(4000)] + [rand.uniform(-1e6, 1e6) for _ in range(1000)]
+        points = [Point(latitude=lat, longitude=lon) for lat, lon in zip(latitudes, longitudes)]
+        pa = PointArray(latitude=latitudes, longitude=longitudes, backend=self.backend)
+        self.assertParity(pa.latitude, [p.latitude for p in points])
+        self.assertParity(pa.longitude, [p.longitude for p in points])
+        self.assertParity(pa.meter_x, [p.meter_x for p in points])
+        self.assertParity(pa.meter_y, [p.meter_y for p in points])
+
+        meters = [rand.uniform(-2e7, 2e7) for _ in range(5000)]
+        pa.meter_y = meters
+        for p, m in zip(points, meters):
+            p.meter_y = m
+        self.assertParity(pa.latitude, [p.latitude for p in points])
+
+    def test_rounding_matches_point_e7(self):
+        rand = random.Random(2)
+        latitudes = [rand.uniform(-85, 85) for _ in range(5000)]
+        longitudes = [rand.uniform(-180, 180) for _ in range(5000)]
+        points = [Point(latitude=lat, longitude=lon, precision='e7') for lat, lon in zip(latitudes, longitudes)]
+        pa = PointArray(latitude=latitudes, longitude=longitudes, backend=self.backend, precision='e7')
+        self.assertParity(pa.latitude, [p.latitude for p in points])
+        self.assertParity(pa.longitude, [p.longitude for p in points])
+        self.assertParity(pa.meter_x, [p.meter_x for p in points])
+        self.assertParity(pa.meter_y, [p.meter_y for p in points])
+
+    def test_pixel_rounding_matches_point(self):
+        rand = random.Random(3)
+        for zl in (1, 12, 23):
+            pixels = [rand.randrange(256 * 2 ** zl) for _ in range(2000)]
+            pa = PointArray(pixel_x=pixels, pixel_y=pixels[::-1], zoom_level=zl, backend=self.backend)
+            points = [Point(pixel_x=x, pixel_y=y, zoom_level=zl) for x, y in zip(pixels, pixels[::-1])]
+            self.assertParity(pa.latitude, [p.latitude for p in points])
+            self.assertParity(pa.longitude, [p.longitude for p in points])
+            self.assertParity(pa.pixel_y, [p.pixel_y for p in points])
+
+        # whole multiples of 0.3515625 degrees project onto half pixels at zoom level 1
+        longitudes = [0.3515625 * k for k in range(-511, 512)]
+        pa = PointArray(latitude=[0.0] * len(longitudes), longitude=longitudes, zoom_level=1, backend=self.backend)
+        self.assertParity(pa.pixel_x, [Point(latitude=0, longitude=lon, zoom_level=1).pixel_x for lon in longitudes])
+
+    def test_non_finite_longitude(self):
+        for value in (float('inf'), float('-inf'), float('nan')):
+            self.assertRaises(ValueError, PointArray, latitude=[0, 0], longitude=[0, value], backend=self.backend)
+
+    def test_pixel_tile(self):
+        for zl in self.zoom_levels:
+            self.pa.zoom_level = zl
+            for p in self.points:
+                p.zoom_level = zl
+
+            self.assertParity(self.pa.pixel_x, [p.pixel_x for p in self.points])
+            self.assertParity(self.pa.pixel_y, [p.pixel_y for p in self.points])
+            self.assertParity(self.pa.tile_x, [p.tile_x for p in self.points])
+            self.assertParity(self.pa.tile_y, [p.tile_y for p in self.points])
+
+    def test_from_meter(self):
+        meter_x = [p.meter_x for p in self.points]
+        meter_y = [p.meter_y for p in self.points]
+        pa = PointArray(meter_x=meter_x, meter_y=meter_y, backend=self.backend)
+        expected = [Point(meter_x=x, meter_y=y) for x, y in zip(meter_x, meter_y)]
+
+        self.assertParity(pa.latitude, [p.latitude for p in expected])
+        self.assertParity(pa.longitude, [p.longitude for p in expected])
+
+    def test_from_pixel(self):
+        for zl in self.zoom_levels:
+            map_size = 256 * 2 ** zl
+            pixel_x = [0, 1, 255, 256, map_size // 3, map_size - 1, map_size, -7, 3 * map_size]
+            pixel_y = [0, 1, 255, 256, map_size // 3, map_size - 1, map_size, -7, map_size + 7]
+            pa = PointArray(pixel_x=pixel_x, pixel_y=pixel_y, zoom_level=zl, backend=self.backend)
+            expected = [Point(pixel_x=x, pixel_y=y, zoom_level=zl) for x, y in zip(pixel_x, pixel_y)]
+
+            self.assertParity(pa.latitude, [p.latitude for p in expected])
+            self.assertParity(pa.longitude, [p.longitude for p in expected])
+            self.assertParity(pa.pixel_x, [p.pixel_x for p in expected])
+            self.assertParity(pa.pixel_y, [p.pixel_y for p in expected])
+
+    def test_from_tile(self):
+        for zl in self.zoom_levels:
+            tile_x = [0, 1, 2 ** zl // 3, 2 ** zl - 1, 2 ** zl]
+            tile_y = [0, 1, 2 ** zl // 3, 2 ** zl - 1, 2 ** zl]
+            pa = PointArray(tile_x=tile_x, tile_y=tile_y, zoom_level=zl, backend=self.backend)
+            expected = [Point(tile_x=x, tile_y=y, zoom_level=zl) for x, y in zip(tile_x, tile_y)]
+
+            self.assertParity(pa.latitude, [p.latitude for p in expected])
+            self.assertParity(pa.longitude, [p.longitude for p in expected])
+            self.assertParity(pa.tile_x, [p.tile_x for p in expected])
+            self.assertParity(pa.tile_y, [p.tile_y for p in expected])
+
+    def test_quadkey(self):
+        for zl in self.zoom_levels:
+            self.pa.zoom_level = zl
+            for p in self.points:
+                p.zoom_level = zl
+
+            self.assertEqual(self.pa.quadkey, [p.quadkey for p in self.points])
+            self.assertParity(self.pa.tile_key, [p.tile_key for p in self.points])
+
+    def test_from_quadkey(self):
+        qks = [p.quadkey for p in self.points]
+        pa = PointArray(quadkey=qks, backend=self.backend)
+        self.assertEqual(pa.zoom_level, 14)
+        self.assertEqual(pa.quadkey, qks)
+
+        with self.assertRaises(ValueError):
+            PointArray(quadkey=['0', '00'], backend=self.backend)
+
+    def test_set_pixel_x(self):
+        self.pa.pixel_x = [p.pixel_x for p in self.points]
+        for p in self.points:
+            p.pixel_x = p.pixel_x
+
+        self.assertParity(self.pa.longitude, [p.longitude for p in self.points])
+
+    def test_set_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.pa.latitude = self.latitudes[1:]
+
+
+@unittest.skipUnless('numpy' in BACKENDS, 'numpy is not installed')
+class TestPointArrayNumpy(TestPointArrayArray):
+
+    backend = 'numpy'
+
+    def test_round(self):
+        from webmercator.batch import _round
+
+        rand = random.Random(4)
+        values = [rand.uniform(-2.1e7, 2.1e7) for _ in range(20000)] + [rand.uniform(-200, 200) for _ in range(20000)]
+        values += [round(rand.uniform(-1e4, 1e4), 10) for _ in range(20000)] + [-0.0, -1e-12, 1e300, float('inf')]
+        for digits in (3, 8, 9):
+            self.assertEqual([repr(v) for v in _round(values, digits).tolist()],
+                             [repr(round(v, digits)) for v in values])
+
+
+class TestBoundingBoxArrayArray(BackendParityMixin, unittest.TestCase):
+
+    backend = 'array'
+
+    def setUp(self):
+        self.latitudes = [35.771834, -33.8688, 0.0, 51.477928, 84.99, -84.99, 12.123456789, 64.1]
+        self.longitudes = [-78.677972, 151.2093, 0.0, -0.001545, 20.0, -150.0, 179.99, -179.99]
+        self.radii = [2.5, 0.1, 25, 1, 50, 10, 5, 0]
+        self.zoom_levels = [14, 10, 3, 18, 5, 23, 1, 14]
+
+        self.pa = PointArray(latitude=self.latitudes, longitude=self.longitudes, backend=self.backend)
+        self.bba = BoundingBoxArray(self.pa, radius=self.radii, zoom_level=self.zoom_levels)
+        self.boxes = [BoundingBox(Point(latitude=lat, longitude=lon), radius=r, zoom_level=zl)
+                      for lat, lon, r, zl in zip(self.latitudes, self.longitudes, self.radii, self.zoom_levels)]
+
+    def test_init_invalid_points(self):
+        with self.assertRaises(TypeError):
+            BoundingBoxArray(Point(latitude=0, longitude=0), radius=1)
+
+    def test_init_no_distance(self):
+        with self.assertRaises(AttributeError):
+            BoundingBoxArray(self.pa)
+
+    def test_init_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            BoundingBoxArray(self.pa, radius=self.radii[1:])
+
+    def test_init_diameter(self):
+        diameters = [-2, 0, 1, 5]
+        pa = PointArray(latitude=[0, 0, 0, 0], longitude=[0, 0, 0, 0], backend=self.backend)
+        bba = BoundingBoxArray(pa, diameter=diameters)
+        self.assertParity(bba.radius, [BoundingBox(p, diameter=d).radius for p, d in zip(pa, diameters)])
+
+    def test_len_getitem(self):
+        self.assertEqual(len(self.bba), len(self.boxes))
+        bb = self.bba[3]
+        self.assertIsInstance(bb, BoundingBox)
+        self.assertEqual(bb.zoom_level, self.zoom_levels[3])
+        self.assertEqual(bb.min_tile_x, self.boxes[3].min_tile_x)
+
+    def test_extents(self):
+        for name in ('min_latitude', 'max_latitude', 'min_longitude', 'max_longitude'):
+            self.assertParity(getattr(self.bba, name), [getattr(bb, name) for bb in self.boxes])
+
+    def test_pixel_tile_ranges(self):
+        for name in ('min_pixel_x', 'max_pixel_x', 'min_pixel_y', 'max_pixel_y',
+                     'min_tile_x', 'max_tile_x', 'min_tile_y', 'max_tile_y',
+                     'tile_width', 'tile_height', 'pixel_width', 'pixel_height'):
+            self.assertParity(getattr(self.bba, name), [getattr(bb, name) for bb in self.boxes])
+
+    def test_scalar_radius_and_zoom(self):
+        bba = BoundingBoxArray(self.pa, diameter=5)
+        boxes = [BoundingBox(p, diameter=5) for p in self.pa]
+        self.assertEqual(bba.radius, 2.5)
+        self.assertEqual(bba.zoom_level, self.pa.zoom_level)
+        self.assertParity(bba.min_tile_x, [bb.min_tile_x for bb in boxes])
+        self.assertParity(bba.max_tile_y, [bb.max_tile_y for bb in boxes])
+
+
+@unittest.skipUnless('numpy' in BACKENDS, 'numpy is not installed')
+class TestBoundingBoxArrayNumpy(TestBoundingBoxArrayArray):
+
+    backend = 'numpy'
+
+
+class TestGetBackend(unittest.TestCase):
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_backend('fortran')
+
+    def test_default(self):
+        self.assertEqual(get_backend().name, 'numpy' if 'numpy' in BACKENDS else 'array')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -93,6 +93,97 @@ class TestBoundingBox(unittest.TestCase):
 
         self.assertEqual(len(grid_tiles), (self.bb.tile_width + 1) * (self.bb.tile_height + 1))
 
+    def test_extents_computed_once(self):
+        calls = []
+        bound_vertices = self.bb._bound_vertices
+
+        def counting_bound_vertices(*args, **kwargs):
+            calls.append(1)
+            return bound_vertices(*args, **kwargs)
+
+        self.bb._bound_vertices = counting_bound_vertices
+        list(self.bb.tile_grid)
+        self.bb.min_longitude, self.bb.max_latitude, self.bb.pixel_width, self.bb.pixel_height
+        self.assertEqual(len(calls), 1)
+
+    def test_extents_match_vertices(self):
+        bv = self.bb.box_vertices
+        self.assertEqual(self.bb.min_latitude, min(v.latitude for v in bv))
+        self.assertEqual(self.bb.max_latitude, max(v.latitude for v in bv))
+        self.assertEqual(self.bb.min_longitude, min(v.longitude for v in bv))
+        self.assertEqual(self.bb.max_longitude, max(v.longitude for v in bv))
+        self.assertEqual(self.bb.min_tile_x, self.bb.vertex_top_left.tile_x)
+        self.assertEqual(self.bb.max_pixel_y, self.bb.vertex_bottom_right.pixel_y)
+
+    def test_radius_invalidates(self):
+        max_latitude = self.bb.max_latitude
+        self.bb.radius = self.radius * 2
+        self.assertEqual(self.bb.diameter, self.diameter * 2)
+        self.assertGreater(self.bb.max_latitude, max_latitude)
+
+    def test_diameter_invalidates(self):
+        max_latitude = self.bb.max_latitude
+        self.bb.diameter = self.diameter * 2
+        self.assertEqual(self.bb.radius, self.radius * 2)
+        self.assertGreater(self.bb.max_latitude, max_latitude)
+
+    def test_zoom_level_invalidates(self):
+        min_tile_x = self.bb.min_tile_x
+        self.bb.zoom_level = self.bb.zoom_level + 1
+        self.assertEqual(self.bb.min_tile_x, self.bb.vertex_top_left.tile_x)
+        self.assertNotEqual(self.bb.min_tile_x, min_tile_x)
+
+    def test_pt_center_invalidates(self):
+        min_longitude = self.bb.min_longitude
+        self.bb.pt_center = Point(latitude=self.latitude, longitude=self.longitude + 1)
+        self.assertAlmostEqual(self.bb.min_longitude, min_longitude + 1, places=6)
+
+
+class TestAntimeridian(unittest.TestCase):
+
+    def setUp(self):
+        self.bb = BoundingBox(Point(latitude=-17.7, longitude=179.95), radius=20, zoom_level=12)
+
+    def test_not_crossing(self):
+        bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=20, zoom_level=12)
+        self.assertFalse(bb.crosses_antimeridian)
+        self.assertEqual(len(bb.longitude_ranges), 1)
+        self.assertEqual(bb.tile_grids, [bb.tile_grid])
+
+    def test_longitude_ranges(self):
+        self.assertTrue(self.bb.crosses_antimeridian)
+        (west, west_end), (east_start, east) = self.bb.longitude_ranges
+        self.assertEqual((west_end, east_start), (180.0, -180.0))
+        self.assertLess(west_end - west + east - east_start, 1)
+        self.assertAlmostEqual((west + east + 360) / 2, 179.95, places=6)
+        self.assertAlmostEqual(east, self.bb.min_longitude, places=6)
+
+    def test_west_crossing(self):
+        bb = BoundingBox(Point(latitude=51.0, longitude=-179.9), radius=20, zoom_level=12)
+        (west, _), (_, east) = bb.longitude_ranges
+        self.assertGreater(west, 179)
+        self.assertLess(east, -179)
+
+    def test_tile_grids(self):
+        last = 2 ** 12 - 1
+        west, east = self.bb.tile_grids
+        self.assertEqual(west.max_x, last)
+        self.assertEqual(east.min_x, 0)
+        self.assertEqual((west.min_y, west.max_y), (east.min_y, east.max_y))
+        self.assertLess(len(west) + len(east), len(self.bb.tile_grid) / 100)
+        self.assertIn((Point(latitude=-17.7, longitude=179.95, zoom_level=12).tile_x, west.min_y), west)
+
+    def test_coverage_split(self):
+        covered = list(self.bb.coverage(12, 12))
+        expected = [(x, y, 12) for grid in self.bb.tile_grids for x, y in grid]
+        self.assertEqual(covered, expected)
+
+    def test_coverage_merges_parents(self):
+        covered = list(self.bb.coverage(0, 12))
+        self.assertEqual(len(covered), len(set(covered)))
+        self.assertEqual([t for t in covered if t[2] == 0], [(0, 0, 0)])
+        self.assertEqual(set(x for x, _, z in covered if z == 1), {0, 1})
+
 
 if __name__ == '__main__':
     unittest.main()
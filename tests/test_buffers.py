@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import mmap
+import random
+import struct
+import unittest
+from array import array
+
+from webmercator import buffers
+from webmercator import Point
+from webmercator.batch import BACKENDS
+
+
+class TestConvertInto(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(3)
+        self.coords = [(rand.uniform(-89, 89), rand.uniform(-180, 180)) for _ in range(257)]
+        self.packed = struct.pack('<{}d'.format(2 * len(self.coords)), *[v for c in self.coords for v in c])
+
+    def unpack(self, out, target, count):
+        return struct.unpack('<{}{}'.format(2 * count, 'q' if target in ('pixel', 'tile') else 'd'),
+                             bytes(out[:count * buffers.RECORD_SIZE]))
+
+    def expected(self, point, target):
+        return {
+            'geo': (point.latitude, point.longitude),
+            'meter': (point.meter_x, point.meter_y),
+            'pixel': (point.pixel_x, point.pixel_y),
+            'tile': (point.tile_x, point.tile_y),
+        }[target]
+
+    def assertConverted(self, values, source, points, target, **kwargs):
+        for backend in BACKENDS:
+            out = buffers.allocate(len(points))
+            count = buffers.convert_into(values, out, source=source, target=target, backend=backend, **kwargs)
+            self.assertEqual(count, len(points))
+
+            results = self.unpack(out, target, count)
+            for i, point in enumerate(points):
+                for value, expected in zip(results[2 * i:2 * i + 2], self.expected(point, target)):
+                    self.assertAlmostEqual(value, expected, delta=1e-6 * max(1, abs(expected)))
+
+    def test_geo_source(self):
+        points = [Point(latitude=lat, longitude=lon, zoom_level=12) for lat, lon in self.coords]
+        for target in buffers.TARGETS:
+            self.assertConverted(memoryview(self.packed), 'geo', points, target, zoom_level=12, chunk_size=50)
+
+    def test_meter_source(self):
+        points = [Point(latitude=lat, longitude=lon) for lat, lon in self.coords]
+        meters = array('d', [v for p in points for v in (p.meter_x, p.meter_y)])
+        points = [Point(meter_x=p.meter_x, meter_y=p.meter_y) for p in points]
+        for target in buffers.TARGETS:
+            self.assertConverted(meters, 'meter', points, target)
+
+    def test_meter_exact(self):
+        points = [Point(latitude=lat, longitude=lon, zoom_level=12) for lat, lon in self.coords]
+        meters = [Point(meter_x=p.meter_x, meter_y=p.meter_y, zoom_level=12) for p in points]
+        packed = struct.pack('<{}d'.format(2 * len(points)), *[v for p in points for v in (p.meter_x, p.meter_y)])
+        for backend in BACKENDS:
+            out = buffers.allocate(len(points))
+            buffers.convert_into(self.packed, out, target='meter', backend=backend, precision='exact', chunk_size=100)
+            self.assertEqual(self.unpack(out, 'meter', len(points)),
+                             tuple(v for p in points for v in (p.meter_x, p.meter_y)))
+
+            for target in buffers.TARGETS:
+                out = buffers.allocate(len(points))
+                buffers.convert_into(packed, out, source='meter', target=target, zoom_level=12, backend=backend,
+                                     precision='exact', chunk_size=100)
+                self.assertEqual(self.unpack(out, target, len(points)),
+                                 tuple(v for p in meters for v in self.expected(p, target)))
+
+    def test_buffer_types(self):
+        points = [Point(latitude=lat, longitude=lon) for lat, lon in self.coords]
+        mapped = mmap.mmap(-1, len(self.packed))
+        mapped.write(self.packed)
+        for values in (self.packed, bytearray(self.packed), array('d', self.packed), mapped):
+            self.assertConverted(values, 'geo', points, 'tile')
+
+    def test_numpy_buffers(self):
+        if 'numpy' not in BACKENDS:
+            self.skipTest('NumPy is not installed')
+
+        import numpy
+        values = numpy.array(self.coords)
+        out = numpy.zeros((len(self.coords), 2), dtype=numpy.int64)
+        buffers.convert_into(values, out, target='pixel')
+        self.assertEqual(tuple(out[10]), self.expected(Point(latitude=self.coords[10][0],
+                                                             longitude=self.coords[10][1]), 'pixel'))
+
+    def test_big_endian_host(self):
+        points = [Point(latitude=lat, longitude=lon) for lat, lon in self.coords]
+        swapped = struct.pack('>{}d'.format(2 * len(self.coords)), *[v for c in self.coords for v in c])
+        native, buffers._SWAP = buffers._SWAP, True
+        try:
+            out = buffers.allocate(len(points))
+            buffers.convert_into(swapped, out, target='pixel', backend='array')
+        finally:
+            buffers._SWAP = native
+
+        results = struct.unpack('>{}q'.format(2 * len(points)), bytes(out))
+        self.assertEqual(results, tuple(v for p in points for v in (p.pixel_x, p.pixel_y)))
+
+    def test_larger_output(self):
+        out = buffers.allocate(len(self.coords) + 3)
+        out[-1:] = b'\xff'
+        self.assertEqual(buffers.convert_into(self.packed, out), len(self.coords))
+        self.assertEqual(out[-1:], b'\xff')
+
+    def test_empty(self):
+        for backend in BACKENDS:
+            self.assertEqual(buffers.convert_into(b'', bytearray(), backend=backend), 0)
+
+    def test_invalid(self):
+        out = buffers.allocate(len(self.coords))
+        self.assertRaises(ValueError, buffers.convert_into, self.packed, out, source='pixel')
+        self.assertRaises(ValueError, buffers.convert_into, self.packed, out, target='quadkey')
+        self.assertRaises(ValueError, buffers.convert_into, self.packed, out, chunk_size=0)
+        self.assertRaises(ValueError, buffers.convert_into, self.packed[:-8], out)
+        self.assertRaises(ValueError, buffers.convert_into, self.packed, buffers.allocate(10))
+        self.assertRaises(ValueError, buffers.convert_into, self.packed, bytes(out))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from webmercator import Point
+from webmercator import cli
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.coordinates = [(35.771834, -78.677972), (51.477928, -0.001545), (-33.8688, 151.2093), (0.0, 0.0),
+                            (64.1, -21.9)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp, name)
+        with io.open(path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        return path
+
+    def read(self, path):
+        with io.open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def csv_input(self):
+        lines = ['id,latitude,longitude'] + ['{},{},{}'.format(i, lat, lon)
+                                             for i, (lat, lon) in enumerate(self.coordinates)]
+        return self.write('in.csv', '\n'.join(lines) + '\n')
+
+    def test_csv(self):
+        output = os.path.join(self.tmp, 'out.csv')
+        code = cli.main([self.csv_input(), '-o', output, '-j', '1', '--fields', 'tile_x,tile_y,quadkey', '-z', '12'])
+        self.assertEqual(code, 0)
+
+        lines = self.read(output).splitlines()
+        self.assertEqual(lines[0], 'id,latitude,longitude,tile_x,tile_y,quadkey')
+        for line, (lat, lon) in zip(lines[1:], self.coordinates):
+            pt = Point(latitude=lat, longitude=lon, zoom_level=12)
+            self.assertEqual(line.split(',')[3:], [str(pt.tile_x), str(pt.tile_y), pt.quadkey])
+
+    def test_ndjson(self):
+        lines = [json.dumps({'id': i, 'lat': lat, 'lon': lon}) for i, (lat, lon) in enumerate(self.coordinates)]
+        path = self.write('in.ndjson', '\n'.join(lines) + '\n\n')
+        output = os.path.join(self.tmp, 'out.ndjson')
+        cli.main([path, '-o', output, '-j', '1', '--lat-field', 'lat', '--lon-field', 'lon',
+                  '--fields', 'pixel_x,pixel_y,tile_key'])
+
+        records = [json.loads(line) for line in self.read(output).splitlines()]
+        self.assertEqual([r['id'] for r in records], list(range(len(self.coordinates))))
+        for record in records:
+            pt = Point(latitude=record['lat'], longitude=record['lon'])
+            self.assertEqual((record['pixel_x'], record['pixel_y'], record['tile_key']),
+                             (pt.pixel_x, pt.pixel_y, pt.tile_key))
+
+    def test_invalid_coordinates(self):
+        path = self.write('in.csv', 'latitude,longitude\n35.7,-78.6\nbad,1\n,\n')
+        output = os.path.join(self.tmp, 'out.csv')
+        cli.main([path, '-o', output, '-j', '1'])
+        lines = self.read(output).splitlines()
+        self.assertEqual(lines[2], 'bad,1,,,')
+        self.assertEqual(lines[3], ',,,,')
+
+    def test_non_finite_coordinates(self):
+        path = self.write('in.csv', 'latitude,longitude\n1,inf\n-inf,1\nnan,1\n1,-1e400\n35.7,1e12\n')
+        output = os.path.join(self.tmp, 'out.csv')
+        self.assertEqual(cli.main([path, '-o', output, '-j', '1', '--fields', 'tile_x,tile_y']), 0)
+
+        lines = self.read(output).splitlines()
+        self.assertEqual(lines[1:5], ['1,inf,,', '-inf,1,,', 'nan,1,,', '1,-1e400,,'])
+        pt = Point(latitude=35.7, longitude=1e12)
+        self.assertEqual(lines[5], '35.7,1e12,{},{}'.format(pt.tile_x, pt.tile_y))
+
+    def test_invalid_ndjson(self):
+        output = os.path.join(self.tmp, 'out.ndjson')
+        for text, message in (('{"latitude": 1, "longitude": 2}\n\n[1, 2]\n', 'line 3: expected a JSON object'),
+                              ('{"latitude": 1, "longitude": 2}\n{"latitude": \n', 'line 2: invalid JSON')):
+            path = self.write('in.ndjson', text)
+            for workers in ('1', '2'):
+                stderr, sys.stderr = sys.stderr, io.StringIO() if sys.version_info[0] >= 3 else io.BytesIO()
+                try:
+                    code = cli.main([path, '-o', output, '-j', workers, '--chunk-size', '1'])
+                    error = sys.stderr.getvalue()
+                finally:
+                    sys.stderr = stderr
+                self.assertEqual(code, 2)
+                self.assertIn(message, error)
+
+    def test_missing_column(self):
+        path = self.write('in.csv', 'lat,lon\n35.7,-78.6\n')
+        self.assertEqual(cli.main([path, '-o', os.path.join(self.tmp, 'out.csv'), '-j', '1']), 2)
+
+    def test_unknown_field(self):
+        with self.assertRaises(SystemExit):
+            cli.parse_args(['in.csv', '--fields', 'altitude'])
+
+    def test_pool_keeps_order(self):
+        path = self.csv_input()
+        single, pooled = os.path.join(self.tmp, 'single.csv'), os.path.join(self.tmp, 'pooled.csv')
+        cli.main([path, '-o', single, '-j', '1', '--chunk-size', '2'])
+        cli.main([path, '-o', pooled, '-j', '2', '--chunk-size', '1'])
+        self.assertEqual(self.read(single), self.read(pooled))
+
+
+if __name__ == '__main__':
+    unittest.main()
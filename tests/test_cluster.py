@@ -0,0 +1,164 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+import unittest
+
+from webmercator import BoundingBox, ClusterIndex, Point
+
+
+class TestClusterIndex(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(24)
+        self.points = dict(('d{}'.format(i), (rand.uniform(35, 36.5), rand.uniform(-79.5, -78))) for i in range(2000))
+        self.index = ClusterIndex(max_zoom=14, cell_size=64)
+        self.load(self.index, self.points)
+        self.world = BoundingBox(Point(latitude=0, longitude=0), radius=15000, zoom_level=0)
+
+    @staticmethod
+    def load(index, points):
+        ids = sorted(points)
+        index.load(ids, [points[i][0] for i in ids], [points[i][1] for i in ids])
+
+    def expected(self, points, zoom_level, max_zoom=14, cell_size=64):
+        """ {cell tile: (count, mean latitude, mean longitude)} by bucketing each point's leaf tile directly """
+        leaf_zoom = max_zoom + 8 - (cell_size.bit_length() - 1)
+        shift = max_zoom - zoom_level
+        cells = {}
+        for lat, lon in points.values():
+            pt = Point(latitude=lat, longitude=lon, zoom_level=leaf_zoom)
+            x, y = pt._tile_in_range()
+            cells.setdefault((x >> shift, y >> shift, leaf_zoom - shift), []).append((pt.latitude, pt.longitude))
+        return dict((cell, (len(members), sum(m[0] for m in members) / len(members),
+                            sum(m[1] for m in members) / len(members))) for cell, members in cells.items())
+
+    def assertClusters(self, clusters, expected):
+        self.assertEqual(sorted(c.tile for c in clusters), sorted(expected))
+        for cluster in clusters:
+            count, latitude, longitude = expected[cluster.tile]
+            self.assertEqual(cluster.count, count)
+            self.assertAlmostEqual(cluster.latitude, latitude, places=6)
+            self.assertAlmostEqual(cluster.longitude, longitude, places=6)
+
+    def test_properties(self):
+        self.assertEqual(len(self.index), 2000)
+        self.assertIn('d3', self.index)
+        self.assertEqual(self.index.leaf_zoom, 16)
+        self.assertEqual((self.index.max_zoom, self.index.cell_size), (14, 64))
+
+    def test_every_zoom(self):
+        for zoom_level in range(0, 15):
+            self.assertClusters(self.index.clusters(self.world, zoom_level), self.expected(self.points, zoom_level))
+
+    def test_insert_matches_load(self):
+        index = ClusterIndex(max_zoom=14)
+        for identifier, (lat, lon) in self.points.items():
+            index.insert(identifier, lat, lon)
+        for zoom_level in (0, 7, 14):
+            self.assertClusters(index.clusters(self.world, zoom_level), self.expected(self.points, zoom_level))
+
+    def test_box(self):
+        bb = BoundingBox(Point(latitude=35.77, longitude=-78.68), radius=10, zoom_level=12)
+        clusters = self.index.clusters(bb)
+        self.assertTrue(clusters)
+        expected = self.expected(self.points, 12)
+        self.assertClusters(clusters, dict((c.tile, expected[c.tile]) for c in clusters))
+
+        # every cell touching the box is returned
+        grid = bb.tile_grid_at(14)
+        self.assertEqual(sorted(c.tile for c in clusters), sorted(t for t in expected if t[:2] in grid))
+
+    def test_tile_clusters(self):
+        for zoom_level in (3, 10, 14):
+            expected = self.expected(self.points, zoom_level)
+            tiles = set((x >> 2, y >> 2) for x, y, _ in expected)
+            found = [c for tile in tiles for c in self.index.tile_clusters(tile[0], tile[1], zoom_level)]
+            self.assertClusters(found, expected)
+        self.assertEqual(self.index.tile_clusters(0, 0, 10), [])
+
+    def test_members(self):
+        for cluster in self.index.clusters(self.world, 9):
+            members = self.index.members(*cluster.tile)
+            self.assertEqual(len(members), cluster.count)
+            for identifier in members:
+                pt = Point(latitude=self.points[identifier][0], longitude=self.points[identifier][1],
+                           zoom_level=self.index.leaf_zoom)
+                shift = self.index.leaf_zoom - cluster.tile[2]
+                self.assertEqual((pt.tile_x >> shift, pt.tile_y >> shift), cluster.tile[:2])
+
+    def test_updates(self):
+        rand = random.Random(5)
+        points = dict(self.points)
+        for identifier in sorted(points)[:300]:
+            lat, lon = points[identifier]
+            points[identifier] = (lat + rand.uniform(-0.0005, 0.0005), lon + rand.uniform(-0.3, 0.3))
+            self.index.move(identifier, *points[identifier])
+        for identifier in sorted(points)[300:400]:
+            self.index.delete(identifier)
+            del points[identifier]
+        self.index.insert('new', 35.5, -78.5)
+        points['new'] = (35.5, -78.5)
+
+        self.assertEqual(len(self.index), len(points))
+        for zoom_level in (0, 8, 14):
+            self.assertClusters(self.index.clusters(self.world, zoom_level), self.expected(points, zoom_level))
+
+        for identifier in list(points):
+            self.index.delete(identifier)
+        self.assertEqual(self.index.clusters(self.world, 5), [])
+        self.assertEqual(self.index.members(0, 0, 0), [])
+
+    def test_antimeridian(self):
+        points = {'w': (10, 179.99), 'e': (10, -179.99), 'far': (10, 20)}
+        index = ClusterIndex(max_zoom=10, cell_size=256)
+        self.load(index, points)
+        bb = BoundingBox(Point(latitude=10, longitude=180), radius=20, zoom_level=10)
+        self.assertTrue(bb.crosses_antimeridian)
+        self.assertClusters(index.clusters(bb), self.expected({'w': points['w'], 'e': points['e']}, 10, 10, 256))
+        self.assertEqual(sum(c.count for c in index.clusters(self.world, 0)), 3)
+
+        wide = {'w': (10, 179.95), 'e': (10, -179.95), 'far': (10, 0)}
+        index = ClusterIndex(max_zoom=10, cell_size=256)
+        self.load(index, wide)
+        bb = BoundingBox(Point(latitude=10, longitude=179.99), radius=100, zoom_level=10)
+        self.assertTrue(bb.crosses_antimeridian)
+        self.assertClusters(index.clusters(bb, 0), self.expected(wide, 0, 10, 256))
+        self.assertClusters(index.clusters(bb, 5), self.expected({'w': wide['w'], 'e': wide['e']}, 5, 10, 256))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, ClusterIndex, cell_size=48)
+        self.assertRaises(ValueError, ClusterIndex, cell_size=512)
+        self.assertRaises(ValueError, ClusterIndex, max_zoom=22, cell_size=64)
+        self.assertRaises(ValueError, self.index.insert, 'd1', 0, 0)
+        self.assertRaises(ValueError, self.index.load, ['d1'], [0], [0])
+        self.assertRaises(ValueError, self.index.load, ['x', 'y'], [0], [0])
+        self.assertRaises(KeyError, self.index.delete, 'x')
+        self.assertRaises(KeyError, self.index.move, 'x', 0, 0)
+        self.assertRaises(ValueError, self.index.clusters, self.world, 15)
+        self.assertRaises(ValueError, self.index.tile_clusters, 0, 0, -1)
+        self.assertRaises(ValueError, self.index.members, 0, 0, 17)
+        self.assertRaises(TypeError, self.index.clusters, Point(latitude=0, longitude=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
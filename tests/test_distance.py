@@ -0,0 +1,109 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import unittest
+
+from webmercator import distance
+from webmercator import Point
+from webmercator import PointArray
+from webmercator.batch import BACKENDS
+
+
+class TestDistance(unittest.TestCase):
+
+    def setUp(self):
+        self.raleigh = Point(latitude=35.771834, longitude=-78.677972)
+        self.greenwich = Point(latitude=51.477928, longitude=-0.001545)
+
+    def test_distance(self):
+        # spherical, with the 3959 mile radius of BoundingBox
+        self.assertAlmostEqual(distance.distance(self.raleigh, self.greenwich), 3882.02, places=2)
+        self.assertEqual(distance.distance(self.raleigh, self.raleigh), 0)
+        self.assertEqual(distance.distance(self.raleigh, self.greenwich),
+                         distance.distance(self.greenwich, self.raleigh))
+
+    def test_units(self):
+        miles = distance.distance(self.raleigh, self.greenwich)
+        self.assertAlmostEqual(distance.distance(self.raleigh, self.greenwich, 'kilometers'), miles * 1.609344)
+        self.assertAlmostEqual(distance.distance(self.raleigh, self.greenwich, 'meters'), miles * 1609.344, places=6)
+        self.assertAlmostEqual(distance.distance(self.raleigh, self.greenwich, 'nautical_miles'),
+                               miles * 1609.344 / 1852)
+        self.assertRaises(ValueError, distance.distance, self.raleigh, self.greenwich, 'furlongs')
+
+    def test_antipodes(self):
+        equator = Point(latitude=0, longitude=0)
+        self.assertAlmostEqual(distance.distance(equator, Point(latitude=0, longitude=180)), math.pi * 3959.0)
+        across = distance.distance(Point(latitude=0, longitude=179.5), Point(latitude=0, longitude=-179.5))
+        self.assertAlmostEqual(across, math.radians(1) * 3959.0)
+
+    def test_matches_box_radius(self):
+        from webmercator import BoundingBox
+        bb = BoundingBox(self.raleigh, radius=25)
+        for vertex in bb.box_vertices:
+            self.assertAlmostEqual(self.raleigh.distance_to(vertex), 25, places=4)
+
+    def test_point_distance_to(self):
+        self.assertEqual(self.raleigh.distance_to(self.greenwich, units='kilometers'),
+                         distance.distance(self.raleigh, self.greenwich, units='kilometers'))
+
+    def test_invalid_points(self):
+        pa = PointArray.from_points([self.raleigh])
+        self.assertRaises(TypeError, distance.distance, self.raleigh, (51.4, 0))
+        self.assertRaises(TypeError, distance.distances, pa, pa)
+        self.assertRaises(TypeError, distance.distances, self.raleigh, [self.greenwich])
+        self.assertRaises(TypeError, distance.pairwise, pa, [self.greenwich])
+
+    def test_distances(self):
+        points = [self.greenwich, self.raleigh, Point(latitude=-33.9, longitude=151.2),
+                  Point(latitude=84, longitude=-170)]
+        for backend in BACKENDS:
+            pa = PointArray.from_points(points, backend=backend)
+            for units in distance.UNITS:
+                expected = [distance.distance(self.raleigh, p, units) for p in points]
+                for value, scalar in zip(distance.distances(self.raleigh, pa, units), expected):
+                    self.assertAlmostEqual(value, scalar, places=6)
+                self.assertEqual(list(pa.distance_to(self.raleigh, units)),
+                                 list(distance.distances(self.raleigh, pa, units)))
+
+    def test_pairwise(self):
+        points = [self.greenwich, self.raleigh, Point(latitude=-33.9, longitude=151.2)]
+        others = [self.raleigh, self.raleigh, Point(latitude=-33.8, longitude=-179.9)]
+        for backend in BACKENDS:
+            pa = PointArray.from_points(points, backend=backend)
+            for other_backend in BACKENDS:
+                oa = PointArray.from_points(others, backend=other_backend)
+                result = pa.distance_to(oa, units='kilometers')
+                for value, p, o in zip(result, points, others):
+                    self.assertAlmostEqual(value, p.distance_to(o, 'kilometers'), places=6)
+
+            self.assertRaises(ValueError, distance.pairwise, pa, PointArray.from_points(others[:2]))
+
+    def test_empty(self):
+        for backend in BACKENDS:
+            pa = PointArray(latitude=[], longitude=[], backend=backend)
+            self.assertEqual(len(distance.distances(self.raleigh, pa)), 0)
+            self.assertEqual(len(distance.pairwise(pa, pa)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from webmercator import BoundingBox
+from webmercator import expiry
+from webmercator import Grid
+from webmercator import Point
+from webmercator import tiles
+from webmercator import TileSet
+
+
+class TestExpiry(unittest.TestCase):
+
+    def setUp(self):
+        self.pt = Point(latitude=35.771834, longitude=-78.677972, zoom_level=14)
+        self.bb = BoundingBox(Point(latitude=35.9, longitude=-78.9), radius=2, zoom_level=14)
+        self.features = [self.pt, self.bb, (4600, 6440), (2300, 3221, 13),
+                         Grid(vertex=(4615, 6446), width=3, height=2, zoom_level=14)]
+
+    def base_tiles(self):
+        found = {(self.pt.tile_x, self.pt.tile_y), (4600, 6440)}
+        found.update(self.bb.tile_grid)
+        found.update(tiles.descendant_grid(2300, 3221, 13, 14))
+        found.update(Grid(vertex=(4615, 6446), width=3, height=2))
+        return found
+
+    def test_changed_tiles(self):
+        changed = expiry.changed_tiles(self.features, 14)
+        self.assertEqual(changed.zoom_level, 14)
+        self.assertEqual(set(changed), self.base_tiles())
+
+    def test_expiry(self):
+        base = self.base_tiles()
+        found = list(expiry.expiry(iter(self.features), 14, 10, 16))
+        self.assertEqual(len(found), len(set(found)))
+        self.assertEqual([z for _, _, z in found], sorted(z for _, _, z in found))
+
+        for z in range(10, 15):
+            expected = set(tiles.parent(x, y, 14, z)[:2] for x, y in base)
+            self.assertEqual(set((x, y) for x, y, zl in found if zl == z), expected)
+
+        for z in (15, 16):
+            expected = set(t for x, y in base for t in tiles.descendant_grid(x, y, 14, z))
+            self.assertEqual(set((x, y) for x, y, zl in found if zl == z), expected)
+
+    def test_expiry_spans(self):
+        spans = list(expiry.expiry_spans(self.features, 14, 12, 15))
+        tiles_from_spans = [(x, y, z) for z, y, start, stop in spans for x in range(start, stop + 1)]
+        self.assertEqual(tiles_from_spans, list(expiry.expiry(self.features, 14, 12, 15)))
+        for z in range(12, 16):
+            rows = [(y, start) for zl, y, start, _ in spans if zl == z]
+            self.assertEqual(rows, sorted(rows))
+
+    def test_tile_set_feature(self):
+        tile_set = TileSet.from_grid(Grid(vertex=(8, 8), width=7, height=3, zoom_level=5))
+        found = set(expiry.expiry([tile_set], 4, 3, 4))
+        self.assertEqual(found, {(2, 2, 3), (3, 2, 3), (4, 4, 4), (5, 4, 4), (6, 4, 4), (7, 4, 4),
+                                 (4, 5, 4), (5, 5, 4), (6, 5, 4), (7, 5, 4)})
+
+    def test_clipped_to_map(self):
+        found = list(expiry.expiry([Grid(vertex=(6, -1), width=4, height=1, zoom_level=3)], 3, 3, 3))
+        self.assertEqual(found, [(6, 0, 3), (7, 0, 3)])
+
+    def test_antimeridian_box(self):
+        bb = BoundingBox(Point(latitude=-17.7, longitude=179.95), radius=20, zoom_level=12)
+        found = set((x, y) for x, y, _ in expiry.expiry([bb], 12, 12, 12))
+        self.assertEqual(found, set(t for g in bb.tile_grids for t in g))
+
+    def test_invalid(self):
+        self.assertRaises(TypeError, list, expiry.expiry(['9q8y'], 14, 10, 12))
+        self.assertRaises(ValueError, list, expiry.expiry([self.pt], 14, 12, 10))
+        self.assertRaises(ValueError, list, expiry.expiry([self.pt], 24, 10, 12))
+
+
+class TestTileSetAtZoom(unittest.TestCase):
+
+    def test_at_zoom(self):
+        tile_set = TileSet([(3, 1, 2), (3, 6, 6), (4, 9, 9), (5, 0, 0)], zoom_level=4)
+        self.assertEqual(list(tile_set.at_zoom(3).spans()), [(1, 0, 1), (1, 3, 3), (2, 0, 0), (2, 4, 4)])
+        self.assertEqual(list(tile_set.at_zoom(0)), [(0, 0)])
+        self.assertEqual(len(tile_set.at_zoom(6)), 16 * len(tile_set))
+        self.assertEqual(tile_set.at_zoom(6).at_zoom(4), tile_set)
+        self.assertEqual(tile_set.at_zoom(4), tile_set)
+
+    def test_no_zoom_level(self):
+        self.assertRaises(ValueError, TileSet([(0, 0, 0)]).at_zoom, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
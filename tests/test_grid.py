@@ -20,9 +20,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import pickle
 import unittest
 
 from webmercator import Grid
+from webmercator import GridShard
+from webmercator import GridSlice
+from webmercator import quadkey
+from webmercator.batch import BACKENDS
 
 
 class TestGrid(unittest.TestCase):
@@ -61,6 +66,269 @@ class TestGrid(unittest.TestCase):
         grid = [x for x in g]
         self.assertEqual(len(grid), (self.width + 1) * (self.height + 1))
 
+    def test_iter_order(self):
+        g = Grid(vertex=(self.x, self.y), width=1, height=1)
+        self.assertEqual(list(g), [(100, 100), (101, 100), (100, 101), (101, 101)])
+
+    def test_iter_repeatable(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        self.assertEqual(list(g), list(g))
+
+        it_a, it_b = iter(g), iter(g)
+        next(it_a)
+        self.assertEqual(next(it_b), (self.x, self.y))
+
+    def test_len(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        self.assertEqual(len(g), len(list(g)))
+        self.assertEqual(len(Grid(vertex=(self.x, self.y), width=0, height=0)), 1)
+
+    def test_empty(self):
+        for width, height in ((-1, self.height), (self.width, -1), (-3, -3)):
+            g = Grid(vertex=(self.x, self.y), width=width, height=height)
+            self.assertEqual(len(g), 0)
+            self.assertEqual(list(g), [])
+            self.assertNotIn((self.x, self.y), g)
+
+    def test_contains(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        for tile in g:
+            self.assertIn(tile, g)
+
+        self.assertNotIn((self.x - 1, self.y), g)
+        self.assertNotIn((self.x, self.y + self.height + 1), g)
+        self.assertNotIn(self.x, g)
+
+    def test_getitem(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        tiles = list(g)
+        for i in range(len(g)):
+            self.assertEqual(g[i], tiles[i])
+            self.assertEqual(g[-i - 1], tiles[-i - 1])
+            self.assertEqual(g.index(tiles[i]), i)
+
+        with self.assertRaises(IndexError):
+            g[len(g)]
+
+        with self.assertRaises(ValueError):
+            g.index((0, 0))
+
+    def test_slice(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        tiles = list(g)
+        self.assertEqual(list(g[3:11]), tiles[3:11])
+        self.assertEqual(list(g[::-4]), tiles[::-4])
+
+    def test_slice_is_lazy(self):
+        g = Grid(vertex=(0, 0), width=2 ** 20, height=2 ** 20)
+        view = g[5:-5:3]
+        self.assertIsInstance(view, GridSlice)
+        self.assertEqual(len(view), (len(g) - 10 + 2) // 3)
+        self.assertEqual(view[1], g[8])
+        self.assertEqual(view[-1], g[5 + (len(view) - 1) * 3])
+        self.assertIn(g[11], view)
+        self.assertNotIn(g[12], view)
+        self.assertEqual(len(g[10:5]), 0)
+
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        tiles = list(g)
+        for index in (slice(None), slice(2, 40), slice(40, 2, -3), slice(-7, None, 2)):
+            view = g[index]
+            self.assertEqual(list(view), tiles[index])
+            self.assertEqual([view[i] for i in range(len(view))], tiles[index])
+            self.assertEqual(list(view[1::2]), tiles[index][1::2])
+            self.assertEqual(list(view[::-1]), tiles[index][::-1])
+            self.assertEqual([t for t in tiles if t in view], sorted(tiles[index], key=tiles.index))
+
+    def test_bounds(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        self.assertEqual((g.min_x, g.max_x, g.min_y, g.max_y),
+                         (self.x, self.x + self.width, self.y, self.y + self.height))
+        self.assertEqual((g.columns, g.rows), (self.width + 1, self.height + 1))
+
+    def test_quadkeys(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height, zoom_level=10)
+        qks = list(g.quadkeys())
+        self.assertEqual(len(qks), len(g))
+        self.assertEqual(qks[0], quadkey.to_quadkey(self.x, self.y, 10))
+        self.assertEqual([quadkey.from_quadkey(qk)[:2] for qk in qks], list(g))
+
+        with self.assertRaises(ValueError):
+            Grid(vertex=(self.x, self.y), width=self.width, height=self.height).quadkeys()
+
+        with self.assertRaises(ValueError):
+            g.quadkeys(zoom_level=6)
+
+    def test_tile_keys(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        keys = [k for block in g.tile_keys(zoom_level=10) for k in block]
+        self.assertEqual([quadkey.unpack(k) for k in keys], [(x, y, 10) for x, y in g])
+
+    def test_at_zoom(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height, zoom_level=10)
+        self.assertEqual(g.at_zoom(10), g)
+
+        up = g.at_zoom(8)
+        self.assertEqual(set(up), set((x >> 2, y >> 2) for x, y in g))
+
+        down = g.at_zoom(12)
+        self.assertEqual(len(down), 16 * len(g))
+        self.assertEqual(set((x >> 2, y >> 2) for x, y in down), set(g))
+
+        with self.assertRaises(ValueError):
+            Grid(vertex=(self.x, self.y), width=self.width, height=self.height).at_zoom(3)
+
+    def test_pyramid(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height, zoom_level=10)
+        self.assertEqual([level.zoom_level for level in g.pyramid(7, 12)], list(range(7, 13)))
+
+    def test_eq(self):
+        g = Grid(vertex=(self.x, self.y), width=self.width, height=self.height)
+        self.assertEqual(g, Grid(vertex=(self.x, self.y), width=self.width, height=self.height))
+        self.assertNotEqual(g, Grid(vertex=(self.x, self.y), width=self.width + 1, height=self.height))
+
+
+def hilbert_index(bits, x, y):
+    """ Classic `xy2d`, for reference """
+    n, d, s = 1 << bits, 0, 1 << (bits - 1)
+    while s:
+        rx, ry = int(bool(x & s)), int(bool(y & s))
+        d += s * s * ((3 * rx) ^ ry)
+        if not ry:
+            if rx:
+                x, y = n - 1 - x, n - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+
+class TestGridWalk(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = Grid(vertex=(3, 5), width=20, height=13, zoom_level=6)
+
+    def test_row(self):
+        self.assertEqual(list(self.grid.walk()), list(self.grid))
+        self.assertEqual(list(self.grid.walk('row')), list(self.grid))
+
+    def test_morton(self):
+        found = list(self.grid.walk('morton'))
+        self.assertEqual(found, sorted(self.grid, key=lambda t: quadkey.interleave(*t)))
+        self.assertEqual(list(self.grid.quadkeys(order='morton')), sorted(self.grid.quadkeys()))
+
+    def test_hilbert(self):
+        found = list(self.grid.walk('hilbert'))
+        self.assertEqual(found, sorted(self.grid, key=lambda t: hilbert_index(6, *t)))
+
+    def test_hilbert_adjacent(self):
+        found = list(Grid(vertex=(0, 0), width=31, height=31, zoom_level=5).walk('hilbert'))
+        self.assertEqual(found[0], (0, 0))
+        self.assertEqual(found[-1], (31, 0))
+        for a, b in zip(found, found[1:]):
+            self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+
+    def test_rank_kept_across_grids(self):
+        whole = list(Grid(vertex=(0, 0), width=63, height=63, zoom_level=6).walk('hilbert'))
+        found = list(self.grid.walk('hilbert'))
+        self.assertEqual(found, [t for t in whole if t in self.grid])
+
+    def test_no_zoom_level(self):
+        grid = Grid(vertex=(5, 2), width=6, height=9)
+        for order in ('morton', 'hilbert'):
+            found = list(grid.walk(order))
+            self.assertEqual(sorted(found), sorted(grid))
+            self.assertEqual(len(found), len(set(found)))
+
+    def test_single_and_empty(self):
+        for order in ('row', 'morton', 'hilbert'):
+            self.assertEqual(list(Grid(vertex=(7, 9), width=0, height=0, zoom_level=4).walk(order)), [(7, 9)])
+            self.assertEqual(list(Grid(vertex=(7, 9), width=-1, height=-1).walk(order)), [])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, self.grid.walk, 'spiral')
+        self.assertRaises(ValueError, Grid(vertex=(-1, 0), width=2, height=2).walk, 'hilbert')
+
+
+class TestGridChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = Grid(vertex=(100, 200), width=6, height=4)
+        self.tiles = list(self.grid)
+
+    def flatten(self, chunks):
+        tiles = []
+        for xs, ys in chunks:
+            self.assertEqual(len(xs), len(ys))
+            tiles.extend(zip(xs, ys))
+        return [(int(x), int(y)) for x, y in tiles]
+
+    def test_rows(self):
+        for backend in BACKENDS:
+            chunks = list(self.grid.chunks(backend=backend))
+            self.assertEqual(len(chunks), self.grid.rows)
+            for xs, ys in chunks:
+                self.assertEqual(len(xs), self.grid.columns)
+                self.assertEqual(len(set(ys)), 1)
+            self.assertEqual(self.flatten(chunks), self.tiles)
+
+    def test_fixed_size(self):
+        for backend in BACKENDS:
+            for size in (1, 4, 7, 100):
+                chunks = list(self.grid.chunks(size=size, backend=backend))
+                self.assertTrue(all(len(xs) == size for xs, _ in chunks[:-1]))
+                self.assertEqual(self.flatten(chunks), self.tiles)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            self.grid.chunks(size=0)
+
+    def test_empty(self):
+        self.assertEqual(list(Grid(vertex=(0, 0), width=-1, height=3).chunks()), [])
+
+
+class TestGridShard(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = Grid(vertex=(100, 200), width=6, height=4)
+        self.tiles = list(self.grid)
+
+    def test_disjoint_cover(self):
+        for count in (1, 2, 3, 7, 35, 50):
+            shards = self.grid.shards(count)
+            self.assertEqual(len(shards), count)
+            self.assertEqual([t for shard in shards for t in shard], self.tiles)
+
+    def test_balanced(self):
+        sizes = [len(shard) for shard in self.grid.shards(4)]
+        self.assertEqual(sum(sizes), len(self.grid))
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+    def test_contains(self):
+        first, second = self.grid.shards(2)
+        for tile in first:
+            self.assertIn(tile, first)
+            self.assertNotIn(tile, second)
+
+    def test_chunks(self):
+        for shard in self.grid.shards(3):
+            for backend in BACKENDS:
+                tiles = [(int(x), int(y)) for xs, ys in shard.chunks(backend=backend) for x, y in zip(xs, ys)]
+                self.assertEqual(tiles, list(shard))
+
+                tiles = [(int(x), int(y)) for xs, ys in shard.chunks(size=4, backend=backend) for x, y in zip(xs, ys)]
+                self.assertEqual(tiles, list(shard))
+
+    def test_pickle(self):
+        shard = self.grid.shards(3)[1]
+        self.assertEqual(list(pickle.loads(pickle.dumps(shard))), list(shard))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.grid.shards(0)
+
+        with self.assertRaises(TypeError):
+            GridShard(self.tiles, 0, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,118 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pickle
+import random
+import unittest
+
+from webmercator import Heatmap, Point, PointArray
+from webmercator.batch import BACKENDS
+
+
+class TestHeatmap(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(25)
+        self.coords = [(rand.uniform(35.5, 36), rand.uniform(-79, -78.5)) for _ in range(3000)]
+        self.coords += [(85.2, 180), (-85.2, -180), (0, 0)]
+
+    def expected(self, coords, zoom_levels, resolution=256):
+        """ {tile: {bin: count}} from `Point` pixels, one point at a time """
+        shift = 8 - (resolution.bit_length() - 1)
+        tiles = {}
+        for lat, lon in coords:
+            for z in zoom_levels:
+                pt = Point(latitude=lat, longitude=lon, zoom_level=z)
+                last = pt.map_size - 1
+                x, y = int(min(max(pt.pixel_x, 0), last)), int(min(max(pt.pixel_y, 0), last))
+                bins = tiles.setdefault((x // 256, y // 256, z), {})
+                cell = ((y % 256) >> shift) * resolution + ((x % 256) >> shift)
+                bins[cell] = bins.get(cell, 0) + 1
+        return tiles
+
+    def assertHistograms(self, heatmap, expected):
+        self.assertEqual(sorted(heatmap), sorted(expected))
+        for tile, counts in heatmap.items():
+            self.assertEqual(len(counts), heatmap.resolution ** 2)
+            self.assertEqual(dict((i, int(c)) for i, c in enumerate(counts) if c), expected[tile])
+
+    def test_add(self):
+        points = PointArray(latitude=[c[0] for c in self.coords], longitude=[c[1] for c in self.coords])
+        for backend in BACKENDS:
+            for resolution in (256, 16):
+                heatmap = Heatmap([12, 9], resolution=resolution, backend=backend)
+                heatmap.add(points)
+                self.assertEqual(heatmap.zoom_levels, (9, 12))
+                self.assertEqual(heatmap.count, len(self.coords))
+                self.assertHistograms(heatmap, self.expected(self.coords, (9, 12), resolution))
+
+    def test_stream(self):
+        for backend in BACKENDS:
+            heatmap = Heatmap(11, resolution=64, backend=backend)
+            self.assertEqual(heatmap.add_stream(iter(self.coords), chunk_size=700), len(self.coords))
+            self.assertHistograms(heatmap, self.expected(self.coords, (11,), 64))
+
+    def test_histogram(self):
+        heatmap = Heatmap(14, resolution=4)
+        heatmap.add_stream([(35.771834, -78.677972)] * 3)
+        tile = Point(latitude=35.771834, longitude=-78.677972, zoom_level=14)
+        self.assertEqual(list(heatmap), [(tile.tile_x, tile.tile_y, 14)])
+        self.assertIn((tile.tile_x, tile.tile_y, 14), heatmap)
+        self.assertEqual(sum(heatmap.histogram(tile.tile_x, tile.tile_y, 14)), 3)
+        self.assertRaises(KeyError, heatmap.histogram, 0, 0, 14)
+
+        self.assertEqual(sum(heatmap.pop(tile.tile_x, tile.tile_y, 14)), 3)
+        self.assertEqual(len(heatmap), 0)
+
+    def test_merge(self):
+        half = len(self.coords) // 2
+        for backend in BACKENDS:
+            for other_backend in BACKENDS:
+                first = Heatmap(10, resolution=32, backend=backend)
+                first.add_stream(self.coords[:half])
+                second = Heatmap([10, 12], resolution=32, backend=other_backend)
+                second.add_stream(self.coords[half:])
+
+                # as returned from a worker process
+                first += pickle.loads(pickle.dumps(second))
+                self.assertEqual(first.count, len(self.coords))
+                self.assertEqual(first.zoom_levels, (10, 12))
+
+                expected = self.expected(self.coords, (10,), 32)
+                for tile, bins in self.expected(self.coords[half:], (12,), 32).items():
+                    expected[tile] = bins
+                self.assertHistograms(first, expected)
+
+        self.assertRaises(ValueError, Heatmap(10).merge, Heatmap(10, resolution=128))
+        self.assertRaises(TypeError, Heatmap(10).merge, {})
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Heatmap, 0)
+        self.assertRaises(ValueError, Heatmap, [])
+        self.assertRaises(ValueError, Heatmap, 10, resolution=100)
+        self.assertRaises(ValueError, Heatmap, 10, resolution=512)
+        self.assertRaises(ValueError, Heatmap(10).add_stream, self.coords, chunk_size=0)
+        self.assertRaises(TypeError, Heatmap(10).add, self.coords)
+
+
+if __name__ == '__main__':
+    unittest.main()
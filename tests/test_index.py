@@ -0,0 +1,148 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import random
+import unittest
+
+from webmercator import Point
+from webmercator import TileIndex
+
+
+def distance(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (math.radians(v) for v in (lat1, lon1, lat2, lon2))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 3959.0 * math.asin(math.sqrt(h))
+
+
+class TestTileIndex(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(3)
+        self.points = dict(('d{}'.format(i), (rand.uniform(35, 36.5), rand.uniform(-79.5, -78))) for i in range(3000))
+        self.index = TileIndex(zoom_level=12)
+        ids = sorted(self.points)
+        self.index.load(ids, [self.points[i][0] for i in ids], [self.points[i][1] for i in ids])
+        self.queries = [Point(latitude=rand.uniform(35, 36.5), longitude=rand.uniform(-79.5, -78)) for _ in range(20)]
+
+    def brute_within(self, point, radius):
+        return sorted(i for i, (lat, lon) in self.points.items()
+                      if distance(point.latitude, point.longitude, lat, lon) <= radius)
+
+    def brute_nearest(self, point, k):
+        return sorted(self.points, key=lambda i: distance(point.latitude, point.longitude, *self.points[i]))[:k]
+
+    def test_load(self):
+        self.assertEqual(len(self.index), len(self.points))
+        self.assertIn('d7', self.index)
+        self.assertNotIn('x', self.index)
+        lat, lon = self.index.location('d7')
+        self.assertAlmostEqual(lat, self.points['d7'][0], places=6)
+        pt = Point(latitude=lat, longitude=lon, zoom_level=12)
+        self.assertEqual(self.index.tile_of('d7'), (pt.tile_x, pt.tile_y))
+
+    def test_load_invalid(self):
+        self.assertRaises(ValueError, self.index.load, ['d1'], [35], [-78])
+        self.assertRaises(ValueError, self.index.load, ['a', 'a'], [35, 35], [-78, -78])
+        self.assertRaises(ValueError, self.index.load, ['a'], [35, 36], [-78, -78])
+
+    def test_within(self):
+        for q in self.queries:
+            found = self.index.within(q, 3)
+            self.assertEqual(sorted(i for i, _ in found), self.brute_within(q, 3))
+            for i, miles in found:
+                self.assertAlmostEqual(miles, distance(q.latitude, q.longitude, *self.points[i]), places=6)
+
+    def test_within_large_radius(self):
+        q = self.queries[0]
+        self.assertEqual(sorted(i for i, _ in self.index.within(q, 500)), sorted(self.points))
+
+    def test_nearest(self):
+        for q in self.queries:
+            found = self.index.nearest(q, 7)
+            self.assertEqual([i for i, _ in found], self.brute_nearest(q, 7))
+            self.assertEqual([d for _, d in found], sorted(d for _, d in found))
+
+    def test_nearest_more_than_indexed(self):
+        self.assertEqual(len(self.index.nearest(self.queries[0], 5000)), len(self.points))
+        self.assertEqual(self.index.nearest(self.queries[0], 0), [])
+        self.assertEqual(TileIndex().nearest(self.queries[0], 3), [])
+
+    def test_nearest_sparse(self):
+        index = TileIndex(zoom_level=16)
+        index.insert('near', 36.0, -78.0)
+        index.insert('far', -33.9, 151.2)
+        found = index.nearest(Point(latitude=-30, longitude=150), 2)
+        self.assertEqual([i for i, _ in found], ['far', 'near'])
+
+    def test_insert_move_delete(self):
+        q = self.queries[0]
+        self.index.insert('new', q.latitude, q.longitude)
+        self.assertRaises(ValueError, self.index.insert, 'new', 0, 0)
+        self.assertEqual(self.index.nearest(q, 1)[0][0], 'new')
+
+        self.index.move('new', q.latitude + 0.0001, q.longitude)
+        self.assertEqual(self.index.nearest(q, 1)[0][0], 'new')
+
+        self.index.move('new', 10, 10)
+        self.assertNotIn('new', [i for i, _ in self.index.within(q, 5)])
+        self.assertEqual(self.index.nearest(Point(latitude=10, longitude=10), 1)[0][0], 'new')
+
+        self.index.delete('new')
+        self.assertNotIn('new', self.index)
+        self.assertRaises(KeyError, self.index.delete, 'new')
+        self.assertRaises(KeyError, self.index.move, 'new', 0, 0)
+
+    def test_delete_all(self):
+        for i in list(self.points)[::2]:
+            self.index.delete(i)
+            del self.points[i]
+
+        for i in list(self.points)[:10]:
+            lat, lon = self.index.location(i)
+            self.assertAlmostEqual(lat, self.points[i][0], places=6)
+
+        q = self.queries[1]
+        self.assertEqual(sorted(i for i, _ in self.index.within(q, 3)), self.brute_within(q, 3))
+        self.assertEqual([i for i, _ in self.index.nearest(q, 5)], self.brute_nearest(q, 5))
+
+        for i in list(self.points):
+            self.index.delete(i)
+        self.assertEqual((len(self.index), self.index.tiles), (0, []))
+
+    def test_antimeridian(self):
+        index = TileIndex(zoom_level=10)
+        index.insert('east', -17.0, 179.99)
+        index.insert('west', -17.0, -179.99)
+        found = index.within(Point(latitude=-17.0, longitude=179.995), 5)
+        self.assertEqual(sorted(i for i, _ in found), ['east', 'west'])
+        found = index.nearest(Point(latitude=-17.0, longitude=-179.995), 2)
+        self.assertEqual([i for i, _ in found], ['west', 'east'])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, TileIndex, 24)
+        self.assertRaises(TypeError, self.index.within, (35, -78), 1)
+        self.assertRaises(TypeError, self.index.nearest, (35, -78))
+
+
+if __name__ == '__main__':
+    unittest.main()
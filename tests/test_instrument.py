@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+import unittest
+
+from webmercator import BoundingBox, Grid, Point, PointArray, expiry, instrument
+
+
+class RecordingHandler(logging.Handler):
+    """ Keeps every record; `assertLogs` is not available on Python 2 """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestInstrument(unittest.TestCase):
+
+    def setUp(self):
+        self.bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=20, zoom_level=12)
+
+    def tearDown(self):
+        instrument.disable()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(instrument.is_enabled())
+        original = vars(Point)['tile_x']
+        with instrument.recording():
+            self.assertTrue(instrument.is_enabled())
+            self.assertIsNot(vars(Point)['tile_x'], original)
+        self.assertFalse(instrument.is_enabled())
+        self.assertIs(vars(Point)['tile_x'], original)
+
+    def test_recording(self):
+        with instrument.recording() as stats:
+            grid = self.bb.tile_grid
+            tiles = list(self.bb.coverage(10, 12))
+            pa = PointArray(latitude=[1, 2, 3], longitude=[4, 5, 6])
+            pa.tile_x
+
+        totals = stats.snapshot()
+        self.assertEqual(totals['box.tile_grid'], {'calls': 1, 'seconds': totals['box.tile_grid']['seconds'],
+                                                   'items': len(grid)})
+        self.assertEqual(totals['box.coverage']['items'], len(tiles))
+        self.assertEqual(totals['tiles.coverage']['items'], len(tiles))
+        self.assertEqual(totals['box.vertices']['calls'], 1)
+        self.assertEqual(totals['batch.points']['items'], 3)
+        self.assertEqual(totals['batch.tile_x']['items'], 3)
+        self.assertGreater(totals['box.coverage']['seconds'], 0)
+
+        # nothing is reported once disabled
+        list(self.bb.coverage(10, 12))
+        self.assertEqual(stats.snapshot(), totals)
+
+    def test_results_unchanged(self):
+        expected = (list(self.bb.coverage(8, 12, 'hilbert')), self.bb.tile_grid, list(self.bb.disc_spans()),
+                    list(expiry.expiry([self.bb], 12, 10, 12)))
+        with instrument.recording():
+            bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=20, zoom_level=12)
+            self.assertEqual((list(bb.coverage(8, 12, 'hilbert')), bb.tile_grid, list(bb.disc_spans()),
+                              list(expiry.expiry([bb], 12, 10, 12))), expected)
+            self.assertRaises(ValueError, Grid(vertex=(0, 0), width=3, height=3).quadkeys, 1)
+
+    def test_spans(self):
+        with instrument.recording(operations='box.disc_spans') as stats:
+            spans = list(self.bb.disc_spans())
+        self.assertEqual(list(stats.snapshot()), ['box.disc_spans'])
+        self.assertEqual(stats.snapshot()['box.disc_spans']['items'], sum(e - s + 1 for _, s, e in spans))
+
+    def test_closed_iterator(self):
+        with instrument.recording(operations=['grid']) as stats:
+            tiles = iter(Grid(vertex=(0, 0), width=9, height=9))
+            next(tiles), next(tiles)
+            tiles.close()
+        self.assertEqual(stats.snapshot()['grid.iter']['items'], 2)
+
+    def test_operations(self):
+        with instrument.recording(operations=['point', 'grid.iter']) as stats:
+            Point(latitude=1, longitude=2).tile_x
+            list(Grid(vertex=(0, 0), width=2, height=2))
+            list(Grid(vertex=(0, 0), width=2, height=2).walk('morton'))
+        self.assertEqual(sorted(stats.snapshot()), ['grid.iter', 'point.init', 'point.pixel_x', 'point.tile_x'])
+
+        self.assertRaises(ValueError, instrument.enable, instrument.Stats(), operations=['points'])
+        self.assertRaises(ValueError, instrument.enable)
+        self.assertRaises(TypeError, instrument.enable, 'sink')
+        self.assertFalse(instrument.is_enabled())
+
+    def test_callback_and_log_sinks(self):
+        events = []
+        records = RecordingHandler()
+        logger = logging.getLogger('webmercator.test')
+        logger.addHandler(records)
+        logger.setLevel(logging.DEBUG)
+        try:
+            instrument.enable(lambda *event: events.append(event), instrument.LogSink(logger),
+                              operations='box.tile_grid')
+            self.bb.tile_grid
+            instrument.disable()
+        finally:
+            logger.removeHandler(records)
+            logger.setLevel(logging.NOTSET)
+
+        self.assertEqual([(e[0], e[2]) for e in events], [('box.tile_grid', len(self.bb.tile_grid))])
+        self.assertEqual(len(records.records), 1)
+        self.assertIn('box.tile_grid: {} items'.format(len(self.bb.tile_grid)), records.records[0].getMessage())
+
+    def test_stats(self):
+        stats = instrument.Stats()
+        stats('grid.iter', 0.5, 4)
+        stats('grid.iter', 0.25, 2)
+        self.assertEqual(stats.snapshot(), {'grid.iter': {'calls': 2, 'seconds': 0.75, 'items': 6}})
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from webmercator import BoundingBox
+from webmercator import Grid
+from webmercator import metatiles
+from webmercator import Point
+
+
+class TestMetatiles(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = Grid(vertex=(13, 6), width=20, height=9, zoom_level=10)
+
+    def test_metatile(self):
+        self.assertEqual(metatiles.metatile(13, 6), (1, 0))
+        self.assertEqual(metatiles.metatile(16, 7, size=4), (4, 1))
+        self.assertRaises(ValueError, metatiles.metatile, 1, 1, 0)
+
+    def test_metatile_grid(self):
+        grid = metatiles.metatile_grid(1, 0)
+        self.assertEqual((grid.min_x, grid.min_y, grid.max_x, grid.max_y), (8, 0, 15, 7))
+        self.assertEqual(len(metatiles.metatile_grid(0, 0, zoom_level=2)), 16)
+        self.assertEqual(metatiles.metatile_grid(0, 0, zoom_level=2).zoom_level, 2)
+
+    def test_metatile_range(self):
+        meta = metatiles.metatile_range(self.grid)
+        self.assertEqual((meta.min_x, meta.min_y, meta.max_x, meta.max_y), (1, 0, 4, 1))
+        self.assertEqual(meta.zoom_level, 10)
+        self.assertEqual(len(metatiles.metatile_range(Grid(vertex=(0, 0), width=-1, height=-1))), 0)
+
+    def test_metatiles_partition(self):
+        for size in (1, 3, 8, 64):
+            found = list(metatiles.metatiles(self.grid, size))
+            self.assertEqual(len(found), len(set((x, y) for x, y, _ in found)))
+
+            tiles = [t for _, _, sub in found for t in sub]
+            self.assertEqual(sorted(tiles), sorted(self.grid))
+            for meta_x, meta_y, sub in found:
+                self.assertTrue(len(sub))
+                self.assertEqual(sub.zoom_level, 10)
+                for x, y in sub:
+                    self.assertEqual(metatiles.metatile(x, y, size), (meta_x, meta_y))
+
+    def test_metatiles_order(self):
+        found = [(x, y) for x, y, _ in metatiles.metatiles(self.grid, 4, order='hilbert')]
+        self.assertEqual(found, list(metatiles.metatile_range(self.grid, 4).walk('hilbert')))
+
+
+class TestBoundingBoxMetatiles(unittest.TestCase):
+
+    def test_metatiles(self):
+        bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=25, zoom_level=14)
+        found = list(bb.metatiles())
+        self.assertEqual(sorted(t for _, _, sub in found for t in sub), sorted(bb.tile_grid))
+        self.assertEqual(len(found), len(metatiles.metatile_range(bb.tile_grid)))
+
+    def test_antimeridian(self):
+        bb = BoundingBox(Point(latitude=-17.7, longitude=179.95), radius=20, zoom_level=12)
+        found = list(bb.metatiles())
+        self.assertEqual(sorted(t for _, _, sub in found for t in sub), sorted(t for g in bb.tile_grids for t in g))
+        self.assertLess(len(found), 20)
+
+    def test_antimeridian_shared_metatile(self):
+        for zoom_level, size in ((3, 8), (1, 8), (4, 4), (5, 8)):
+            bb = BoundingBox(Point(latitude=-17.7, longitude=179.95), radius=200, zoom_level=zoom_level)
+            found = list(bb.metatiles(size))
+            tiles = [t for _, _, sub in found for t in sub]
+            self.assertEqual(sorted(tiles), sorted(t for g in bb.tile_grids for t in g))
+            for meta_x, meta_y, sub in found:
+                self.assertEqual(set(metatiles.metatile(x, y, size) for x, y in sub), {(meta_x, meta_y)})
+
+        # the pieces at tile x 7 and 0 leave a gap in metatile (0, 0), so it comes once per piece
+        bb = BoundingBox(Point(latitude=-17.7, longitude=179.95), radius=200, zoom_level=3)
+        found = list(bb.metatiles())
+        self.assertEqual([(x, y, sub.min_x, sub.columns) for x, y, sub in found], [(0, 0, 7, 1), (0, 0, 0, 1)])
+
+        # at zoom level 1 they touch, and the joined metatile comes once
+        bb = BoundingBox(Point(latitude=-17.7, longitude=179.95), radius=200, zoom_level=1)
+        found = list(bb.metatiles())
+        self.assertEqual([(x, y, sub.min_x, sub.columns) for x, y, sub in found], [(0, 0, 0, 2)])
+
+    def test_invalid_size(self):
+        bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=25, zoom_level=14)
+        self.assertRaises(ValueError, list, bb.metatiles(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -103,6 +103,13 @@ class TestPoint(unittest.TestCase):
         self.pt_null.longitude = nl
         self.assertEqual(self.pt_null.longitude, self.longitude)
 
+    def test_longitude_far_out_of_bounds(self):
+        self.assertAlmostEqual(Point(latitude=0, longitude=1e12 + 45).longitude, -35, places=3)
+        self.assertEqual(Point(latitude=0, longitude=-540).longitude, -180)
+        self.assertEqual(Point(latitude=0, longitude=540).longitude, 180)
+        for value in (float('inf'), float('-inf'), float('nan')):
+            self.assertRaises(ValueError, Point, latitude=0, longitude=value)
+
     def test_get_set_meter_x(self):
         self.assertIsNone(self.pt_null.meter_x)
         self.pt_null.meter_x = self.meter_x
@@ -159,6 +166,58 @@ class TestPoint(unittest.TestCase):
         self.pt_null.tile_y = self.tile_y_14
         self.assertEqual(self.pt_null.tile_y, self.tile_y_14)
 
+    def test_get_set_quadkey(self):
+        self.assertIsNone(self.pt_null.quadkey)
+        self.assertEqual(len(self.pt.quadkey), self.zoom_level)
+
+        self.pt_null.quadkey = self.pt.quadkey
+        self.assertEqual(self.pt_null.zoom_level, self.zoom_level)
+        self.assertEqual(self.pt_null.tile_x, self.tile_x_14)
+        self.assertEqual(self.pt_null.tile_y, self.tile_y_14)
+
+        self.assertEqual(Point(quadkey='213').quadkey, '213')
+
+    def test_quadkey_map_edge(self):
+        pt = Point(latitude=-90, longitude=180, zoom_level=3)
+        self.assertEqual(pt.quadkey, '333')
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.pt, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.pt.altitude = 1
+
+    def test_cache_invalidated_by_latitude(self):
+        pixel_y, meter_y, tile_y = self.pt.pixel_y, self.pt.meter_y, self.pt.tile_y
+        self.pt.latitude = self.latitude + 1
+        self.assertNotEqual(self.pt.pixel_y, pixel_y)
+        self.assertNotEqual(self.pt.meter_y, meter_y)
+        self.assertNotEqual(self.pt.tile_y, tile_y)
+        self.assertEqual(self.pt.pixel_y, Point(latitude=self.latitude + 1, longitude=self.longitude).pixel_y)
+
+    def test_cache_invalidated_by_longitude(self):
+        pixel_x, meter_x, tile_x = self.pt.pixel_x, self.pt.meter_x, self.pt.tile_x
+        self.pt.longitude = self.longitude + 1
+        self.assertNotEqual(self.pt.pixel_x, pixel_x)
+        self.assertNotEqual(self.pt.meter_x, meter_x)
+        self.assertNotEqual(self.pt.tile_x, tile_x)
+
+    def test_cache_invalidated_by_zoom_level(self):
+        self.assertEqual(self.pt.pixel_x, self.pixel_x_14)
+        self.assertEqual(self.pt.tile_y, self.tile_y_14)
+        self.pt.zoom_level = 15
+        pt_15 = Point(latitude=self.latitude, longitude=self.longitude, zoom_level=15)
+        self.assertEqual(self.pt.tile_x, pt_15.tile_x)
+        self.assertEqual(self.pt.pixel_y, pt_15.pixel_y)
+
+    def test_cache_invalidated_by_pixel_setter(self):
+        self.pt.pixel_x
+        self.pt.pixel_x = self.pixel_x_14 + 256
+        self.assertEqual(self.pt.tile_x, self.tile_x_14 + 1)
+
+    def test_tile_key(self):
+        self.assertIsNone(self.pt_null.tile_key)
+        self.assertNotEqual(self.pt.tile_key, Point(latitude=self.latitude, longitude=self.longitude + 1).tile_key)
+
 
 # TEST conversions
 class TestPointConversions(unittest.TestCase):
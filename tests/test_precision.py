@@ -0,0 +1,135 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+import struct
+import unittest
+
+from webmercator import BoundingBox, Point, PointArray, BoundingBoxArray, buffers, precision
+from webmercator.batch import BACKENDS
+
+
+class TestPrecision(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(22)
+        self.coords = [(rand.uniform(-89, 89), rand.uniform(-180, 180)) for _ in range(200)]
+
+    def test_get_precision(self):
+        self.assertIs(precision.get_precision(), precision.EXACT)
+        self.assertIs(precision.get_precision('fast'), precision.FAST)
+        self.assertIs(precision.get_precision(precision.E7), precision.E7)
+        self.assertRaises(ValueError, precision.get_precision, 'e9')
+
+    def test_exact_is_default(self):
+        pt = Point(latitude=35.7718344444, longitude=-438.6779724444)
+        self.assertIs(pt.precision, precision.EXACT)
+        self.assertEqual(pt.latitude, 35.77183444)
+        self.assertEqual(pt.longitude, -78.67797244)
+        self.assertEqual(pt.meter_x, round(pt.meter_x, Point.metric_exp))
+
+    def test_fast(self):
+        pt = Point(latitude=35.7718344444, longitude=-78.6779724444, precision='fast')
+        self.assertEqual(pt.latitude, 35.7718344444)
+        self.assertEqual(pt.longitude, -78.6779724444)
+
+        exact = Point(latitude=pt.latitude, longitude=pt.longitude)
+        self.assertAlmostEqual(pt.meter_x, exact.meter_x, delta=1e-3)
+        self.assertAlmostEqual(pt.meter_y, exact.meter_y, delta=1e-3)
+
+    def test_wrap(self):
+        for value in (540, 190, -190, -540, 181.5, -181.5, 900.25, -900.25):
+            exact = Point(latitude=0, longitude=value).longitude
+            for name in ('fast', 'e7'):
+                self.assertAlmostEqual(Point(latitude=0, longitude=value, precision=name).longitude, exact)
+
+        # far out of range values wrap in constant time
+        self.assertAlmostEqual(Point(latitude=0, longitude=1e12 + 45, precision='fast').longitude, -35, places=3)
+
+    def test_e7(self):
+        pt = Point(latitude=35.77183446, longitude=-78.67797249, precision='e7')
+        self.assertEqual((pt.latitude_e7, pt.longitude_e7), (357718345, -786779725))
+        self.assertEqual(pt.latitude, 35.7718345)
+        self.assertEqual(pt.meter_x, round(pt.meter_x, 3))
+        self.assertEqual(Point(latitude=35.77183446, longitude=0).latitude_e7, 357718345)
+
+    def test_tiles_agree(self):
+        for lat, lon in self.coords:
+            exact = Point(latitude=lat, longitude=lon, zoom_level=16)
+            for name in ('fast', 'e7'):
+                pt = Point(latitude=lat, longitude=lon, zoom_level=16, precision=name)
+                self.assertEqual((pt.tile_x, pt.tile_y), (exact.tile_x, exact.tile_y))
+
+    def test_bounding_box(self):
+        pt = Point(latitude=35.771834, longitude=-78.677972, precision='e7')
+        bb = BoundingBox(pt, radius=10)
+        self.assertIs(bb.precision, precision.E7)
+        self.assertIs(bb.vertex_top_left.precision, precision.E7)
+        self.assertEqual(bb.min_latitude, round(bb.min_latitude * 10 ** 7) / 10 ** 7)
+
+        exact = BoundingBox(pt, radius=10, precision='exact')
+        self.assertIs(exact.pt_center.precision, precision.EXACT)
+        self.assertEqual(bb.tile_grid, exact.tile_grid)
+
+    def test_point_array(self):
+        lats, lons = [c[0] for c in self.coords], [c[1] + 720 for c in self.coords]
+        for name in ('fast', 'e7'):
+            points = [Point(latitude=lat, longitude=lon, precision=name) for lat, lon in zip(lats, lons)]
+            for backend in BACKENDS:
+                pa = PointArray(latitude=lats, longitude=lons, precision=name, backend=backend)
+                self.assertIs(pa.precision, precision.get_precision(name))
+                self.assertIs(pa[0].precision, pa.precision)
+                self.assertEqual(list(pa.tile_x), [p.tile_x for p in points])
+                self.assertEqual(list(pa.tile_y), [p.tile_y for p in points])
+                for values, expected in ((pa.latitude, [p.latitude for p in points]),
+                                         (pa.longitude, [p.longitude for p in points]),
+                                         (pa.meter_y, [p.meter_y for p in points])):
+                    for value, point_value in zip(values, expected):
+                        if name == 'e7':
+                            self.assertEqual(value, point_value)
+                        else:
+                            self.assertAlmostEqual(value, point_value, delta=1e-6)
+
+        pa = PointArray.from_points([Point(latitude=1, longitude=2, precision='fast')])
+        self.assertIs(pa.precision, precision.FAST)
+
+    def test_bounding_box_array(self):
+        pa = PointArray(latitude=[c[0] for c in self.coords], longitude=[c[1] for c in self.coords], precision='e7')
+        boxes = BoundingBoxArray(pa, radius=5)
+        for i, bb in enumerate(boxes):
+            self.assertIs(bb.precision, precision.E7)
+            self.assertEqual(boxes.min_latitude[i], bb.min_latitude)
+            self.assertEqual(boxes.max_longitude[i], bb.max_longitude)
+
+    def test_buffers(self):
+        packed = struct.pack('<{}d'.format(2 * len(self.coords)), *[v for c in self.coords for v in c])
+        for backend in BACKENDS:
+            out = buffers.allocate(len(self.coords))
+            buffers.convert_into(packed, out, target='geo', backend=backend, precision='e7')
+            values = struct.unpack('<{}d'.format(2 * len(self.coords)), bytes(out))
+            for i, (lat, lon) in enumerate(self.coords):
+                pt = Point(latitude=lat, longitude=lon, precision='e7')
+                self.assertEqual(values[2 * i:2 * i + 2], (pt.latitude, pt.longitude))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+import unittest
+
+from webmercator import quadkey
+from webmercator.batch import BACKENDS
+
+
+def reference_quadkey(tile_x, tile_y, zoom_level):
+    """ Per-digit construction from the Bing Maps Tile System article """
+    digits = []
+    for i in range(zoom_level, 0, -1):
+        digit = 0
+        mask = 1 << (i - 1)
+        if tile_x & mask:
+            digit += 1
+        if tile_y & mask:
+            digit += 2
+        digits.append(str(digit))
+    return ''.join(digits)
+
+
+class TestQuadkey(unittest.TestCase):
+
+    def setUp(self):
+        rand = random.Random(6)
+        self.tiles = [(0, 0, 1), (1, 1, 1), (3, 5, 3), (4611, 6446, 14), (2 ** 23 - 1, 2 ** 23 - 1, 23)]
+        for _ in range(200):
+            zl = rand.randint(1, 23)
+            self.tiles.append((rand.randrange(2 ** zl), rand.randrange(2 ** zl), zl))
+
+    def test_bing_example(self):
+        self.assertEqual(quadkey.to_quadkey(3, 5, 3), '213')
+        self.assertEqual(quadkey.from_quadkey('213'), (3, 5, 3))
+
+    def test_matches_reference(self):
+        for x, y, zl in self.tiles:
+            self.assertEqual(quadkey.to_quadkey(x, y, zl), reference_quadkey(x, y, zl))
+
+    def test_round_trip(self):
+        for tile in self.tiles:
+            self.assertEqual(quadkey.from_quadkey(quadkey.to_quadkey(*tile)), tile)
+            self.assertEqual(quadkey.unpack(quadkey.pack(*tile)), tile)
+
+    def test_interleave(self):
+        self.assertEqual(quadkey.interleave(0b11, 0b00), 0b0101)
+        self.assertEqual(quadkey.interleave(0b00, 0b11), 0b1010)
+        for x, y, _ in self.tiles:
+            self.assertEqual(quadkey.deinterleave(quadkey.interleave(x, y)), (x, y))
+
+    def test_zoom_zero(self):
+        self.assertEqual(quadkey.to_quadkey(0, 0, 0), '')
+        self.assertEqual(quadkey.from_quadkey(''), (0, 0, 0))
+
+    def test_invalid(self):
+        for qk in ('4', '01a', ' 0', '1_2', '0' * 24):
+            with self.assertRaises(ValueError):
+                quadkey.from_quadkey(qk)
+
+        with self.assertRaises(ValueError):
+            quadkey.to_quadkey(8, 0, 3)
+
+        with self.assertRaises(ValueError):
+            quadkey.pack(0, -1, 3)
+
+        with self.assertRaises(ValueError):
+            quadkey.pack(0, 0, 24)
+
+    def test_pack_ordering(self):
+        keys = [quadkey.pack(*tile) for tile in self.tiles]
+        self.assertTrue(all(0 < k < 2 ** 63 for k in keys))
+
+        ordered = sorted(self.tiles, key=lambda t: (t[2], quadkey.interleave(t[0], t[1])))
+        self.assertEqual([quadkey.unpack(k) for k in sorted(keys)], ordered)
+
+    def test_arrays(self):
+        for backend in BACKENDS:
+            for zl in (1, 14, 23):
+                tiles = [(x, y) for x, y, z in self.tiles if z <= zl]
+                xs, ys = [t[0] for t in tiles], [t[1] for t in tiles]
+
+                keys = quadkey.pack_array(xs, ys, zl, backend=backend)
+                self.assertEqual(list(keys), [quadkey.pack(x, y, zl) for x, y in tiles])
+
+                tile_x, tile_y, zoom_levels = quadkey.unpack_array(keys, backend=backend)
+                self.assertEqual(list(tile_x), xs)
+                self.assertEqual(list(tile_y), ys)
+                self.assertEqual(set(zoom_levels), {zl})
+
+                qks = quadkey.quadkeys(xs, ys, zl, backend=backend)
+                self.assertEqual(qks, [quadkey.to_quadkey(x, y, zl) for x, y in tiles])
+
+                tile_x, tile_y, zoom_levels = quadkey.from_quadkeys(qks, backend=backend)
+                self.assertEqual(list(tile_x), xs)
+                self.assertEqual(list(tile_y), ys)
+
+    def test_arrays_invalid(self):
+        with self.assertRaises(ValueError):
+            quadkey.quadkeys([0, 8], [0, 0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
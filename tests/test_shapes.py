@@ -0,0 +1,192 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import random
+import unittest
+
+from webmercator import BoundingBox
+from webmercator import Point
+from webmercator import shapes
+
+
+def pixel_tile(pt, zoom_level):
+    """ Fractional tile coordinates, as the rasterizer sees them """
+    pt = Point(latitude=pt.latitude, longitude=pt.longitude, zoom_level=zoom_level)
+    return pt.pixel_x / 256, pt.pixel_y / 256
+
+
+def inside(x, y, ring):
+    result = False
+    for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]):
+        if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+            result = not result
+    return result
+
+
+class TestShapes(unittest.TestCase):
+
+    def setUp(self):
+        self.zoom_level = 12
+        rand = random.Random(11)
+        self.ring = []
+        for i in range(7):
+            angle = 2 * math.pi * i / 7 + rand.uniform(-0.2, 0.2)
+            distance = rand.uniform(0.05, 0.5)
+            self.ring.append(Point(latitude=35.77 + distance * math.sin(angle),
+                                   longitude=-78.67 + distance * math.cos(angle)))
+
+    def test_polygon_complete(self):
+        tiles = set(shapes.polygon_tiles(self.ring, self.zoom_level))
+        ring = [pixel_tile(p, self.zoom_level) for p in self.ring]
+        xs, ys = [p[0] for p in ring], [p[1] for p in ring]
+
+        rand = random.Random(12)
+        for _ in range(5000):
+            x, y = rand.uniform(min(xs), max(xs)), rand.uniform(min(ys), max(ys))
+            if inside(x, y, ring):
+                self.assertIn((int(x), int(y)), tiles)
+
+    def test_polygon_smaller_than_bounding_rectangle(self):
+        triangle = [Point(latitude=35.0, longitude=-79.0), Point(latitude=36.0, longitude=-79.0),
+                    Point(latitude=35.0, longitude=-78.0)]
+        tiles = list(shapes.polygon_tiles(triangle, self.zoom_level))
+        self.assertEqual(len(tiles), len(set(tiles)))
+
+        xs, ys = [t[0] for t in tiles], [t[1] for t in tiles]
+        rectangle = (max(xs) - min(xs) + 1) * (max(ys) - min(ys) + 1)
+        self.assertLess(len(tiles), 0.6 * rectangle)
+
+    def test_rectangle_matches_bounding_box(self):
+        bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=10, zoom_level=self.zoom_level)
+        ring = [Point(latitude=bb.max_latitude, longitude=bb.min_longitude),
+                Point(latitude=bb.max_latitude, longitude=bb.max_longitude),
+                Point(latitude=bb.min_latitude, longitude=bb.max_longitude),
+                Point(latitude=bb.min_latitude, longitude=bb.min_longitude)]
+        self.assertEqual(set(shapes.polygon_tiles(ring, self.zoom_level)), set(bb.tile_grid))
+
+    def test_polygon_hole(self):
+        outer = [Point(latitude=35.0, longitude=-80.0), Point(latitude=37.0, longitude=-80.0),
+                 Point(latitude=37.0, longitude=-78.0), Point(latitude=35.0, longitude=-78.0)]
+        hole = [Point(latitude=35.5, longitude=-79.5), Point(latitude=36.5, longitude=-79.5),
+                Point(latitude=36.5, longitude=-78.5), Point(latitude=35.5, longitude=-78.5)]
+        full = set(shapes.polygon_tiles(outer, 10))
+        holed = set(shapes.polygon_tiles(outer, 10, holes=[hole]))
+
+        self.assertLess(len(holed), len(full))
+        self.assertTrue(holed < full)
+        center = Point(latitude=36.0, longitude=-79.0, zoom_level=10)
+        self.assertNotIn((center.tile_x, center.tile_y), holed)
+
+    def test_polyline(self):
+        tiles = set(shapes.polyline_tiles(self.ring, self.zoom_level))
+        ring = [pixel_tile(p, self.zoom_level) for p in self.ring]
+        for (x0, y0), (x1, y1) in zip(ring, ring[1:]):
+            for k in range(101):
+                t = k / 100
+                self.assertIn((int(x0 + t * (x1 - x0)), int(y0 + t * (y1 - y0))), tiles)
+
+    def test_polyline_single_point(self):
+        pt = Point(latitude=35.771834, longitude=-78.677972)
+        self.assertEqual(list(shapes.polyline_tiles([pt], 14)), [(pt.tile_x, pt.tile_y)])
+
+    def test_spans_sorted(self):
+        spans = list(shapes.polygon_spans(self.ring, self.zoom_level))
+        self.assertEqual(spans, sorted(spans))
+        for y, start, stop in spans:
+            self.assertLessEqual(start, stop)
+
+    def test_clipped_to_map(self):
+        ring = [Point(latitude=89, longitude=-180), Point(latitude=89, longitude=180),
+                Point(latitude=-89, longitude=180), Point(latitude=-89, longitude=-180)]
+        self.assertEqual(len(list(shapes.polygon_tiles(ring, 3))), 64)
+
+    def test_invalid_points(self):
+        with self.assertRaises(TypeError):
+            list(shapes.polygon_tiles([(35.0, -78.0)], 10))
+
+
+def destination(center, distance, bearing):
+    """ Point `distance` miles from `center` along `bearing`, in radians """
+    angular = distance / 3959.0
+    lat, lon = math.radians(center.latitude), math.radians(center.longitude)
+    lat2 = math.asin(math.sin(lat) * math.cos(angular) + math.cos(lat) * math.sin(angular) * math.cos(bearing))
+    lon2 = lon + math.atan2(math.sin(bearing) * math.sin(angular) * math.cos(lat),
+                            math.cos(angular) - math.sin(lat) * math.sin(lat2))
+    return math.degrees(lat2), (math.degrees(lon2) + 180) % 360 - 180
+
+
+def exact_tile(latitude, longitude, zoom_level):
+    tiles = 2 ** zoom_level
+    sin_lat = math.sin(math.radians(latitude))
+    y = int(math.floor((0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * tiles))
+    return int(math.floor((longitude + 180) / 360 * tiles)) % tiles, min(max(y, 0), tiles - 1)
+
+
+class TestDisc(unittest.TestCase):
+
+    def assertCoversDisc(self, center, radius, zoom_level, samples=500):
+        tiles = set(shapes.disc_tiles(center, radius, zoom_level))
+        rand = random.Random(13)
+        for _ in range(samples):
+            distance = radius * math.sqrt(rand.random())
+            lat, lon = destination(center, distance, rand.uniform(0, 2 * math.pi))
+            self.assertIn(exact_tile(lat, lon, zoom_level), tiles)
+
+            lat, lon = destination(center, radius, rand.uniform(0, 2 * math.pi))
+            self.assertIn(exact_tile(lat, lon, zoom_level), tiles)
+        return tiles
+
+    def test_covers_disc(self):
+        for lat, lon, radius, zoom_level in ((35.771834, -78.677972, 2.5, 14), (60.0, 10.0, 50, 10),
+                                             (-45.0, 170.0, 300, 6), (0.0, 0.0, 0.1, 18)):
+            self.assertCoversDisc(Point(latitude=lat, longitude=lon), radius, zoom_level)
+
+    def test_fewer_tiles_than_box(self):
+        bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=10, zoom_level=15)
+        disc = list(bb.disc_tiles())
+        self.assertEqual(len(disc), len(set(disc)))
+        self.assertLess(len(disc), 0.85 * len(bb.tile_grid))
+        self.assertGreater(len(disc), 0.7 * len(bb.tile_grid))
+
+    def test_antimeridian(self):
+        tiles = self.assertCoversDisc(Point(latitude=-17.0, longitude=179.9), 30, 9)
+        self.assertIn(0, set(x for x, _ in tiles))
+        self.assertIn(2 ** 9 - 1, set(x for x, _ in tiles))
+        self.assertLess(len(tiles), 100)
+
+    def test_pole(self):
+        tiles = self.assertCoversDisc(Point(latitude=84.0, longitude=0.0), 700, 4)
+        self.assertEqual(set(x for x, y in tiles if y == 0), set(range(16)))
+
+    def test_zero_radius(self):
+        pt = Point(latitude=35.771834, longitude=-78.677972)
+        self.assertEqual(list(shapes.disc_tiles(pt, 0, 14)), [(pt.tile_x, pt.tile_y)])
+
+    def test_box_disc_spans(self):
+        bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=10, zoom_level=12)
+        expanded = [(x, y) for y, start, stop in bb.disc_spans() for x in range(start, stop + 1)]
+        self.assertEqual(expanded, list(bb.disc_tiles()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+import unittest
+
+from webmercator import BoundingBox
+from webmercator import Grid
+from webmercator import Point
+from webmercator import quadkey
+from webmercator import tiles
+from webmercator.batch import BACKENDS
+
+
+class TestTiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tile = (4611, 6446, 14)
+
+    def test_parent(self):
+        self.assertEqual(tiles.parent(*self.tile), (2305, 3223, 13))
+        self.assertEqual(tiles.parent(*self.tile, parent_zoom=0), (0, 0, 0))
+        self.assertEqual(tiles.parent(*self.tile, parent_zoom=14), self.tile)
+
+    def test_parent_matches_quadkey_prefix(self):
+        qk = quadkey.to_quadkey(*self.tile)
+        for z in range(1, 14):
+            self.assertEqual(quadkey.to_quadkey(*tiles.parent(*self.tile, parent_zoom=z)), qk[:z])
+
+    def test_parent_invalid(self):
+        with self.assertRaises(ValueError):
+            tiles.parent(*self.tile, parent_zoom=15)
+
+        with self.assertRaises(ValueError):
+            tiles.parent(0, 0, 0)
+
+    def test_children(self):
+        kids = tiles.children(*self.tile)
+        qk = quadkey.to_quadkey(*self.tile)
+        self.assertEqual([quadkey.to_quadkey(*k) for k in kids], [qk + d for d in '0123'])
+        for k in kids:
+            self.assertEqual(tiles.parent(*k), self.tile)
+
+        with self.assertRaises(ValueError):
+            tiles.children(0, 0, 23)
+
+    def test_descendant_grid(self):
+        grid = tiles.descendant_grid(*self.tile, descendant_zoom=16)
+        self.assertEqual(len(grid), 16)
+        self.assertEqual(grid.zoom_level, 16)
+        for x, y in grid:
+            self.assertEqual(tiles.parent(x, y, 16, parent_zoom=14), self.tile)
+
+        with self.assertRaises(ValueError):
+            tiles.descendant_grid(*self.tile, descendant_zoom=13)
+
+    def test_descendants(self):
+        found = list(tiles.descendants(*self.tile, max_zoom=17))
+        self.assertEqual(len(found), 4 + 16 + 64)
+        self.assertEqual(len(set(found)), len(found))
+        self.assertEqual([t[2] for t in found], sorted(t[2] for t in found))
+
+        found = list(tiles.descendants(*self.tile, max_zoom=17, min_zoom=17))
+        self.assertEqual(len(found), 64)
+
+    def test_coverage(self):
+        grid = Grid(vertex=(10, 20), width=3, height=1, zoom_level=5)
+        found = list(tiles.coverage(grid, 3, 6))
+        by_zoom = {}
+        for x, y, z in found:
+            by_zoom.setdefault(z, set()).add((x, y))
+
+        self.assertEqual(by_zoom[5], set(grid))
+        self.assertEqual(by_zoom[4], set(tiles.parent(x, y, 5)[:2] for x, y in grid))
+        self.assertEqual(len(by_zoom[6]), 4 * len(grid))
+        self.assertEqual(by_zoom[3], {(2, 5), (3, 5)})
+
+    def test_coverage_order(self):
+        grid = Grid(vertex=(10, 20), width=3, height=1, zoom_level=5)
+        found = list(tiles.coverage(grid, 4, 6, order='hilbert'))
+        self.assertEqual(sorted(found), sorted(tiles.coverage(grid, 4, 6)))
+        for z in (4, 5, 6):
+            self.assertEqual([(x, y) for x, y, zl in found if zl == z], list(grid.at_zoom(z).walk('hilbert')))
+
+
+class TestBoundingBoxCoverage(unittest.TestCase):
+
+    def setUp(self):
+        self.pt = Point(latitude=35.771834, longitude=-78.677972)
+        self.bb = BoundingBox(self.pt, radius=2.5)
+
+    def test_tile_grid_at(self):
+        for zl in (3, 10, 14, 18):
+            bb = BoundingBox(self.pt, radius=2.5, zoom_level=zl)
+            self.assertEqual(list(self.bb.tile_grid_at(zl)), list(bb.tile_grid))
+        self.assertEqual(self.bb.tile_grid_at(14), self.bb.tile_grid)
+
+    def test_coverage_contains_box(self):
+        found = set(self.bb.coverage(3, 18))
+        for zl in range(3, 19):
+            grid = self.bb.tile_grid_at(zl)
+            # the shifted range may only grow at the edges, never miss a projected tile
+            for x, y in grid:
+                self.assertIn((x, y, zl), found)
+
+    def test_coverage_order(self):
+        found = list(self.bb.coverage(10, 14, order='morton'))
+        self.assertEqual(sorted(found), sorted(self.bb.coverage(10, 14)))
+        level = [(x, y) for x, y, z in found if z == 14]
+        self.assertEqual(level, list(self.bb.tile_grid_at(14).walk('morton')))
+
+    def test_coverage_no_duplicates(self):
+        found = list(self.bb.coverage(3, 16))
+        self.assertEqual(len(found), len(set(found)))
+        self.assertEqual(set(z for _, _, z in found), set(range(3, 17)))
+
+
+class TestTileBounds(unittest.TestCase):
+
+    def setUp(self):
+        self.tiles = [(4611, 6446, 14), (0, 0, 1), (1, 1, 1), (2 ** 23 - 1, 0, 23), (12, 37, 7)]
+
+    def corners(self, tile_x, tile_y, zoom_level):
+        return (Point(tile_x=tile_x, tile_y=tile_y, zoom_level=zoom_level),
+                Point(tile_x=tile_x + 1, tile_y=tile_y + 1, zoom_level=zoom_level))
+
+    def test_geo_bounds(self):
+        for tile in self.tiles:
+            top_left, bottom_right = self.corners(*tile)
+            self.assertEqual(tiles.geo_bounds(*tile), (bottom_right.latitude, top_left.latitude,
+                                                       top_left.longitude, bottom_right.longitude))
+
+    def test_geo_bounds_zoom_zero(self):
+        min_lat, max_lat, min_lon, max_lon = tiles.geo_bounds(0, 0, 0)
+        self.assertEqual((min_lon, max_lon), (-180, 180))
+        self.assertAlmostEqual(max_lat, 85.05112878)
+        self.assertAlmostEqual(min_lat, -85.05112878)
+
+    def test_meter_bounds(self):
+        for tile in self.tiles:
+            top_left, bottom_right = self.corners(*tile)
+            expected = (top_left.meter_x, bottom_right.meter_y, bottom_right.meter_x, top_left.meter_y)
+            for value, meters in zip(tiles.meter_bounds(*tile), expected):
+                # `Point` goes through a rounded latitude, the bounds do not
+                self.assertAlmostEqual(value, meters, delta=0.01)
+
+        self.assertEqual(tiles.meter_bounds(0, 0, 0)[2], -1 * tiles.meter_bounds(0, 0, 0)[0])
+
+    def test_pixel_bounds(self):
+        self.assertEqual(tiles.pixel_bounds(4611, 6446, 14), (1180416, 1650176, 1180672, 1650432))
+        top_left, _ = self.corners(4611, 6446, 14)
+        self.assertEqual(tiles.pixel_bounds(4611, 6446, 14)[:2], (top_left.pixel_x, top_left.pixel_y))
+
+    def test_invalid(self):
+        for bounds in (tiles.geo_bounds, tiles.meter_bounds, tiles.pixel_bounds):
+            self.assertRaises(ValueError, bounds, 2, 0, 1)
+            self.assertRaises(ValueError, bounds, 0, -1, 1)
+            self.assertRaises(ValueError, bounds, 0, 0, 24)
+
+    def test_arrays(self):
+        tile_x, tile_y = [4611, 0, 16383, 77], [6446, 16383, 0, 5000]
+        for backend in BACKENDS:
+            geo = tiles.geo_bounds_array(tile_x, tile_y, 14, backend=backend)
+            meters = tiles.meter_bounds_array(tile_x, tile_y, 14, backend=backend)
+            pixels = tiles.pixel_bounds_array(tile_x, tile_y, 14, backend=backend)
+            for i, (x, y) in enumerate(zip(tile_x, tile_y)):
+                self.assertEqual(tuple(column[i] for column in geo), tiles.geo_bounds(x, y, 14))
+                self.assertEqual(tuple(column[i] for column in pixels), tiles.pixel_bounds(x, y, 14))
+                self.assertEqual(tuple(column[i] for column in meters), tiles.meter_bounds(x, y, 14))
+
+    def test_arrays_out_of_range(self):
+        for backend in BACKENDS:
+            for bounds in (tiles.geo_bounds_array, tiles.meter_bounds_array, tiles.pixel_bounds_array):
+                self.assertRaises(ValueError, bounds, [4, -1], [0, 0], 2, backend=backend)
+                self.assertRaises(ValueError, bounds, [0, 1], [3, 4], 2, backend=backend)
+                self.assertRaises(ValueError, bounds, [0], [0], 24, backend=backend)
+                self.assertEqual([len(column) for column in bounds([], [], 2, backend=backend)], [0] * 4)
+
+    def test_meter_bounds_array_exact(self):
+        for zoom_level in (0, 1, 7, 14, 23):
+            rand = random.Random(zoom_level)
+            tile_x = [rand.randrange(2 ** zoom_level) for _ in range(2000)]
+            tile_y = [rand.randrange(2 ** zoom_level) for _ in range(2000)]
+            for backend in BACKENDS:
+                meters = tiles.meter_bounds_array(tile_x, tile_y, zoom_level, backend=backend)
+                self.assertEqual(list(zip(*(list(column) for column in meters))),
+                                 [tiles.meter_bounds(x, y, zoom_level) for x, y in zip(tile_x, tile_y)])
+
+    def test_cache(self):
+        cache = tiles.TileBoundsCache(maxsize=2)
+        self.assertEqual(cache.geo_bounds(4611, 6446, 14), tiles.geo_bounds(4611, 6446, 14))
+        self.assertEqual(cache.geo_bounds(4611, 6446, 14), tiles.geo_bounds(4611, 6446, 14))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        self.assertEqual(cache.meter_bounds(4611, 6446, 14), tiles.meter_bounds(4611, 6446, 14))
+        self.assertEqual(cache.pixel_bounds(4611, 6446, 14), tiles.pixel_bounds(4611, 6446, 14))
+        self.assertEqual(len(cache), 2)
+
+        # the geo envelope was least recently used, so it went first
+        cache.geo_bounds(4611, 6446, 14)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+        self.assertRaises(ValueError, cache.geo_bounds, -1, 0, 3)
+        self.assertRaises(ValueError, tiles.TileBoundsCache, 0)
+
+    def test_cache_unbounded(self):
+        cache = tiles.TileBoundsCache(maxsize=None)
+        for x in range(100):
+            cache.pixel_bounds(x, 0, 7)
+        self.assertEqual(len(cache), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+import unittest
+
+from webmercator import BoundingBox
+from webmercator import Grid
+from webmercator import Point
+from webmercator import TileSet
+
+
+def random_tiles(rand):
+    tiles = set()
+    for _ in range(rand.randint(0, 6)):
+        grid = Grid(vertex=(rand.randint(0, 30), rand.randint(0, 30)), width=rand.randint(-1, 8),
+                    height=rand.randint(0, 5))
+        tiles.update(grid)
+    for _ in range(rand.randint(0, 10)):
+        tiles.add((rand.randint(0, 40), rand.randint(0, 40)))
+    return tiles
+
+
+class TestTileSet(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = Grid(vertex=(10, 20), width=9, height=4, zoom_level=8)
+        self.tile_set = TileSet.from_grid(self.grid)
+
+    def test_from_grid(self):
+        self.assertEqual(len(self.tile_set), len(self.grid))
+        self.assertEqual(list(self.tile_set), list(self.grid))
+        self.assertEqual(self.tile_set.zoom_level, 8)
+        self.assertEqual(self.tile_set.run_count, 5)
+        self.assertEqual(self.tile_set.bounds, self.grid)
+
+    def test_spans(self):
+        tile_set = TileSet([(3, 5, 7), (3, 8, 9), (1, 0, 0), (3, 2, 3), (4, 1, 0)])
+        self.assertEqual(list(tile_set.spans()), [(1, 0, 0), (3, 2, 3), (3, 5, 9)])
+        self.assertEqual(len(tile_set), 8)
+
+    def test_from_tiles(self):
+        tiles = [(5, 1), (6, 1), (7, 1), (9, 1), (5, 2)]
+        tile_set = TileSet.from_tiles(tiles, zoom_level=4)
+        self.assertEqual(list(tile_set.spans()), [(1, 5, 7), (1, 9, 9), (2, 5, 5)])
+        self.assertEqual(list(tile_set), tiles)
+
+    def test_contains(self):
+        tile_set = TileSet([(1, 5, 7), (1, 9, 9)])
+        for x in range(3, 12):
+            self.assertEqual((x, 1) in tile_set, x in (5, 6, 7, 9))
+        self.assertNotIn((5, 2), tile_set)
+        self.assertNotIn(5, tile_set)
+
+    def test_algebra(self):
+        rand = random.Random(8)
+        for _ in range(200):
+            a, b = random_tiles(rand), random_tiles(rand)
+            set_a, set_b = TileSet.from_tiles(a), TileSet.from_tiles(b)
+            self.assertEqual(set(set_a | set_b), a | b)
+            self.assertEqual(set(set_a & set_b), a & b)
+            self.assertEqual(set(set_a - set_b), a - b)
+            self.assertEqual(set(set_a ^ set_b), a ^ b)
+            self.assertEqual(len(set_a - set_b), len(a - b))
+            self.assertEqual(set_a <= set_b, a <= b)
+            self.assertEqual(set_a.isdisjoint(set_b), a.isdisjoint(b))
+
+    def test_grids(self):
+        rand = random.Random(2)
+        for _ in range(50):
+            tiles = random_tiles(rand)
+            grids = list(TileSet.from_tiles(tiles).grids())
+            covered = [t for g in grids for t in g]
+            self.assertEqual(sorted(covered), sorted(tiles))
+            self.assertEqual(len(covered), len(set(covered)))
+
+        self.assertEqual(list(self.tile_set.grids()), [self.grid])
+
+    def test_eq(self):
+        self.assertEqual(self.tile_set, TileSet.from_tiles(self.grid, zoom_level=8))
+        self.assertNotEqual(self.tile_set, TileSet.from_tiles(self.grid))
+        self.assertEqual(hash(self.tile_set), hash(TileSet.from_tiles(self.grid, zoom_level=8)))
+        self.assertEqual(self.tile_set - self.tile_set, TileSet(zoom_level=8))
+
+    def test_empty(self):
+        empty = TileSet()
+        self.assertEqual((len(empty), list(empty), bool(empty)), (0, [], False))
+        self.assertEqual(len(empty.bounds), 0)
+        self.assertEqual(self.tile_set | empty, self.tile_set)
+        self.assertTrue(self.tile_set)
+
+    def test_zoom_levels(self):
+        self.assertEqual((self.tile_set | TileSet()).zoom_level, 8)
+        self.assertRaises(ValueError, self.tile_set.union, TileSet(zoom_level=9))
+        self.assertRaises(ValueError, TileSet.from_grids, [self.grid, Grid(vertex=(0, 0), width=1, height=1,
+                                                                           zoom_level=9)])
+        self.assertRaises(TypeError, self.tile_set.union, set(self.grid))
+
+    def test_compact(self):
+        grids = [Grid(vertex=(1000 + 37 * i, 2000 + 11 * i), width=99, height=99, zoom_level=16) for i in range(20)]
+        tile_set = TileSet.from_grids(grids)
+        self.assertEqual(len(tile_set), len(set(t for g in grids for t in g)))
+        self.assertLess(tile_set.run_count, 400)
+
+
+class TestBoundingBoxTileSet(unittest.TestCase):
+
+    def test_tile_set(self):
+        bb = BoundingBox(Point(latitude=35.771834, longitude=-78.677972), radius=10, zoom_level=14)
+        self.assertEqual(set(bb.tile_set()), set(bb.tile_grid))
+        self.assertEqual(set(bb.tile_set(disc=True)), set(bb.disc_tiles()))
+        self.assertLessEqual(bb.tile_set(disc=True) - bb.tile_set(), bb.tile_set(disc=True))
+
+    def test_antimeridian(self):
+        bb = BoundingBox(Point(latitude=-17.7, longitude=179.95), radius=20, zoom_level=12)
+        self.assertEqual(set(bb.tile_set()), set(t for g in bb.tile_grids for t in g))
+        self.assertEqual(bb.tile_set().run_count, 2 * bb.tile_grids[0].rows)
+
+    def test_combine_boxes(self):
+        boxes = [BoundingBox(Point(latitude=35 + i * 0.05, longitude=-78 - i * 0.05), radius=5, zoom_level=14)
+                 for i in range(20)]
+        combined = TileSet(zoom_level=14)
+        for bb in boxes:
+            combined |= bb.tile_set()
+        self.assertEqual(set(combined), set(t for bb in boxes for t in bb.tile_grid))
+
+
+if __name__ == '__main__':
+    unittest.main()
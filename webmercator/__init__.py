@@ -25,16 +25,61 @@
 """
 from webmercator import util
 
-from webmercator.grid import Grid
+from webmercator import precision
+
+from webmercator import quadkey
+
+from webmercator.grid import Grid, GridShard, GridSlice
 
 from webmercator.point import Point
 
+from webmercator import tiles
+
+from webmercator import metatiles
+
+from webmercator.tileset import TileSet
+
 from webmercator.box import BoundingBox
 
+from webmercator.batch import PointArray, BoundingBoxArray
+
+from webmercator import buffers
+
+from webmercator import shapes
+
+from webmercator import distance
+
+from webmercator.index import TileIndex
+
+from webmercator.cluster import ClusterIndex
+
+from webmercator.heatmap import Heatmap
+
+from webmercator import expiry
+
+from webmercator import instrument
+
 
 __all__ = [
     'util',
+    'precision',
+    'quadkey',
+    'tiles',
+    'metatiles',
+    'shapes',
+    'buffers',
+    'distance',
+    'expiry',
+    'instrument',
     'Point',
     'BoundingBox',
     'Grid',
+    'GridShard',
+    'GridSlice',
+    'TileSet',
+    'PointArray',
+    'BoundingBoxArray',
+    'TileIndex',
+    'ClusterIndex',
+    'Heatmap',
 ]
@@ -0,0 +1,936 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Columnar conversions for many coordinates at once.
+
+Backed by NumPy when it is installed, otherwise by the standard library `array` module.
+Both backends follow the clamping, wrapping and rounding rules of `Point`, under the same precision policy
+(see `webmercator.precision`).
+"""
+from __future__ import division
+
+import math
+import numbers
+import sys
+from array import array
+from functools import reduce
+from itertools import repeat
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from webmercator.point import Point
+from webmercator.box import BoundingBox, vertex_bearings
+from webmercator import quadkey
+from webmercator.precision import EXACT, get_precision
+from webmercator.util import EARTH_CIRCUMFERENCE_METERS, EARTH_RADIUS_METERS, EARTH_RADIUS_MILES, \
+    MERCATOR_MAX_LATITUDE
+
+try:
+    array('q')
+    INT_TYPECODE = 'q'
+except ValueError:  # pragma: no cover
+    INT_TYPECODE = 'l'
+
+
+def _each(value):
+    """ Iterate a per-element sequence, or repeat a scalar indefinitely """
+    if isinstance(value, numbers.Number):
+        return repeat(value)
+    return iter(value)
+
+
+def _clamp_zoom(value):
+    return min(max(value, 1), 23)
+
+
+# Veltkamp splitting constant, 2 ** 27 + 1, for the exact error of a float64 product
+_SPLITTER = 134217729.0
+
+# `round()` breaks exact ties to even from Python 3, away from zero before
+_TIES_TO_EVEN = sys.version_info[0] >= 3
+
+
+def _split(values):
+    scaled = _SPLITTER * values
+    high = scaled - (scaled - values)
+    return high, values - high
+
+
+def _two_product(a, b):
+    """ `a * b` and its exact rounding error (Dekker): a * b == product + error """
+    product = a * b
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    return product, ((a_high * b_high - product) + a_high * b_low + a_low * b_high) + a_low * b_low
+
+
+def _rint(values):
+    """ `round(value)` of every element: ties to even on Python 3, away from zero on Python 2 """
+    if _TIES_TO_EVEN:
+        return numpy.rint(values)
+    tie = numpy.abs(values - numpy.trunc(values)) == 0.5
+    return numpy.where(tie, numpy.floor(values) + (values > 0), numpy.rint(values))
+
+
+def _round_large(product, error, scale):
+    """
+    `_round` of elements whose product is at least 2 ** 52, and so whole: the decimal numerator is `product` plus
+    `error` rounded, which may not fit a float64, so the quotient is corrected by its exact residual
+
+    :return: the rounded values, and a mask of those left to `round()`: exact decimal ties, and quotients too close
+        to halfway between two floats to settle here
+    """
+    correction = numpy.rint(error)
+    doubtful = ~numpy.isfinite(error) | (numpy.abs(error - numpy.trunc(error)) == 0.5)
+
+    rounded = (product + correction) / scale
+    high, low = _two_product(rounded, scale)
+    residual = ((product - high) + correction) - low
+    neighbour = numpy.nextafter(rounded, numpy.where(residual > 0, numpy.inf, -numpy.inf))
+    half_gap = numpy.abs(neighbour - rounded) * scale / 2
+    beyond = numpy.abs(residual) - half_gap
+    doubtful |= ~(numpy.abs(beyond) > half_gap * 1e-6)
+    return numpy.where(beyond > 0, neighbour, rounded), doubtful
+
+
+def _round(values, digits):
+    """
+    `round(value, digits)` of every element, bit for bit, for digits from 0 to 22
+
+    `numpy.round` rounds the float64 product `value * 10 ** digits`, which is off whenever that product is inexact
+    and lands on a tie, or when the correct decimal is more than 53 bits away from it. Here the exact rounding
+    error of the product (Dekker's two-product) settles ties and, from 2 ** 52 where the float64 grid is coarser
+    than the decimal one, the decimal itself. Only exact decimal ties there go through `round()`.
+    """
+    values = numpy.asarray(values, dtype=numpy.float64)
+    scale = 10.0 ** digits
+    # huge and infinite values overflow the error terms; they end up in `round()`
+    with numpy.errstate(over='ignore', invalid='ignore'):
+        product, error = _two_product(values, scale)
+
+        # below 2 ** 52 `product - trunc(product)` is exact; a tie there may hide an exact value just above or below it
+        floor = numpy.floor(product)
+        tie = numpy.abs(product - numpy.trunc(product)) == 0.5
+        whole = numpy.where(tie & (error > 0), floor + 1, numpy.where(tie & (error < 0), floor, _rint(product)))
+        rounded = numpy.copysign(whole, product) / scale
+
+        large = ~(numpy.abs(product) < 2.0 ** 52)
+        if large.any():
+            exact, doubtful = _round_large(product[large], error[large], scale)
+            if doubtful.any():
+                exact[doubtful] = [round(value, digits) for value in values[large][doubtful].tolist()]
+            rounded[large] = exact
+        return rounded
+
+
+# Widest gaps seen between numpy's logarithm and trigonometry and the math module's, with ample headroom: under
+# 1e-13 degrees for latitudes, 4e-9 m for meters and 1.2e-16 of the map size for pixels
+_DEGREE_MARGIN = 1e-12
+_METER_MARGIN = 1e-7
+_PIXEL_MARGIN = 1e-13
+
+
+def _near_tie(values, scale, margin):
+    """ Elements that a move of up to `margin` could round to another multiple of 1 / `scale`, or not finite """
+    product = values * scale
+    return ~(numpy.abs(numpy.abs(product - numpy.trunc(product)) - 0.5) > margin * scale)
+
+
+def _wrap(values):
+    """ `webmercator.precision.wrap_longitude` of every element, bit for bit """
+    if not numpy.isfinite(values).all():
+        raise ValueError('Longitudes must be finite')
+
+    turn = numpy.fmod(values, 360)
+    values = numpy.where(values > 180, numpy.where(turn > 180, turn - 360, turn), values)
+    return numpy.where(values < -180, numpy.where(turn < -180, turn + 360, turn) + 0.0, values)
+
+
+class ArrayBackend(object):
+    """ Pure Python backend; every element goes through the same expressions as `Point` """
+
+    name = 'array'
+
+    @staticmethod
+    def floats(values):
+        return array('d', values)
+
+    @staticmethod
+    def ints(values):
+        return array(INT_TYPECODE, values)
+
+    def latitude(self, values, precision=EXACT):
+        return self.floats(precision.latitude(v) for v in values)
+
+    def longitude(self, values, precision=EXACT):
+        return self.floats(precision.longitude(v) for v in values)
+
+    def meter_x(self, longitudes, precision=EXACT):
+        return self.floats(precision.meters((lon / 360) * EARTH_CIRCUMFERENCE_METERS) for lon in longitudes)
+
+    def meter_y(self, latitudes, precision=EXACT):
+        return self.floats(
+            precision.meters((math.log(math.tan(math.pi / 4 + ((lat * math.pi) / 180) / 2))) * EARTH_RADIUS_METERS)
+            for lat in latitudes)
+
+    def longitude_from_meter_x(self, values, precision=EXACT):
+        return self.longitude(((v * 360) / EARTH_CIRCUMFERENCE_METERS for v in values), precision)
+
+    def latitude_from_meter_y(self, values, precision=EXACT):
+        return self.latitude(((180 / math.pi) * (2 * math.atan(math.exp(v / EARTH_RADIUS_METERS)) - math.pi / 2)
+                              for v in values), precision)
+
+    def pixel_x(self, longitudes, zoom):
+        return self.ints(int(round(((lon + 180) / 360) * 256 * 2 ** z))
+                         for lon, z in zip(longitudes, _each(zoom)))
+
+    def pixel_y(self, latitudes, zoom):
+        def project(lat, z):
+            sin_lat = math.sin(math.radians(lat))
+            return int(round((0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * (256 * 2 ** z)))
+
+        return self.ints(project(lat, z) for lat, z in zip(latitudes, _each(zoom)))
+
+    def longitude_from_pixel_x(self, values, zoom, precision=EXACT):
+        return self.longitude((360 * (v / (256 * 2 ** z) - 0.5) for v, z in zip(values, _each(zoom))), precision)
+
+    def latitude_from_pixel_y(self, values, zoom, precision=EXACT):
+        return self.latitude((90 - 360 * math.atan(math.exp(-1 * (0.5 - v / (256 * 2 ** z)) * 2 * math.pi)) / math.pi
+                              for v, z in zip(values, _each(zoom))), precision)
+
+    def tile(self, pixels):
+        return self.ints(int(p / 256) for p in pixels)
+
+    def pixel_from_tile(self, tiles):
+        return self.floats(t * 256 for t in tiles)
+
+    def tile_edges(self, tiles):
+        """ Pixel of the near and far edge of each tile """
+        return self.floats(t * 256 for t in tiles), self.floats((t + 1) * 256 for t in tiles)
+
+    def meter_x_from_pixel_x(self, values, zoom):
+        return self.floats(round((v / (256 * 2 ** z) - 0.5) * EARTH_CIRCUMFERENCE_METERS, EXACT.metric_digits)
+                           for v, z in zip(values, _each(zoom)))
+
+    def meter_y_from_pixel_y(self, values, zoom):
+        return self.floats(round((0.5 - v / (256 * 2 ** z)) * EARTH_CIRCUMFERENCE_METERS, EXACT.metric_digits)
+                           for v, z in zip(values, _each(zoom)))
+
+    def zoom(self, value):
+        if isinstance(value, numbers.Number):
+            return _clamp_zoom(value)
+        return self.ints(_clamp_zoom(v) for v in value)
+
+    def diameter_from_radius(self, value):
+        if isinstance(value, numbers.Number):
+            return value * 2
+        return self.floats(v * 2 for v in value)
+
+    def radius_from_diameter(self, value):
+        if isinstance(value, numbers.Number):
+            return value / 2 if value > 0 else 0
+        return self.floats(v / 2 if v > 0 else 0 for v in value)
+
+    def destination(self, latitudes, longitudes, distances, bearing):
+        """ Destination point formula of `BoundingBox._bound_vertices`, in degrees """
+        def project(lat, lon, distance):
+            latitude_rad = math.radians(lat)
+            longitude_rad = math.radians(lon)
+
+            lat = math.asin(math.sin(latitude_rad) * math.cos(distance / EARTH_RADIUS_MILES) +
+                            math.cos(latitude_rad) * math.sin(distance / EARTH_RADIUS_MILES) * math.cos(bearing))
+            lon = longitude_rad + math.atan2(
+                math.sin(bearing) * math.sin(distance / EARTH_RADIUS_MILES) * math.cos(latitude_rad),
+                math.cos(distance / EARTH_RADIUS_MILES) - math.sin(latitude_rad) * math.sin(lat))
+
+            return math.degrees(lat), math.degrees(lon)
+
+        vertices = [project(lat, lon, d) for lat, lon, d in zip(latitudes, longitudes, _each(distances))]
+        return self.floats(v[0] for v in vertices), self.floats(v[1] for v in vertices)
+
+    def haversine(self, latitudes, longitudes, other_latitudes, other_longitudes, radius):
+        """ Great-circle distances on a sphere of `radius`, from degrees; the first pair may be scalars """
+        def measure(lat1, lon1, lat2, lon2):
+            lat1, lat2 = math.radians(lat1), math.radians(lat2)
+            h = (math.sin((lat2 - lat1) / 2) ** 2 +
+                 math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+            return 2 * radius * math.asin(math.sqrt(min(h, 1)))
+
+        return self.floats(measure(*coords) for coords in zip(_each(latitudes), _each(longitudes),
+                                                              other_latitudes, other_longitudes))
+
+    def tile_block(self, vertex, columns, start, stop):
+        """ Tile x and y columns for row-major positions `start` to `stop` of a grid `columns` tiles wide """
+        x0, y0 = vertex
+        positions = range(start, stop)
+        return self.ints(x0 + i % columns for i in positions), self.ints(y0 + i // columns for i in positions)
+
+    def clip(self, values, low, high):
+        return self.ints(min(max(v, low), high) for v in values)
+
+    def interleave(self, tile_x, tile_y):
+        return self.ints(quadkey.interleave(x, y) for x, y in zip(tile_x, tile_y))
+
+    def deinterleave(self, codes):
+        tiles = [quadkey.deinterleave(code) for code in codes]
+        return self.ints(t[0] for t in tiles), self.ints(t[1] for t in tiles)
+
+    def pack(self, codes, zoom):
+        return self.ints((z << quadkey.PACKED_ZOOM_SHIFT) | code for code, z in zip(codes, _each(zoom)))
+
+    def unpack(self, keys):
+        return (self.ints(key & quadkey.PACKED_MORTON_MASK for key in keys),
+                self.ints(key >> quadkey.PACKED_ZOOM_SHIFT for key in keys))
+
+    def minimum(self, columns):
+        return self.floats(min(values) for values in zip(*columns))
+
+    def maximum(self, columns):
+        return self.floats(max(values) for values in zip(*columns))
+
+    def difference(self, a, b):
+        return self.ints(x - y for x, y in zip(a, b))
+
+    def pixel_span(self, low, high):
+        return self.ints(max(int(h - lo), 1) for lo, h in zip(low, high))
+
+
+class NumpyBackend(object):
+    """
+    Vectorized backend; rounded results agree with `Point` bit for bit
+
+    numpy's logarithm and trigonometry may differ from the `math` module by an ulp. Latitudes and pixels computed
+    with them are checked against rounding ties with a margin well above that gap, and the few elements near one
+    are redone with the scalar expressions of `ArrayBackend`. Meter y rounded to 1 nm keeps such ulp differences
+    anywhere, so there the tangent and logarithm come from `math`, over the whole array at once.
+    """
+
+    name = 'numpy'
+    _scalar = ArrayBackend()
+
+    @staticmethod
+    def floats(values):
+        if not hasattr(values, '__len__'):
+            values = list(values)
+        return numpy.array(values, dtype=numpy.float64)
+
+    @staticmethod
+    def ints(values):
+        if not hasattr(values, '__len__'):
+            values = list(values)
+        return numpy.array(values, dtype=numpy.int64)
+
+    @staticmethod
+    def _map_size(zoom):
+        return 256 * numpy.power(2.0, zoom)
+
+    @staticmethod
+    def _degrees(values, precision):
+        if precision.fixed:
+            return _rint(values * precision.scale) / precision.scale
+        if precision.degree_digits is None:
+            return values
+        return _round(values, precision.degree_digits)
+
+    @staticmethod
+    def _meters(values, precision):
+        if precision.metric_digits is None:
+            return values
+        return _round(values, precision.metric_digits)
+
+    def latitude(self, values, precision=EXACT):
+        values = numpy.clip(self.floats(values), -1 * MERCATOR_MAX_LATITUDE, MERCATOR_MAX_LATITUDE)
+        return self._degrees(values, precision)
+
+    def longitude(self, values, precision=EXACT):
+        return self._degrees(_wrap(self.floats(values)), precision)
+
+    def meter_x(self, longitudes, precision=EXACT):
+        return self._meters((longitudes / 360) * EARTH_CIRCUMFERENCE_METERS, precision)
+
+    def meter_y(self, latitudes, precision=EXACT):
+        latitudes = self.floats(latitudes)
+        angles = math.pi / 4 + ((latitudes * math.pi) / 180) / 2
+        digits = precision.metric_digits
+        if digits is not None and _METER_MARGIN * 10.0 ** digits > 0.25:
+            tangents = numpy.fromiter(map(math.tan, angles.tolist()), numpy.float64, len(angles))
+            return _round(numpy.fromiter(map(math.log, tangents.tolist()), numpy.float64, len(angles)) *
+                          EARTH_RADIUS_METERS, digits)
+
+        meters = numpy.log(numpy.tan(angles)) * EARTH_RADIUS_METERS
+        rounded = self._meters(meters, precision)
+        if digits is not None:
+            redo = _near_tie(meters, 10.0 ** digits, _METER_MARGIN)
+            if redo.any():
+                rounded[redo] = self._scalar.meter_y(latitudes[redo].tolist(), precision)
+        return rounded
+
+    def longitude_from_meter_x(self, values, precision=EXACT):
+        return self.longitude((self.floats(values) * 360) / EARTH_CIRCUMFERENCE_METERS, precision)
+
+    def _doubtful_latitudes(self, latitudes, precision):
+        """ Latitudes from numpy transcendentals that could round or clamp otherwise from the `math` module's """
+        if precision.degree_digits is None:
+            return None
+        redo = _near_tie(latitudes, 10.0 ** precision.degree_digits, _DEGREE_MARGIN)
+        redo |= ~(numpy.abs(numpy.abs(latitudes) - MERCATOR_MAX_LATITUDE) > _DEGREE_MARGIN)
+        return redo if redo.any() else None
+
+    def latitude_from_meter_y(self, values, precision=EXACT):
+        values = self.floats(values)
+        latitudes = (180 / math.pi) * (2 * numpy.arctan(numpy.exp(values / EARTH_RADIUS_METERS)) - math.pi / 2)
+        rounded = self.latitude(latitudes, precision)
+        redo = self._doubtful_latitudes(latitudes, precision)
+        if redo is not None:
+            rounded[redo] = self._scalar.latitude_from_meter_y(values[redo].tolist(), precision)
+        return rounded
+
+    @staticmethod
+    def _select(zoom, mask):
+        """ Zoom levels of the elements in `mask`: a scalar as is, else the matching elements """
+        if isinstance(zoom, numbers.Number):
+            return zoom
+        return numpy.asarray(zoom)[mask].tolist()
+
+    def pixel_x(self, longitudes, zoom):
+        return _rint(((longitudes + 180) / 360) * 256 * numpy.power(2.0, zoom)).astype(numpy.int64)
+
+    def pixel_y(self, latitudes, zoom):
+        latitudes = self.floats(latitudes)
+        sin_lat = numpy.sin(numpy.radians(latitudes))
+        map_size = self._map_size(zoom)
+        pixels = (0.5 - numpy.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * map_size
+        rounded = _rint(pixels).astype(numpy.int64)
+        redo = _near_tie(pixels, 1.0, _PIXEL_MARGIN * map_size)
+        if redo.any():
+            rounded[redo] = self._scalar.pixel_y(latitudes[redo].tolist(), self._select(zoom, redo))
+        return rounded
+
+    def longitude_from_pixel_x(self, values, zoom, precision=EXACT):
+        return self.longitude(360 * (self.floats(values) / self._map_size(zoom) - 0.5), precision)
+
+    def latitude_from_pixel_y(self, values, zoom, precision=EXACT):
+        values = self.floats(values)
+        exponent = numpy.exp(-1 * (0.5 - values / self._map_size(zoom)) * 2 * math.pi)
+        latitudes = 90 - 360 * numpy.arctan(exponent) / math.pi
+        rounded = self.latitude(latitudes, precision)
+        redo = self._doubtful_latitudes(latitudes, precision)
+        if redo is not None:
+            rounded[redo] = self._scalar.latitude_from_pixel_y(values[redo].tolist(), self._select(zoom, redo),
+                                                               precision)
+        return rounded
+
+    def tile(self, pixels):
+        return numpy.trunc(pixels / 256).astype(numpy.int64)
+
+    def pixel_from_tile(self, tiles):
+        return self.floats(tiles) * 256
+
+    def tile_edges(self, tiles):
+        """ Pixel of the near and far edge of each tile """
+        low = self.floats(tiles) * 256
+        return low, low + 256
+
+    def meter_x_from_pixel_x(self, values, zoom):
+        meters = (self.floats(values) / self._map_size(zoom) - 0.5) * EARTH_CIRCUMFERENCE_METERS
+        return _round(meters, EXACT.metric_digits)
+
+    def meter_y_from_pixel_y(self, values, zoom):
+        meters = (0.5 - self.floats(values) / self._map_size(zoom)) * EARTH_CIRCUMFERENCE_METERS
+        return _round(meters, EXACT.metric_digits)
+
+    def zoom(self, value):
+        if isinstance(value, numbers.Number):
+            return _clamp_zoom(value)
+        return numpy.clip(self.ints(value), 1, 23)
+
+    def diameter_from_radius(self, value):
+        if isinstance(value, numbers.Number):
+            return value * 2
+        return self.floats(value) * 2
+
+    def radius_from_diameter(self, value):
+        if isinstance(value, numbers.Number):
+            return value / 2 if value > 0 else 0
+        value = self.floats(value)
+        return numpy.where(value > 0, value / 2, 0.0)
+
+    def destination(self, latitudes, longitudes, distances, bearing):
+        """ Destination point formula of `BoundingBox._bound_vertices`, in degrees """
+        latitude_rad = numpy.radians(latitudes)
+        longitude_rad = numpy.radians(longitudes)
+        angular = numpy.asarray(distances, dtype=numpy.float64) / EARTH_RADIUS_MILES
+        sin_latitude, cos_latitude = numpy.sin(latitude_rad), numpy.cos(latitude_rad)
+
+        lat = numpy.arcsin(sin_latitude * numpy.cos(angular) + cos_latitude * numpy.sin(angular) * math.cos(bearing))
+        lon = longitude_rad + numpy.arctan2(math.sin(bearing) * numpy.sin(angular) * cos_latitude,
+                                            numpy.cos(angular) - sin_latitude * numpy.sin(lat))
+
+        return numpy.degrees(lat), numpy.degrees(lon)
+
+    def haversine(self, latitudes, longitudes, other_latitudes, other_longitudes, radius):
+        """ Great-circle distances on a sphere of `radius`, from degrees; the first pair may be scalars """
+        lat1, lat2 = numpy.radians(latitudes), numpy.radians(other_latitudes)
+        d_lon = numpy.radians(numpy.subtract(other_longitudes, longitudes))
+        h = numpy.sin((lat2 - lat1) / 2) ** 2 + numpy.cos(lat1) * numpy.cos(lat2) * numpy.sin(d_lon / 2) ** 2
+        return 2 * radius * numpy.arcsin(numpy.sqrt(numpy.minimum(h, 1)))
+
+    def tile_block(self, vertex, columns, start, stop):
+        """ Tile x and y columns for row-major positions `start` to `stop` of a grid `columns` tiles wide """
+        ys, xs = numpy.divmod(numpy.arange(start, stop, dtype=numpy.int64), columns)
+        return xs + vertex[0], ys + vertex[1]
+
+    @staticmethod
+    def _spread(values):
+        values = numpy.asarray(values, dtype=numpy.int64).astype(numpy.uint64) & numpy.uint64(0xFFFFFFFF)
+        for shift, mask in quadkey.SPREAD_STEPS:
+            values = (values | (values << numpy.uint64(shift))) & numpy.uint64(mask)
+        return values
+
+    @staticmethod
+    def _compact(values):
+        values = values & numpy.uint64(0x5555555555555555)
+        for shift, mask in quadkey.COMPACT_STEPS:
+            values = (values | (values >> numpy.uint64(shift))) & numpy.uint64(mask)
+        return values.astype(numpy.int64)
+
+    def clip(self, values, low, high):
+        return numpy.clip(values, low, high)
+
+    def interleave(self, tile_x, tile_y):
+        return (self._spread(tile_x) | (self._spread(tile_y) << numpy.uint64(1))).astype(numpy.int64)
+
+    def deinterleave(self, codes):
+        codes = numpy.asarray(codes, dtype=numpy.int64).astype(numpy.uint64)
+        return self._compact(codes), self._compact(codes >> numpy.uint64(1))
+
+    def pack(self, codes, zoom):
+        return (numpy.asarray(zoom, dtype=numpy.int64) << quadkey.PACKED_ZOOM_SHIFT) | codes
+
+    def unpack(self, keys):
+        keys = numpy.asarray(keys, dtype=numpy.int64)
+        return keys & quadkey.PACKED_MORTON_MASK, keys >> quadkey.PACKED_ZOOM_SHIFT
+
+    def minimum(self, columns):
+        return reduce(numpy.minimum, columns)
+
+    def maximum(self, columns):
+        return reduce(numpy.maximum, columns)
+
+    def difference(self, a, b):
+        return a - b
+
+    def pixel_span(self, low, high):
+        return numpy.maximum(numpy.trunc(high - low).astype(numpy.int64), 1)
+
+
+BACKENDS = {'array': ArrayBackend}
+if numpy is not None:
+    BACKENDS['numpy'] = NumpyBackend
+
+
+def get_backend(name=None):
+    """
+    Resolve a conversion backend by name
+
+    :param name: 'numpy' or 'array'; defaults to numpy when it is installed
+    :return: backend instance
+    """
+    if name is None:
+        name = 'numpy' if numpy is not None else 'array'
+
+    if name not in BACKENDS:
+        raise ValueError("Unavailable backend `{}`. Choose from: {}".format(name, ', '.join(sorted(BACKENDS))))
+
+    return BACKENDS[name]()
+
+
+class PointArray(object):
+    """
+    Column of points sharing a zoom level.
+
+    Accepts the same coordinate kwargs as `Point`, each given as a sequence:
+    `latitude`/`longitude`, `meter_x`/`meter_y`, `pixel_x`/`pixel_y` or `tile_x`/`tile_y`, and `precision`.
+    Every property returns a whole array (`numpy.ndarray` or `array.array`, depending on backend).
+    """
+
+    def __init__(self, **kwargs):
+        self._backend = get_backend(kwargs.get('backend'))
+        self.__precision = get_precision(kwargs.get('precision'))
+        self.__latitude = None
+        self.__longitude = None
+
+        self.__zoom_level = None
+        self.zoom_level = kwargs.get('zoom_level', 14)
+
+        for x, y in (('latitude', 'longitude'), ('meter_x', 'meter_y'), ('pixel_x', 'pixel_y'), ('tile_x', 'tile_y')):
+            if x in kwargs and y in kwargs:
+                setattr(self, x, kwargs[x])
+                setattr(self, y, kwargs[y])
+                break
+        else:
+            if 'quadkey' not in kwargs:
+                raise AttributeError("Missing required kwargs. Provide one coordinate pair, e.g. `latitude` and "
+                                     "`longitude`, or `quadkey`.")
+
+            self.quadkey = kwargs['quadkey']
+
+    @classmethod
+    def from_points(cls, points, **kwargs):
+        """ Build from an iterable of `Point`, at the zoom level and precision of the first point unless given """
+        points = list(points)
+        if 'zoom_level' not in kwargs:
+            kwargs['zoom_level'] = points[0].zoom_level if points else 14
+        if 'precision' not in kwargs and points:
+            kwargs['precision'] = points[0].precision
+
+        return cls(latitude=[p.latitude for p in points], longitude=[p.longitude for p in points], **kwargs)
+
+    def __repr__(self):
+        return '<PointArray of {} points, zoom_level: {}>'.format(len(self), self.zoom_level)
+
+    def __len__(self):
+        return len(self.__latitude)
+
+    def __getitem__(self, index):
+        return Point(latitude=self.__latitude[index], longitude=self.__longitude[index], zoom_level=self.zoom_level,
+                     precision=self.__precision)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _check_length(self, values, other):
+        if other is not None and len(values) != len(other):
+            raise ValueError("Coordinate arrays differ in length: {} != {}".format(len(values), len(other)))
+        return values
+
+    @property
+    def backend(self):
+        return self._backend.name
+
+    @property
+    def precision(self):
+        """ `Precision` policy of every conversion, see `Point.precision` """
+        return self.__precision
+
+    @property
+    def latitude(self):
+        return self.__latitude
+
+    @latitude.setter
+    def latitude(self, values):
+        self.__latitude = self._check_length(self._backend.latitude(values, self.__precision), self.__longitude)
+
+    @property
+    def longitude(self):
+        return self.__longitude
+
+    @longitude.setter
+    def longitude(self, values):
+        self.__longitude = self._check_length(self._backend.longitude(values, self.__precision), self.__latitude)
+
+    @property
+    def meter_x(self):
+        return self._backend.meter_x(self.__longitude, self.__precision)
+
+    @meter_x.setter
+    def meter_x(self, values):
+        self.__longitude = self._check_length(self._backend.longitude_from_meter_x(values, self.__precision),
+                                              self.__latitude)
+
+    @property
+    def meter_y(self):
+        return self._backend.meter_y(self.__latitude, self.__precision)
+
+    @meter_y.setter
+    def meter_y(self, values):
+        self.__latitude = self._check_length(self._backend.latitude_from_meter_y(values, self.__precision),
+                                             self.__longitude)
+
+    @property
+    def zoom_level(self):
+        return self.__zoom_level
+
+    @zoom_level.setter
+    def zoom_level(self, value):
+        self.__zoom_level = _clamp_zoom(value)
+
+    @property
+    def map_size(self):
+        return 256 * 2 ** self.zoom_level
+
+    @property
+    def pixel_x(self):
+        return self._backend.pixel_x(self.__longitude, self.zoom_level)
+
+    @pixel_x.setter
+    def pixel_x(self, values):
+        longitudes = self._backend.longitude_from_pixel_x(values, self.zoom_level, self.__precision)
+        self.__longitude = self._check_length(longitudes, self.__latitude)
+
+    @property
+    def pixel_y(self):
+        return self._backend.pixel_y(self.__latitude, self.zoom_level)
+
+    @pixel_y.setter
+    def pixel_y(self, values):
+        latitudes = self._backend.latitude_from_pixel_y(values, self.zoom_level, self.__precision)
+        self.__latitude = self._check_length(latitudes, self.__longitude)
+
+    @property
+    def tile_x(self):
+        return self._backend.tile(self.pixel_x)
+
+    @tile_x.setter
+    def tile_x(self, values):
+        self.pixel_x = self._backend.pixel_from_tile(values)
+
+    @property
+    def tile_y(self):
+        return self._backend.tile(self.pixel_y)
+
+    @tile_y.setter
+    def tile_y(self, values):
+        self.pixel_y = self._backend.pixel_from_tile(values)
+
+    @property
+    def meters_per_pixel(self):
+        """Return meters per pixel (Web Mercator meters, not real world meters)"""
+        return EARTH_CIRCUMFERENCE_METERS / (256 * 2 ** self.zoom_level)
+
+    @property
+    def meters_per_tile(self):
+        """Return meters per tile (Web Mercator meters, not real world meters)"""
+        return self.meters_per_pixel * 256
+
+    def _tiles_in_range(self):
+        """ Tile x/y clamped to the tile range, see `Point._tile_in_range` """
+        last = 2 ** self.zoom_level - 1
+        return self._backend.clip(self.tile_x, 0, last), self._backend.clip(self.tile_y, 0, last)
+
+    @property
+    def quadkey(self):
+        """ List of the quadkeys of the tiles containing each point """
+        tile_x, tile_y = self._tiles_in_range()
+        return quadkey.quadkeys(tile_x, tile_y, self.zoom_level, backend=self.backend)
+
+    @quadkey.setter
+    def quadkey(self, values):
+        """ Move to the upper-left corners of tiles; all quadkeys must share one length, the new zoom level """
+        tile_x, tile_y, zoom_levels = quadkey.from_quadkeys(values, backend=self.backend)
+        if len(set(zoom_levels)) > 1 or (len(zoom_levels) and zoom_levels[0] < 1):
+            raise ValueError('Quadkeys must all have the same, non-zero length')
+
+        if len(zoom_levels):
+            self.zoom_level = int(zoom_levels[0])
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+
+    @property
+    def tile_key(self):
+        """ Packed 64-bit keys of the tiles containing each point """
+        tile_x, tile_y = self._tiles_in_range()
+        return quadkey.pack_array(tile_x, tile_y, self.zoom_level, backend=self.backend)
+
+    def distance_to(self, other, units='miles'):
+        """
+        Great-circle distances, see `webmercator.distance`
+
+        :param other: a `Point`, to measure from every point, or a `PointArray` of equal length, to measure pairwise
+        :return: array of distances in `units`
+        """
+        from webmercator import distance
+        if isinstance(other, PointArray):
+            return distance.pairwise(self, other, units)
+        return distance.distances(other, self, units)
+
+
+class BoundingBoxArray(object):
+    """
+    One `BoundingBox` per point of a `PointArray`, computed in a single pass.
+
+    `radius`/`diameter` and `zoom_level` may be scalars or per-box sequences; `zoom_level` defaults to the zoom level
+    of the points. Extents are computed on construction, pixel and tile ranges on first access. Every property
+    returns a whole array, matching the scalar `BoundingBox` property of the same name. Vertices follow the
+    precision policy of the points.
+    """
+
+    def __init__(self, points, **kwargs):
+        if not isinstance(points, PointArray):
+            raise TypeError("Did not provide valid point array type")
+
+        self._backend = get_backend(points.backend)
+        self.__precision = points.precision
+        self.__corners = None
+
+        self.__zoom_level = self._backend.zoom(kwargs.get('zoom_level', points.zoom_level))
+
+        if 'radius' in kwargs:
+            radius = kwargs['radius']
+            self.__radius = radius if isinstance(radius, numbers.Number) else self._backend.floats(radius)
+            self.__diameter = self._backend.diameter_from_radius(radius)
+        elif 'diameter' in kwargs:
+            diameter = kwargs['diameter']
+            self.__diameter = diameter if isinstance(diameter, numbers.Number) else self._backend.floats(diameter)
+            self.__radius = self._backend.radius_from_diameter(diameter)
+        else:
+            raise AttributeError("Missing required kwarg. Either `radius` or `diameter` are required.")
+
+        self.__latitude, self.__longitude = points.latitude, points.longitude
+        for value in (self.__zoom_level, self.__radius):
+            if not isinstance(value, numbers.Number) and len(value) != len(points):
+                raise ValueError("Per-box arrays must match the number of points: {} != {}".format(len(value),
+                                                                                                   len(points)))
+
+        latitudes, longitudes = [], []
+        for bearing in vertex_bearings(4):
+            lat, lon = self._backend.destination(self.__latitude, self.__longitude, self.__radius, bearing)
+            latitudes.append(self._backend.latitude(lat, self.__precision))
+            longitudes.append(self._backend.longitude(lon, self.__precision))
+
+        self.__extents = (self._backend.minimum(latitudes), self._backend.maximum(latitudes),
+                          self._backend.minimum(longitudes), self._backend.maximum(longitudes))
+
+    def __repr__(self):
+        return '<BoundingBoxArray of {} boxes>'.format(len(self))
+
+    def __len__(self):
+        return len(self.__latitude)
+
+    def __getitem__(self, index):
+        zoom_level = self.__zoom_level if isinstance(self.__zoom_level, numbers.Number) else self.__zoom_level[index]
+        radius = self.__radius if isinstance(self.__radius, numbers.Number) else self.__radius[index]
+        point = Point(latitude=self.__latitude[index], longitude=self.__longitude[index], zoom_level=int(zoom_level),
+                      precision=self.__precision)
+        return BoundingBox(point, radius=radius)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def backend(self):
+        return self._backend.name
+
+    @property
+    def latitude(self):
+        """ Center latitudes """
+        return self.__latitude
+
+    @property
+    def longitude(self):
+        """ Center longitudes """
+        return self.__longitude
+
+    @property
+    def radius(self):
+        return self.__radius
+
+    @property
+    def diameter(self):
+        return self.__diameter
+
+    @property
+    def zoom_level(self):
+        return self.__zoom_level
+
+    @property
+    def min_latitude(self):
+        return self.__extents[0]
+
+    @property
+    def max_latitude(self):
+        return self.__extents[1]
+
+    @property
+    def min_longitude(self):
+        return self.__extents[2]
+
+    @property
+    def max_longitude(self):
+        return self.__extents[3]
+
+    @property
+    def _corners(self):
+        """ Pixel and tile columns of the top-left and bottom-right vertices """
+        if self.__corners is None:
+            backend = self._backend
+            min_pixel_x = backend.pixel_x(self.min_longitude, self.__zoom_level)
+            min_pixel_y = backend.pixel_y(self.max_latitude, self.__zoom_level)
+            max_pixel_x = backend.pixel_x(self.max_longitude, self.__zoom_level)
+            max_pixel_y = backend.pixel_y(self.min_latitude, self.__zoom_level)
+            self.__corners = ((min_pixel_x, min_pixel_y, backend.tile(min_pixel_x), backend.tile(min_pixel_y)),
+                              (max_pixel_x, max_pixel_y, backend.tile(max_pixel_x), backend.tile(max_pixel_y)))
+        return self.__corners
+
+    @property
+    def min_pixel_x(self):
+        return self._corners[0][0]
+
+    @property
+    def max_pixel_x(self):
+        return self._corners[1][0]
+
+    @property
+    def min_pixel_y(self):
+        return self._corners[0][1]
+
+    @property
+    def max_pixel_y(self):
+        return self._corners[1][1]
+
+    @property
+    def min_tile_x(self):
+        return self._corners[0][2]
+
+    @property
+    def max_tile_x(self):
+        return self._corners[1][2]
+
+    @property
+    def min_tile_y(self):
+        return self._corners[0][3]
+
+    @property
+    def max_tile_y(self):
+        return self._corners[1][3]
+
+    @property
+    def tile_width(self):
+        return self._backend.difference(self.max_tile_x, self.min_tile_x)
+
+    @property
+    def tile_height(self):
+        return self._backend.difference(self.max_tile_y, self.min_tile_y)
+
+    @property
+    def pixel_width(self):
+        return self._backend.pixel_span(self.min_pixel_x, self.max_pixel_x)
+
+    @property
+    def pixel_height(self):
+        return self._backend.pixel_span(self.min_pixel_y, self.max_pixel_y)
@@ -27,33 +27,106 @@ import sys
 
 from webmercator import Point
 from webmercator import Grid
+from webmercator import metatiles
+from webmercator import shapes
+from webmercator import tiles
+from webmercator.precision import get_precision
+from webmercator.tileset import TileSet
+from webmercator.util import EARTH_RADIUS_MILES
 
 if (2, 0) >= sys.version_info > (3, 0):
     from builtins import range
 
 
+def vertex_bearings(num_pts=4):
+    """ Bearings, in radians clockwise from north, of the vertices around a box center """
+    # add 45 degrees to orient
+    degrees = [(math.degrees(2.0 * math.pi) / num_pts) * (x + 1) for x in range(num_pts)]
+    return [math.radians(d) for d in degrees]
+
+
 class BoundingBox(object):
+    """
+    Square around a center point, `radius` miles from the center to each edge.
+
+    Extents are computed lazily, once per box, and recomputed only after `pt_center`, `radius`, `diameter` or
+    `zoom_level` are reassigned. Mutating `pt_center` in place is not detected.
+
+    A box crossing the antimeridian has wrapped vertex longitudes, so `min_longitude`/`max_longitude` and
+    `tile_grid` span nearly the whole globe. `longitude_ranges` and `tile_grids` split it into disjoint pieces instead.
+
+    Vertices and corners follow the `precision` policy, by default that of the center point.
+    """
 
     def __init__(self, point, **kwargs):
         if not isinstance(point, Point):
             raise TypeError("Did not provide valid point type")
 
+        self.__extents = None
+        self.__longitude_ranges = None
+        self.__corners = None
+
         self.zoom_level = kwargs.get('zoom_level', point.zoom_level)
+        self.__precision = get_precision(kwargs.get('precision', point.precision))
 
-        self.pt_center = Point(latitude=point.latitude, longitude=point.longitude, zoom_level=self.zoom_level)
+        self.pt_center = Point(latitude=point.latitude, longitude=point.longitude, zoom_level=self.zoom_level,
+                               precision=self.__precision)
 
         if 'radius' in kwargs:
             self.radius = kwargs['radius']
-            self.diameter = self.radius * 2
         elif 'diameter' in kwargs:
             self.diameter = kwargs['diameter']
-            self.radius = self.diameter / 2 if self.diameter > 0 else 0
         else:
             raise AttributeError("Missing required kwarg. Either `radius` or `diameter` are required.")
 
     def __repr__(self):
         return '<BoundingBox center: {}, diameter: {}>'.format(self.pt_center, self.diameter)
 
+    @property
+    def precision(self):
+        return self.__precision
+
+    @property
+    def pt_center(self):
+        return self.__pt_center
+
+    @pt_center.setter
+    def pt_center(self, value):
+        self.__pt_center = value
+        self.__extents = None
+        self.__corners = None
+
+    @property
+    def radius(self):
+        return self.__radius
+
+    @radius.setter
+    def radius(self, value):
+        self.__radius = value
+        self.__diameter = value * 2
+        self.__extents = None
+        self.__corners = None
+
+    @property
+    def diameter(self):
+        return self.__diameter
+
+    @diameter.setter
+    def diameter(self, value):
+        self.__diameter = value
+        self.__radius = value / 2 if value > 0 else 0
+        self.__extents = None
+        self.__corners = None
+
+    @property
+    def zoom_level(self):
+        return self.__zoom_level
+
+    @zoom_level.setter
+    def zoom_level(self, value):
+        self.__zoom_level = value
+        self.__corners = None
+
     def _bound_vertices(self, num_pts=4):
         """
         Calculate points around a lat/long, given a specific distance and point count
@@ -67,17 +140,13 @@ class BoundingBox(object):
         :param num_pts: Number of vertices around point, defaults to 4. Don't override without clear understanding.
         :return: List of point indices
         """
-        radius_earth = 3959.0
+        radius_earth = EARTH_RADIUS_MILES
 
         latitude_rad = math.radians(self.pt_center.latitude)
         longitude_rad = math.radians(self.pt_center.longitude)
 
-        # add 45 degrees to orient
-        degrees = [(math.degrees(2.0 * math.pi) / num_pts) * (x + 1) for x in range(num_pts)]
-        radians = [math.radians(d) for d in degrees]
-
         bound_vertices = []
-        for bearing in radians:
+        for bearing in vertex_bearings(num_pts):
             lat = math.asin(math.sin(latitude_rad) * math.cos(self.radius / radius_earth) +
                             math.cos(latitude_rad) * math.sin(self.radius / radius_earth) * math.cos(bearing))
             lon = longitude_rad + math.atan2(
@@ -86,7 +155,7 @@ class BoundingBox(object):
 
             lat_degree = math.degrees(lat)
             lon_degree = math.degrees(lon)
-            pt = Point(latitude=lat_degree, longitude=lon_degree)
+            pt = Point(latitude=lat_degree, longitude=lon_degree, precision=self.__precision)
             bound_vertices.append(pt)
 
         return bound_vertices
@@ -95,63 +164,111 @@ class BoundingBox(object):
     def box_vertices(self):
         return self._bound_vertices(num_pts=4)
 
+    def _compute_extents(self):
+        vertices = self.box_vertices
+        latitudes = [v.latitude for v in vertices]
+        longitudes = [v.longitude for v in vertices]
+        self.__extents = (min(latitudes), max(latitudes), min(longitudes), max(longitudes))
+
+        # unwrap the east and west vertices (bearings 90 and 270) around the center
+        center = self.pt_center.longitude
+        east = center + (vertices[0].longitude - center + 180) % 360 - 180
+        west = center + (vertices[2].longitude - center + 180) % 360 - 180
+        if east - west >= 360:
+            self.__longitude_ranges = ((-180.0, 180.0),)
+        elif west < -180:
+            self.__longitude_ranges = ((west + 360, 180.0), (-180.0, east))
+        elif east > 180:
+            self.__longitude_ranges = ((west, 180.0), (-180.0, east - 360))
+        else:
+            self.__longitude_ranges = ((west, east),)
+
+    @property
+    def extents(self):
+        """ (min_latitude, max_latitude, min_longitude, max_longitude), computed once per box """
+        if self.__extents is None:
+            self._compute_extents()
+        return self.__extents
+
+    @property
+    def longitude_ranges(self):
+        """ Disjoint (west, east) longitude ranges of the box; two when it crosses the antimeridian """
+        if self.__extents is None:
+            self._compute_extents()
+        return self.__longitude_ranges
+
+    @property
+    def crosses_antimeridian(self):
+        return len(self.longitude_ranges) > 1
+
     @property
     def min_longitude(self):
-        return min([v.longitude for v in self.box_vertices])
+        return self.extents[2]
 
     @property
     def max_longitude(self):
-        return max([v.longitude for v in self.box_vertices])
+        return self.extents[3]
 
     @property
     def min_latitude(self):
-        return min([v.latitude for v in self.box_vertices])
+        return self.extents[0]
 
     @property
     def max_latitude(self):
-        return max([v.latitude for v in self.box_vertices])
+        return self.extents[1]
+
+    @property
+    def _corners(self):
+        """ Pixel and tile coordinates of the top-left and bottom-right vertices, computed once per zoom level """
+        if self.__corners is None:
+            top_left, bottom_right = self.vertex_top_left, self.vertex_bottom_right
+            self.__corners = ((top_left.pixel_x, top_left.pixel_y, top_left.tile_x, top_left.tile_y),
+                              (bottom_right.pixel_x, bottom_right.pixel_y, bottom_right.tile_x, bottom_right.tile_y))
+        return self.__corners
 
     @property
     def vertex_top_left(self):
         """ TilePoint representing the upper-left vertex of the Bounding Box """
-        return Point(latitude=self.max_latitude, longitude=self.min_longitude, zoom_level=self.zoom_level)
+        return Point(latitude=self.max_latitude, longitude=self.min_longitude, zoom_level=self.zoom_level,
+                     precision=self.__precision)
 
     @property
     def vertex_bottom_right(self):
         """ TilePoint representing the lower-right vertex of the Bounding Box """
-        return Point(latitude=self.min_latitude, longitude=self.max_longitude, zoom_level=self.zoom_level)
+        return Point(latitude=self.min_latitude, longitude=self.max_longitude, zoom_level=self.zoom_level,
+                     precision=self.__precision)
 
     @property
     def min_pixel_x(self):
-        return self.vertex_top_left.pixel_x
+        return self._corners[0][0]
 
     @property
     def max_pixel_x(self):
-        return self.vertex_bottom_right.pixel_x
+        return self._corners[1][0]
 
     @property
     def min_pixel_y(self):
-        return self.vertex_top_left.pixel_y
+        return self._corners[0][1]
 
     @property
     def max_pixel_y(self):
-        return self.vertex_bottom_right.pixel_y
+        return self._corners[1][1]
 
     @property
     def min_tile_x(self):
-        return self.vertex_top_left.tile_x
+        return self._corners[0][2]
 
     @property
     def max_tile_x(self):
-        return self.vertex_bottom_right.tile_x
+        return self._corners[1][2]
 
     @property
     def min_tile_y(self):
-        return self.vertex_top_left.tile_y
+        return self._corners[0][3]
 
     @property
     def max_tile_y(self):
-        return self.vertex_bottom_right.tile_y
+        return self._corners[1][3]
 
     @property
     def tile_width(self):
@@ -163,23 +280,140 @@ class BoundingBox(object):
 
     @property
     def pixel_width(self):
-        return max(int(self.vertex_bottom_right.pixel_x - self.vertex_top_left.pixel_x), 1)
+        return max(int(self.max_pixel_x - self.min_pixel_x), 1)
 
     @property
     def pixel_height(self):
-        return max(int(self.vertex_bottom_right.pixel_y - self.vertex_top_left.pixel_y), 1)
+        return max(int(self.max_pixel_y - self.min_pixel_y), 1)
 
     @property
     def tile_grid(self):
-        """ Returns a Grid iterator. Iterates width, then height. """
+        """ Returns a Grid tile range. Iterates width, then height. """
         return Grid(vertex=(self.min_tile_x, self.min_tile_y),
                     width=self.tile_width,
-                    height=self.tile_height)
+                    height=self.tile_height,
+                    zoom_level=self.zoom_level)
+
+    def tile_grid_at(self, zoom_level):
+        """ Grid of this box at another zoom level, reusing the cached extents """
+        top_left = Point(latitude=self.max_latitude, longitude=self.min_longitude, zoom_level=zoom_level,
+                         precision=self.__precision)
+        bottom_right = Point(latitude=self.min_latitude, longitude=self.max_longitude, zoom_level=zoom_level,
+                             precision=self.__precision)
+        return Grid(vertex=(top_left.tile_x, top_left.tile_y),
+                    width=bottom_right.tile_x - top_left.tile_x,
+                    height=bottom_right.tile_y - top_left.tile_y,
+                    zoom_level=zoom_level)
+
+    @property
+    def tile_grids(self):
+        """ Disjoint Grid tile ranges covering the box, west piece first; two when it crosses the antimeridian """
+        return self.tile_grids_at(self.zoom_level)
+
+    def tile_grids_at(self, zoom_level):
+        """ `tile_grids` at another zoom level, reusing the cached extents """
+        if not self.crosses_antimeridian:
+            return [self.tile_grid_at(zoom_level)]
+
+        grids = []
+        for west, east in self.longitude_ranges:
+            min_x, min_y = Point(latitude=self.max_latitude, longitude=west, zoom_level=zoom_level,
+                                 precision=self.__precision)._tile_in_range()
+            max_x, max_y = Point(latitude=self.min_latitude, longitude=east, zoom_level=zoom_level,
+                                 precision=self.__precision)._tile_in_range()
+            grids.append(Grid(vertex=(min_x, min_y), width=max_x - min_x, height=max_y - min_y,
+                              zoom_level=zoom_level))
+        return grids
+
+    def tile_set(self, disc=False):
+        """
+        `TileSet` of the box, for combining the coverage of many boxes
+
+        :param disc: only the tiles of the great-circle disc, see `disc_spans`, rather than `tile_grids`
+        """
+        if disc:
+            return TileSet(self.disc_spans(), self.zoom_level)
+        return TileSet.from_grids(self.tile_grids, self.zoom_level)
+
+    def coverage(self, min_zoom, max_zoom, order='row'):
+        """
+        Stream every tile covering the box from `min_zoom` to `max_zoom`, as (tile_x, tile_y, zoom_level)
+
+        Projects once, at `max_zoom`; lower zoom levels are the parents of that range. Tiles come out zoom level
+        by zoom level, lowest first, each level in `order` (see `Grid.walk`). Boxes crossing the antimeridian are
+        covered piece by piece, and pieces whose parents meet are merged so no tile is given twice.
+        """
+        grids = self.tile_grids_at(max_zoom)
+        if len(grids) == 1:
+            return tiles.coverage(grids[0], min_zoom, max_zoom, order)
+        return self._split_coverage(grids, min_zoom, max_zoom, order)
+
+    @staticmethod
+    def _split_coverage(grids, min_zoom, max_zoom, order):
+        west, east = grids
+        for zoom_level in range(min_zoom, max_zoom + 1):
+            west_level, east_level = west.at_zoom(zoom_level), east.at_zoom(zoom_level)
+            if west_level.min_x <= east_level.max_x + 1:
+                levels = [Grid(vertex=(0, west_level.min_y), width=2 ** zoom_level - 1,
+                               height=west_level.max_y - west_level.min_y, zoom_level=zoom_level)]
+            else:
+                levels = [west_level, east_level]
+
+            for level in levels:
+                for x, y in level.walk(order):
+                    yield x, y, zoom_level
+
+    def metatiles(self, size=8, order='row'):
+        """
+        Stream the distinct metatiles covering the box, as (meta_x, meta_y, Grid of the covered tiles within it)
+
+        Boxes crossing the antimeridian give the metatiles of each piece, each sub-grid clipped to its piece. At
+        zoom levels narrower than two metatiles both pieces may reach the same metatile: it comes once, with both
+        parts joined, when they touch, and otherwise once per piece, so no sub-grid lists a tile outside the box.
+        See `webmercator.metatiles`.
+        """
+        metatiles._check_size(size)
+        grids = self.tile_grids
+        if len(grids) == 1:
+            for meta in metatiles.metatiles(grids[0], size, order):
+                yield meta
+            return
+
+        west, east = grids
+        shared = {}
+        for meta_x, meta_y, sub in metatiles.metatiles(east, size, order):
+            if west.min_x // size <= meta_x <= west.max_x // size:
+                shared[meta_x, meta_y] = sub
+
+        for meta_x, meta_y, sub in metatiles.metatiles(west, size, order):
+            other = shared.get((meta_x, meta_y))
+            if other is not None and other.max_x + 1 >= sub.min_x:
+                del shared[meta_x, meta_y]
+                sub = Grid(vertex=(other.min_x, sub.min_y), width=sub.max_x - other.min_x, height=sub.height,
+                           zoom_level=sub.zoom_level)
+            yield meta_x, meta_y, sub
+
+        for meta_x, meta_y, sub in metatiles.metatiles(east, size, order):
+            if (meta_x, meta_y) not in shared and west.min_x // size <= meta_x <= west.max_x // size:
+                continue
+            yield meta_x, meta_y, sub
+
+    def disc_spans(self):
+        """ Runs of tiles, as (tile_y, min_tile_x, max_tile_x), intersecting the true disc around `pt_center` """
+        return shapes.disc_spans(self.pt_center, self.radius, self.zoom_level)
+
+    def disc_tiles(self):
+        """
+        Tiles intersecting the great-circle disc of `radius` around `pt_center`, row by row
+
+        Leaves out the corners of `tile_grid` that the disc never reaches. See `webmercator.shapes.disc_spans`.
+        """
+        return shapes.disc_tiles(self.pt_center, self.radius, self.zoom_level)
 
     def relative_pixel_x(self, value):
         """ Relative pixel value of left of box """
-        return int(value - self.vertex_top_left.pixel_x)
+        return int(value - self.min_pixel_x)
 
     def relative_pixel_y(self, value):
         """ Relative pixel value of top of box """
-        return int(value - self.vertex_top_left.pixel_y)
+        return int(value - self.min_pixel_y)
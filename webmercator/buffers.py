@@ -0,0 +1,172 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Conversion between buffers of packed coordinate pairs, without building `Point` objects.
+
+Input is any C-contiguous buffer (`bytes`, `bytearray`, `memoryview`, `array.array`, NumPy arrays, `mmap` slices)
+of little-endian float64 pairs: (latitude, longitude) or (meter_x, meter_y). Results are written as little-endian
+pairs into a preallocated, writable buffer: (x, y) as int64 for pixels and tiles, float64 for meters, and
+(latitude, longitude) as float64 for geographic output. Native arrays qualify as they are on little-endian hosts;
+big-endian hosts swap bytes on the way in and out. Records are converted a chunk at a time through the
+`webmercator.batch` backends, so results match `Point` under the same precision policy, and temporary memory is
+bounded by `chunk_size`, whatever the number of records.
+
+The NumPy backend keeps a chunk in arrays, with one exception: meter y output rounded to 1 nm (the 'exact' policy)
+takes its tangent and logarithm from the `math` module, through a temporary list of the chunk's floats, to match
+`Point` bit for bit. The 'fast' and 'e7' policies avoid it. The array backend converts a chunk through
+`array.array` objects and Python floats.
+"""
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from webmercator.batch import INT_TYPECODE, get_backend
+from webmercator.precision import get_precision
+
+SOURCES = ('geo', 'meter')
+TARGETS = ('geo', 'meter', 'pixel', 'tile')
+
+# bytes per record: a pair of 8-byte values, for every source and target
+RECORD_SIZE = 16
+
+
+def allocate(count):
+    """ Output buffer for `count` records """
+    return bytearray(count * RECORD_SIZE)
+
+
+_SWAP = sys.byteorder != 'little'
+
+
+def _bytes(obj):
+    """ Flat view of the bytes of `obj` """
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        # Python 2 `array.array` and `mmap` only have the old buffer interface
+        return buffer(obj)  # noqa: F821
+
+    if view.ndim == 1 and view.itemsize == 1:
+        return view
+    if hasattr(view, 'cast'):
+        return view.cast('B')
+    return buffer(obj)  # noqa: F821
+
+
+def _unpack(typecode, data):
+    """ `array` of the little-endian `typecode` values packed in `data` """
+    values = array(typecode)
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data.tobytes() if isinstance(data, memoryview) else data)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def _pack(values):
+    """ Little-endian bytes of an `array` """
+    if _SWAP:
+        values.byteswap()
+    return values.tobytes() if hasattr(values, 'tobytes') else values.tostring()
+
+
+def _convert(backend, first, second, source, target, zoom_level, precision):
+    if source == 'geo':
+        latitude, longitude = backend.latitude(first, precision), backend.longitude(second, precision)
+    else:
+        latitude = backend.latitude_from_meter_y(second, precision)
+        longitude = backend.longitude_from_meter_x(first, precision)
+
+    if target == 'geo':
+        return latitude, longitude
+    if target == 'meter':
+        return backend.meter_x(longitude, precision), backend.meter_y(latitude, precision)
+
+    pixel_x, pixel_y = backend.pixel_x(longitude, zoom_level), backend.pixel_y(latitude, zoom_level)
+    if target == 'pixel':
+        return pixel_x, pixel_y
+    return backend.tile(pixel_x), backend.tile(pixel_y)
+
+
+def convert_into(values, out, source='geo', target='tile', zoom_level=14, backend=None, chunk_size=65536,
+                 precision=None):
+    """
+    Convert packed coordinate pairs from `values` into `out`
+
+    :param values: buffer of float64 pairs, (latitude, longitude) for 'geo', (meter_x, meter_y) for 'meter'
+    :param out: writable buffer of at least `RECORD_SIZE` bytes per record, see `allocate`
+    :param source: one of `SOURCES`
+    :param target: one of `TARGETS`
+    :param zoom_level: zoom level of pixel and tile output, clamped as `Point` does
+    :param backend: 'numpy' or 'array', see `webmercator.batch.get_backend`
+    :param chunk_size: records converted per step
+    :param precision: rounding and wrapping policy, see `webmercator.precision`; 'fast' suits tile bucketing
+    :return: number of records written
+    """
+    if source not in SOURCES:
+        raise ValueError('Unknown source {!r}, expected one of {}'.format(source, ', '.join(SOURCES)))
+    if target not in TARGETS:
+        raise ValueError('Unknown target {!r}, expected one of {}'.format(target, ', '.join(TARGETS)))
+    if chunk_size < 1:
+        raise ValueError('Chunk size must be positive')
+
+    data = _bytes(values)
+    if len(data) % RECORD_SIZE:
+        raise ValueError('Input holds a partial record')
+
+    count = len(data) // RECORD_SIZE
+    out = _bytes(out)
+    if getattr(out, 'readonly', True):
+        raise ValueError('Output buffer is read-only')
+    if len(out) < count * RECORD_SIZE:
+        raise ValueError('Output buffer holds {} records, {} needed'.format(len(out) // RECORD_SIZE, count))
+
+    backend = get_backend(backend)
+    precision = get_precision(precision)
+    zoom_level = backend.zoom(zoom_level)
+    integers = target in ('pixel', 'tile')
+
+    if backend.name == 'numpy':
+        pairs = numpy.frombuffer(data, dtype='<f8').reshape(-1, 2)
+        results = numpy.frombuffer(out, dtype='<i8' if integers else '<f8', count=2 * count).reshape(-1, 2)
+        for start in range(0, count, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            results[chunk, 0], results[chunk, 1] = _convert(backend, pairs[chunk, 0], pairs[chunk, 1], source,
+                                                            target, zoom_level, precision)
+    else:
+        typecode = INT_TYPECODE if integers else 'd'
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            pairs = _unpack('d', data[start * RECORD_SIZE:stop * RECORD_SIZE])
+            results = array(typecode, [0]) * len(pairs)
+            results[0::2], results[1::2] = _convert(backend, pairs[0::2], pairs[1::2], source, target, zoom_level,
+                                                    precision)
+            out[start * RECORD_SIZE:stop * RECORD_SIZE] = _pack(results)
+
+    return count
@@ -0,0 +1,252 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Bulk conversion of CSV or NDJSON lat/lon records to tile, pixel, meter and quadkey columns.
+
+Input is read as a stream of bounded chunks. Each chunk is converted with `PointArray` in a worker process, and
+chunks are written back in input order.
+"""
+from __future__ import print_function
+
+import argparse
+import csv
+import io
+import json
+import math
+import multiprocessing
+import os
+import sys
+from collections import deque
+from itertools import islice
+
+from webmercator.batch import PointArray
+
+FIELDS = ('tile_x', 'tile_y', 'pixel_x', 'pixel_y', 'meter_x', 'meter_y', 'quadkey', 'tile_key')
+
+if sys.version_info[0] < 3:
+    # Python 2's csv module reads and writes byte strings
+    _Buffer = io.BytesIO
+
+    def _open_file(path, mode):
+        return open(path, mode + 'b')
+else:
+    _Buffer = io.StringIO
+
+    def _open_file(path, mode):
+        return io.open(path, mode, newline='', encoding='utf-8')
+
+
+def _coordinate(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isinf(value) or math.isnan(value) else value
+
+
+def _parse_record(number, line):
+    """ JSON object of the NDJSON record on input line `number` """
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ValueError('line {}: invalid JSON: {}'.format(number, e))
+    if not isinstance(record, dict):
+        raise ValueError('line {}: expected a JSON object, not {}'.format(number, type(record).__name__))
+    return record
+
+
+def convert(latitudes, longitudes, fields, zoom_level, backend=None):
+    """
+    Convert coordinate columns; records without valid coordinates get None for every field
+
+    :return: dict of field name to list of values
+    """
+    valid = [i for i, (lat, lon) in enumerate(zip(latitudes, longitudes)) if lat is not None and lon is not None]
+    columns = dict((field, [None] * len(latitudes)) for field in fields)
+    if not valid:
+        return columns
+
+    pa = PointArray(latitude=[latitudes[i] for i in valid], longitude=[longitudes[i] for i in valid],
+                    zoom_level=zoom_level, backend=backend)
+    for field in fields:
+        values = getattr(pa, field)
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+
+        column = columns[field]
+        for i, value in zip(valid, values):
+            column[i] = value
+    return columns
+
+
+def convert_chunk(task):
+    """ Worker entry point: parse, convert and serialize one chunk; returns the output text """
+    fmt, header, records, options = task
+    fields = options['fields']
+
+    if fmt == 'csv':
+        lat_index, lon_index = header.index(options['lat_field']), header.index(options['lon_field'])
+        latitudes = [_coordinate(row[lat_index]) if len(row) > lat_index else None for row in records]
+        longitudes = [_coordinate(row[lon_index]) if len(row) > lon_index else None for row in records]
+    else:
+        records = [_parse_record(number, line) for number, line in records]
+        latitudes = [_coordinate(record.get(options['lat_field'])) for record in records]
+        longitudes = [_coordinate(record.get(options['lon_field'])) for record in records]
+
+    columns = convert(latitudes, longitudes, fields, options['zoom_level'], options['backend'])
+
+    out = _Buffer()
+    if fmt == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        for i, row in enumerate(records):
+            writer.writerow(list(row) + ['' if columns[f][i] is None else columns[f][i] for f in fields])
+    else:
+        for i, record in enumerate(records):
+            for field in fields:
+                record[field] = columns[field][i]
+            out.write(json.dumps(record))
+            out.write('\n')
+    return out.getvalue()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_ordered(function, tasks, workers):
+    """ Like `Pool.imap`, but with at most `2 * workers` chunks in flight, so memory stays bounded """
+    if workers <= 1:
+        for task in tasks:
+            yield function(task)
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(function, (task,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def detect_format(path):
+    return 'ndjson' if os.path.splitext(path)[1].lower() in ('.ndjson', '.jsonl', '.json') else 'csv'
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='webmercator', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', help="input file, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="output file, or '-' for stdout (default)")
+    parser.add_argument('-f', '--format', choices=('csv', 'ndjson'),
+                        help='input and output format; defaults to the input file extension, else csv')
+    parser.add_argument('-z', '--zoom-level', type=int, default=14, help='zoom level (default: 14)')
+    parser.add_argument('--fields', default='tile_x,tile_y,quadkey',
+                        help='comma separated output fields from: {} (default: tile_x,tile_y,quadkey)'.format(
+                            ', '.join(FIELDS)))
+    parser.add_argument('--lat-field', default='latitude', help='latitude column or key (default: latitude)')
+    parser.add_argument('--lon-field', default='longitude', help='longitude column or key (default: longitude)')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='records per chunk (default: 50000)')
+    parser.add_argument('-j', '--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='worker processes; 1 converts in-process (default: CPU count)')
+    parser.add_argument('--backend', choices=('numpy', 'array'),
+                        help='conversion backend (default: numpy if installed)')
+    args = parser.parse_args(argv)
+
+    args.fields = [f.strip() for f in args.fields.split(',') if f.strip()]
+    unknown = [f for f in args.fields if f not in FIELDS]
+    if unknown:
+        parser.error('unknown fields: {}'.format(', '.join(unknown)))
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be positive')
+    if args.format is None:
+        args.format = 'csv' if args.input == '-' else detect_format(args.input)
+    return args
+
+
+def run(args, source, sink):
+    options = {
+        'fields': args.fields,
+        'zoom_level': args.zoom_level,
+        'lat_field': args.lat_field,
+        'lon_field': args.lon_field,
+        'backend': args.backend,
+    }
+
+    if args.format == 'csv':
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if header is None:
+            return
+        for name in (args.lat_field, args.lon_field):
+            if name not in header:
+                raise ValueError('Column `{}` not found in CSV header'.format(name))
+
+        writer = csv.writer(sink, lineterminator='\n')
+        writer.writerow(header + args.fields)
+        records = reader
+    else:
+        header = None
+        records = ((number, line) for number, line in enumerate(source, 1) if line.strip())
+
+    tasks = ((args.format, header, chunk, options) for chunk in _chunks(records, args.chunk_size))
+    for text in _map_ordered(convert_chunk, tasks, args.workers):
+        sink.write(text)
+
+
+def _open(path, mode):
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    return _open_file(path, mode)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    source = _open(args.input, 'r')
+    sink = _open(args.output, 'w')
+    try:
+        run(args, source, sink)
+    except ValueError as e:
+        print('webmercator: error: {}'.format(e), file=sys.stderr)
+        return 2
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
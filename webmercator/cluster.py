@@ -0,0 +1,263 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Grid-based clustering of identified points, for every zoom level at once.
+
+At zoom level z, points are grouped into square cells of `cell_size` pixels. Cells line up with tiles: a cell at
+zoom level z is a tile `8 - log2(cell_size)` zoom levels deeper, and the four cells at z + 1 inside it are its
+children. Points are projected once, into the cells of `max_zoom`; every coarser level is kept as sums over
+child cells, so inserts, moves and deletes update one cell per zoom level.
+"""
+from collections import namedtuple
+
+from webmercator.batch import PointArray
+from webmercator.box import BoundingBox
+from webmercator.point import Point
+
+
+class Cluster(namedtuple('Cluster', ['count', 'latitude', 'longitude', 'tile'])):
+    """
+    Points sharing a cell: how many, the mean of their latitudes and longitudes, and the cell as a
+    (tile_x, tile_y, zoom_level) tile, holding every point of the cluster (by its `Point` tile at `leaf_zoom`)
+    """
+
+    __slots__ = ()
+
+
+def _add(level, cell, count, latitude, longitude):
+    totals = level.get(cell)
+    if totals is None:
+        level[cell] = [count, latitude, longitude]
+    else:
+        totals[0] += count
+        totals[1] += latitude
+        totals[2] += longitude
+
+
+class ClusterIndex(object):
+    """
+    Points, each under a hashable id, clustered at zoom levels 0 to `max_zoom`.
+
+    :param max_zoom: deepest zoom level clustered; queries must be at or above it
+    :param cell_size: cell side in pixels, a power of two up to 256
+    """
+
+    def __init__(self, max_zoom=16, cell_size=64):
+        if cell_size < 1 or cell_size > 256 or cell_size & (cell_size - 1):
+            raise ValueError('Cell size must be a power of two from 1 to 256, not {}'.format(cell_size))
+
+        self.__cell_zoom = 8 - (cell_size.bit_length() - 1)
+        if not 1 <= max_zoom + self.__cell_zoom <= 23:
+            raise ValueError('Zoom level {} is outside 0..{} for {} pixel cells'.format(
+                max_zoom, 23 - self.__cell_zoom, cell_size))
+
+        self.__max_zoom = max_zoom
+        self.__cell_size = cell_size
+        self.__levels = [{} for _ in range(max_zoom + 1)]
+        self.__leaves = {}
+        self.__where = {}
+
+    def __repr__(self):
+        return '<ClusterIndex of {} points, max_zoom: {}, cell_size: {}>'.format(len(self), self.max_zoom,
+                                                                                 self.cell_size)
+
+    def __len__(self):
+        return len(self.__where)
+
+    def __contains__(self, identifier):
+        return identifier in self.__where
+
+    @property
+    def max_zoom(self):
+        return self.__max_zoom
+
+    @property
+    def cell_size(self):
+        return self.__cell_size
+
+    @property
+    def leaf_zoom(self):
+        """ Tile zoom level of the cells at `max_zoom` """
+        return self.__max_zoom + self.__cell_zoom
+
+    def location(self, identifier):
+        """ (latitude, longitude) of `identifier` """
+        return self.__where[identifier][1:]
+
+    def _leaf(self, latitude, longitude):
+        pt = Point(latitude=latitude, longitude=longitude, zoom_level=self.leaf_zoom)
+        return pt._tile_in_range(), pt.latitude, pt.longitude
+
+    def _apply(self, leaf, count, latitude, longitude):
+        """ Add `count` points, with coordinate sums `latitude` and `longitude`, to every cell holding `leaf` """
+        x, y = leaf
+        for shift, level in enumerate(reversed(self.__levels)):
+            cell = (x >> shift, y >> shift)
+            _add(level, cell, count, latitude, longitude)
+            if not level[cell][0]:
+                del level[cell]
+
+    def load(self, identifiers, latitudes, longitudes, backend=None):
+        """
+        Bulk insert, projecting every point in one `PointArray` pass and summing each level from the one below
+
+        :param identifiers: sequence of new, distinct ids
+        :param latitudes: sequence of latitudes, same length
+        :param longitudes: sequence of longitudes, same length
+        :param backend: `PointArray` backend name, defaults to the fastest available
+        """
+        identifiers = list(identifiers)
+        points = PointArray(latitude=latitudes, longitude=longitudes, zoom_level=self.leaf_zoom, backend=backend)
+        if len(identifiers) != len(points):
+            raise ValueError("Ids and coordinates differ in length: {} != {}".format(len(identifiers), len(points)))
+
+        if len(set(identifiers)) != len(identifiers) or any(i in self.__where for i in identifiers):
+            raise ValueError('Ids must be distinct and not already indexed')
+
+        tile_x, tile_y = (column.tolist() for column in points._tiles_in_range())
+        latitudes, longitudes = points.latitude.tolist(), points.longitude.tolist()
+
+        level = {}
+        for i, identifier in enumerate(identifiers):
+            leaf = (tile_x[i], tile_y[i])
+            self.__where[identifier] = (leaf, latitudes[i], longitudes[i])
+            self.__leaves.setdefault(leaf, set()).add(identifier)
+            _add(level, leaf, 1, latitudes[i], longitudes[i])
+
+        for zoom_level in range(self.max_zoom, -1, -1):
+            parent = {}
+            for (x, y), (count, latitude, longitude) in level.items():
+                cell = (x >> 1, y >> 1)
+                totals = parent.get(cell)
+                if totals is None:
+                    parent[cell] = [count, latitude, longitude]
+                else:
+                    totals[0] += count
+                    totals[1] += latitude
+                    totals[2] += longitude
+
+            existing = self.__levels[zoom_level]
+            if existing:
+                for cell, (count, latitude, longitude) in level.items():
+                    _add(existing, cell, count, latitude, longitude)
+            else:
+                self.__levels[zoom_level] = level
+            level = parent
+
+    def insert(self, identifier, latitude, longitude):
+        """ Add one point; use `move` for ids already indexed """
+        if identifier in self.__where:
+            raise ValueError('{!r} is already indexed'.format(identifier))
+
+        leaf, latitude, longitude = self._leaf(latitude, longitude)
+        self.__where[identifier] = (leaf, latitude, longitude)
+        self.__leaves.setdefault(leaf, set()).add(identifier)
+        self._apply(leaf, 1, latitude, longitude)
+
+    def move(self, identifier, latitude, longitude):
+        """ Update the position of an indexed point """
+        old, old_latitude, old_longitude = self.__where[identifier]
+        leaf, latitude, longitude = self._leaf(latitude, longitude)
+        if leaf == old:
+            self._apply(leaf, 0, latitude - old_latitude, longitude - old_longitude)
+            self.__where[identifier] = (leaf, latitude, longitude)
+        else:
+            self.delete(identifier)
+            self.__where[identifier] = (leaf, latitude, longitude)
+            self.__leaves.setdefault(leaf, set()).add(identifier)
+            self._apply(leaf, 1, latitude, longitude)
+
+    def delete(self, identifier):
+        """ Remove a point; raises KeyError when it is not indexed """
+        leaf, latitude, longitude = self.__where.pop(identifier)
+        members = self.__leaves[leaf]
+        members.discard(identifier)
+        if not members:
+            del self.__leaves[leaf]
+        self._apply(leaf, -1, -latitude, -longitude)
+
+    def _check_zoom(self, zoom_level):
+        if not 0 <= zoom_level <= self.max_zoom:
+            raise ValueError('Zoom level {} is outside 0..{}'.format(zoom_level, self.max_zoom))
+
+    @staticmethod
+    def _cells(level, min_x, min_y, max_x, max_y):
+        """ (cell, totals) of the non-empty cells in a range, enumerating the range or scanning, whichever is less """
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(level):
+            for (x, y), totals in level.items():
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    yield (x, y), totals
+        else:
+            for y in range(min_y, max_y + 1):
+                for x in range(min_x, max_x + 1):
+                    totals = level.get((x, y))
+                    if totals is not None:
+                        yield (x, y), totals
+
+    def _clusters(self, zoom_level, ranges):
+        level = self.__levels[zoom_level]
+        tile_zoom = zoom_level + self.__cell_zoom
+        clusters = []
+        for cell_range in ranges:
+            for (x, y), (count, latitude, longitude) in self._cells(level, *cell_range):
+                clusters.append(Cluster(count, latitude / count, longitude / count, (x, y, tile_zoom)))
+        return clusters
+
+    def clusters(self, bounding_box, zoom_level=None):
+        """
+        Clusters whose cells intersect a `BoundingBox`, in no particular order
+
+        :param zoom_level: defaults to the zoom level of the box
+        """
+        if not isinstance(bounding_box, BoundingBox):
+            raise TypeError("Did not provide valid bounding box type")
+
+        zoom_level = bounding_box.zoom_level if zoom_level is None else zoom_level
+        self._check_zoom(zoom_level)
+
+        shift = self.max_zoom - zoom_level
+        ranges = [(g.min_x >> shift, g.min_y >> shift, g.max_x >> shift, g.max_y >> shift)
+                  for g in bounding_box.tile_grids_at(self.leaf_zoom)]
+        if len(ranges) == 2:
+            # antimeridian pieces that meet once coarsened: one full-width range, so no cell comes twice
+            (west_x, min_y, _, max_y), (_, _, east_x, _) = ranges
+            if west_x <= east_x + 1:
+                ranges = [(0, min_y, (1 << (zoom_level + self.__cell_zoom)) - 1, max_y)]
+        return self._clusters(zoom_level, ranges)
+
+    def tile_clusters(self, tile_x, tile_y, zoom_level):
+        """ Clusters in a tile, in no particular order """
+        self._check_zoom(zoom_level)
+        side = 1 << self.__cell_zoom
+        return self._clusters(zoom_level, [(tile_x * side, tile_y * side, (tile_x + 1) * side - 1,
+                                            (tile_y + 1) * side - 1)])
+
+    def members(self, tile_x, tile_y, zoom_level):
+        """ Ids of the points in a tile at or above `leaf_zoom`, such as `Cluster.tile` """
+        if not 0 <= zoom_level <= self.leaf_zoom:
+            raise ValueError('Zoom level {} is outside 0..{}'.format(zoom_level, self.leaf_zoom))
+
+        side = 1 << (self.leaf_zoom - zoom_level)
+        cells = self._cells(self.__leaves, tile_x * side, tile_y * side, (tile_x + 1) * side - 1,
+                            (tile_y + 1) * side - 1)
+        return [identifier for _, members in cells for identifier in members]
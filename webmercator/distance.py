@@ -0,0 +1,97 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Great-circle distances by the haversine formula, between `Point` and across `PointArray`.
+
+The Earth is the sphere of `BoundingBox`, `EARTH_RADIUS_MILES` in radius. Distances come in any of `UNITS`.
+"""
+from __future__ import division
+
+import math
+
+from webmercator.batch import PointArray
+from webmercator.point import Point
+from webmercator.util import EARTH_RADIUS_MILES
+
+# units per mile
+UNITS = {
+    'miles': 1.0,
+    'kilometers': 1.609344,
+    'meters': 1609.344,
+    'nautical_miles': 1609.344 / 1852,
+}
+
+
+def earth_radius(units='miles'):
+    """ `EARTH_RADIUS_MILES` in `units` """
+    if units not in UNITS:
+        raise ValueError('Unknown units {!r}, expected one of {}'.format(units, ', '.join(sorted(UNITS))))
+    return EARTH_RADIUS_MILES * UNITS[units]
+
+
+def _check_points(kind, *values):
+    for value in values:
+        if not isinstance(value, kind):
+            raise TypeError("Did not provide valid point type")
+
+
+def haversine(latitude, longitude, other_latitude, other_longitude, units='miles'):
+    """ Great-circle distance between two latitude/longitude pairs, in degrees """
+    radius = earth_radius(units)
+    lat1, lat2 = math.radians(latitude), math.radians(other_latitude)
+    h = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(other_longitude - longitude) / 2) ** 2)
+    return 2 * radius * math.asin(math.sqrt(min(h, 1)))
+
+
+def distance(point, other, units='miles'):
+    """ Great-circle distance between two `Point` """
+    _check_points(Point, point, other)
+    return haversine(point.latitude, point.longitude, other.latitude, other.longitude, units)
+
+
+def distances(point, points, units='miles'):
+    """
+    Great-circle distance from one `Point` to every point of a `PointArray`
+
+    :return: array, of the backend of `points`
+    """
+    _check_points(Point, point)
+    _check_points(PointArray, points)
+    return points._backend.haversine(point.latitude, point.longitude, points.latitude, points.longitude,
+                                     earth_radius(units))
+
+
+def pairwise(points, others, units='miles'):
+    """
+    Great-circle distance between the points at the same position of two `PointArray` of equal length
+
+    :return: array, of the backend of `points`
+    """
+    _check_points(PointArray, points, others)
+    if len(points) != len(others):
+        raise ValueError("Coordinate arrays differ in length: {} != {}".format(len(points), len(others)))
+
+    backend = points._backend
+    return backend.haversine(points.latitude, points.longitude, backend.floats(others.latitude),
+                             backend.floats(others.longitude), earth_radius(units))
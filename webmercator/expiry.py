@@ -0,0 +1,126 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Tile expiry: the tiles to invalidate at every zoom level after features change.
+
+Changed features are gathered at one base zoom level into a `TileSet`, then streamed out zoom level by zoom level
+by parent and child shifts. Memory follows the outline of the changed area at the base zoom level; the tiles at
+deeper zoom levels are never held at once.
+"""
+from webmercator.box import BoundingBox
+from webmercator.grid import Grid
+from webmercator.point import Point
+from webmercator.tiles import _check_zoom
+from webmercator.tileset import TileSet
+
+# spans buffered before being merged into the changed area
+_BUFFER = 65536
+
+
+def _clip(spans, zoom_level):
+    last = 2 ** zoom_level - 1
+    for y, start, stop in spans:
+        if 0 <= y <= last:
+            start, stop = max(start, 0), min(stop, last)
+            if start <= stop:
+                yield y, start, stop
+
+
+def _grid_spans(grid, zoom_level):
+    if grid.zoom_level is not None and grid.zoom_level != zoom_level:
+        grid = grid.at_zoom(zoom_level)
+    if len(grid):
+        for y in range(grid.min_y, grid.max_y + 1):
+            yield y, grid.min_x, grid.max_x
+
+
+def _spans(feature, zoom_level):
+    """ Runs of the tiles a changed feature touches at `zoom_level` """
+    if isinstance(feature, Point):
+        if feature.zoom_level != zoom_level:
+            feature = Point(latitude=feature.latitude, longitude=feature.longitude, zoom_level=zoom_level)
+        x, y = feature._tile_in_range()
+        return [(y, x, x)]
+
+    if isinstance(feature, BoundingBox):
+        return [s for grid in feature.tile_grids_at(zoom_level) for s in _grid_spans(grid, zoom_level)]
+
+    if isinstance(feature, Grid):
+        return _grid_spans(feature, zoom_level)
+
+    if isinstance(feature, TileSet):
+        return feature.spans_at(zoom_level) if feature.zoom_level is not None else feature.spans()
+
+    if isinstance(feature, tuple) and len(feature) in (2, 3):
+        x, y = feature[:2]
+        tile_zoom = feature[2] if len(feature) == 3 else zoom_level
+        return _grid_spans(Grid(vertex=(x, y), width=0, height=0, zoom_level=tile_zoom), zoom_level)
+
+    raise TypeError('Cannot expire {!r}; expected a Point, BoundingBox, Grid, TileSet or tile tuple'.format(feature))
+
+
+def changed_tiles(features, zoom_level):
+    """
+    `TileSet` at `zoom_level` of every tile touched by the changed features
+
+    :param features: iterable of `Point`, `BoundingBox`, `Grid`, `TileSet`, (tile_x, tile_y) at `zoom_level` or
+        (tile_x, tile_y, zoom_level); features at another zoom level are shifted to `zoom_level`
+    """
+    _check_zoom(zoom_level)
+    changed = TileSet(zoom_level=zoom_level)
+    buffered = []
+    for feature in features:
+        buffered.extend(_clip(_spans(feature, zoom_level), zoom_level))
+        if len(buffered) >= _BUFFER:
+            changed |= TileSet(buffered, zoom_level)
+            buffered = []
+
+    return changed | TileSet(buffered, zoom_level)
+
+
+def expiry_spans(features, zoom_level, min_zoom, max_zoom):
+    """
+    Stream the tiles to expire from `min_zoom` to `max_zoom` as runs, each tile once
+
+    :return: generator of (zoom_level, tile_y, min_tile_x, max_tile_x), zoom level by zoom level, lowest first
+    """
+    _check_zoom(min_zoom)
+    _check_zoom(max_zoom)
+    if min_zoom > max_zoom:
+        raise ValueError('Minimum zoom level {} is above maximum zoom level {}'.format(min_zoom, max_zoom))
+
+    changed = changed_tiles(features, zoom_level)
+    for z in range(min_zoom, max_zoom + 1):
+        for y, start, stop in changed.spans_at(z):
+            yield z, y, start, stop
+
+
+def expiry(features, zoom_level, min_zoom, max_zoom):
+    """
+    Stream every tile to expire from `min_zoom` to `max_zoom`, see `expiry_spans`
+
+    :return: generator of (tile_x, tile_y, zoom_level)
+    """
+    for z, y, start, stop in expiry_spans(features, zoom_level, min_zoom, max_zoom):
+        for x in range(start, stop + 1):
+            yield x, y, z
@@ -22,15 +22,91 @@
 
 import sys
 
+from webmercator import quadkey
+
 if (2, 0) >= sys.version_info > (3, 0):
     from builtins import object
 
 
+def _walk(vertex, columns, start, stop):
+    """ Tiles at row-major positions `start` to `stop` of a grid `columns` tiles wide """
+    if start >= stop:
+        return
+
+    x0, y0 = vertex
+    row, column = divmod(start, columns)
+    while start < stop:
+        row_stop = min(stop, start + columns - column)
+        y = y0 + row
+        for x in range(x0 + column, x0 + column + row_stop - start):
+            yield x, y
+
+        start, row, column = row_stop, row + 1, 0
+
+
+def _chunks(vertex, columns, start, stop, size, backend):
+    """ (xs, ys) array pairs covering positions `start` to `stop`; whole rows when `size` is None """
+    # imported here, as the batch module builds on top of this one
+    from webmercator.batch import get_backend
+
+    backend = get_backend(backend)
+    while start < stop:
+        if size is None:
+            chunk_stop = min(stop, (start // columns + 1) * columns)
+        else:
+            chunk_stop = min(stop, start + size)
+
+        yield backend.tile_block(vertex, columns, start, chunk_stop)
+        start = chunk_stop
+
+
+# space-filling curves, as (quadrant x, quadrant y, child state) for each state, in curve order; Morton is the
+# quadkey digit order, Hilbert state 0 is the orientation of the classic `xy2d`, from (0, 0) to (1, 0)
+_CURVES = {
+    'morton': (((0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)),),
+    'hilbert': (((0, 0, 1), (0, 1, 0), (1, 1, 0), (1, 0, 2)),
+                ((0, 0, 0), (1, 0, 1), (1, 1, 1), (0, 1, 3)),
+                ((1, 1, 3), (0, 1, 2), (0, 0, 2), (1, 0, 0)),
+                ((1, 1, 2), (1, 0, 3), (0, 0, 3), (0, 1, 1))),
+}
+
+ORDERS = ('row', 'morton', 'hilbert')
+
+
+def _curve(min_x, min_y, max_x, max_y, bits, states):
+    """
+    Tiles of an inclusive range in the order of a curve over the aligned square of side 2**bits
+
+    Descends the quadtree with an explicit stack, skipping quadrants outside the range, so tiles stream in curve
+    order without sorting and memory stays proportional to `bits`.
+    """
+    stack = [(0, 0, bits, 0)]
+    while stack:
+        x, y, level, state = stack.pop()
+        size = 1 << level
+        if x > max_x or y > max_y or x + size <= min_x or y + size <= min_y:
+            continue
+
+        if level <= 1:
+            for dx, dy, _ in (states[state] if level else ((0, 0, 0),)):
+                if min_x <= x + dx <= max_x and min_y <= y + dy <= max_y:
+                    yield x + dx, y + dy
+            continue
+
+        half = size >> 1
+        for dx, dy, child in reversed(states[state]):
+            stack.append((x + dx * half, y + dy * half, level - 1, child))
+
+
 class Grid(object):
+    """
+    Inclusive range of tiles, from `vertex` to `vertex + (width, height)`, optionally at a known `zoom_level`.
 
-    def __init__(self, **kwargs):
-        self.x, self.y = 0, 0
+    Behaves like `range`: every `iter()` starts a fresh row-major walk (width, then height), and `len`, membership
+    and indexing are computed without enumerating tiles.
+    """
 
+    def __init__(self, **kwargs):
         if 'vertex' not in kwargs:
             raise AttributeError('vertex kwarg is required')
 
@@ -42,26 +118,281 @@ class Grid(object):
         self.__width = int(kwargs['width'])
         self.__height = int(kwargs['height'])
 
+        self.zoom_level = kwargs.get('zoom_level')
+
+        # bounds are inclusive, so a width of 0 is still one column
+        self.__columns = max(self.__width + 1, 0)
+        self.__rows = max(self.__height + 1, 0)
+        if not self.__columns or not self.__rows:
+            self.__columns = self.__rows = 0
+
+    def __repr__(self):
+        return '<Grid vertex: {}, width: {}, height: {}>'.format(self.vertex, self.width, self.height)
+
+    def __eq__(self, other):
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return (self.vertex, self.width, self.height, self.zoom_level) == \
+            (other.vertex, other.width, other.height, other.zoom_level)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash((self.vertex, self.width, self.height, self.zoom_level))
+
+    @property
+    def vertex(self):
+        return self.__start_x, self.__start_y
+
+    @property
+    def width(self):
+        return self.__width
+
+    @property
+    def height(self):
+        return self.__height
+
+    @property
+    def min_x(self):
+        return self.__start_x
+
+    @property
+    def max_x(self):
+        return self.__start_x + self.__width
+
+    @property
+    def min_y(self):
+        return self.__start_y
+
+    @property
+    def max_y(self):
+        return self.__start_y + self.__height
+
+    @property
+    def columns(self):
+        """ Number of tiles per row """
+        return self.__columns
+
+    @property
+    def rows(self):
+        """ Number of rows """
+        return self.__rows
+
+    def __len__(self):
+        return self.__columns * self.__rows
+
+    def __contains__(self, tile):
+        try:
+            x, y = tile
+        except (TypeError, ValueError):
+            return False
+
+        return (0 <= x - self.__start_x < self.__columns) and (0 <= y - self.__start_y < self.__rows)
+
     def __iter__(self):
-        return self
+        xs = range(self.__start_x, self.__start_x + self.__columns)
+        for y in range(self.__start_y, self.__start_y + self.__rows):
+            for x in xs:
+                yield x, y
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return GridSlice(self, *index.indices(len(self)))
+
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('Grid index out of range')
+
+        y, x = divmod(index, self.__columns)
+        return self.__start_x + x, self.__start_y + y
+
+    def walk(self, order='row'):
+        """
+        Iterate tiles in a locality-preserving order
 
-    def __iterate(self):
-        current_x, current_y = self.__start_x + self.x, self.__start_y + self.y
+        'row' is the row-major order of `iter()`. 'morton' (Z-order) follows quadkeys and packed tile keys, so it
+        matches their sort order. 'hilbert' never jumps between tiles that are not neighbours. Both curves are laid
+        over the whole map at `zoom_level`, so a tile keeps its rank across grids; without a zoom level, over the
+        smallest square from (0, 0) holding the grid.
 
-        if self.x > self.__width or self.y > self.__height:
-            raise StopIteration
-        elif self.x == self.__width:  # end of x, start next row
-            self.x = 0
-            self.y += 1
+        :param order: one of `ORDERS`
+        :return: generator of (tile_x, tile_y)
+        """
+        if order not in ORDERS:
+            raise ValueError('Unknown order {!r}, expected one of {}'.format(order, ', '.join(ORDERS)))
+
+        if order == 'row' or not len(self):
+            return iter(self)
+
+        if self.min_x < 0 or self.min_y < 0:
+            raise ValueError('Curve orders need non-negative tile coordinates')
+
+        bits = max(self.zoom_level or 0, self.max_x.bit_length(), self.max_y.bit_length())
+        return _curve(self.min_x, self.min_y, self.max_x, self.max_y, bits, _CURVES[order])
+
+    def chunks(self, size=None, backend=None):
+        """
+        Iterate tiles in blocks of arrays rather than one tuple at a time
+
+        :param size: tiles per block; defaults to one block per row
+        :param backend: 'numpy' or 'array', see `webmercator.batch.get_backend`
+        :return: generator of (tile_x, tile_y) array pairs, in row-major order
+        """
+        if size is not None and size < 1:
+            raise ValueError('Chunk size must be positive')
+
+        return _chunks(self.vertex, self.__columns, 0, len(self), size, backend)
+
+    def shards(self, count):
+        """
+        Split into `count` disjoint, contiguous pieces whose sizes differ by at most one tile
+
+        Shards only hold their bounds, so they are cheap to pickle and hand to worker processes.
+
+        :param count: number of shards
+        :return: list of `GridShard`
+        """
+        if count < 1:
+            raise ValueError('Shard count must be positive')
+
+        size = len(self)
+        return [GridShard(self, size * i // count, size * (i + 1) // count) for i in range(count)]
+
+    def _zoom_level(self, zoom_level):
+        zoom_level = self.zoom_level if zoom_level is None else zoom_level
+        if zoom_level is None:
+            raise ValueError('Grid has no zoom level; pass `zoom_level`')
+        return zoom_level
+
+    def quadkeys(self, zoom_level=None, order='row'):
+        """ Quadkey of every tile, in iteration order or another of `ORDERS` """
+        zoom_level = self._zoom_level(zoom_level)
+        for x, y in ((self.min_x, self.min_y), (self.max_x, self.max_y)) if len(self) else ():
+            quadkey._check_tile(x, y, zoom_level)
+
+        return (quadkey.morton_to_quadkey(quadkey.interleave(x, y), zoom_level) for x, y in self.walk(order))
+
+    def tile_keys(self, zoom_level=None, size=None, backend=None):
+        """ Packed tile keys in blocks of arrays, following `chunks` """
+        zoom_level = self._zoom_level(zoom_level)
+        for xs, ys in self.chunks(size=size, backend=backend):
+            yield quadkey.pack_array(xs, ys, zoom_level, backend=backend)
+
+    def at_zoom(self, zoom_level):
+        """
+        Grid covering the same area at another zoom level, by bit shifts only
+
+        Zooming out gives the parents of the tiles, zooming in gives all of their children.
+        """
+        current = self._zoom_level(None)
+        if not len(self):
+            return Grid(vertex=self.vertex, width=-1, height=-1, zoom_level=zoom_level)
+
+        if zoom_level <= current:
+            shift = current - zoom_level
+            min_x, min_y = self.min_x >> shift, self.min_y >> shift
+            max_x, max_y = self.max_x >> shift, self.max_y >> shift
         else:
-            self.x += 1
+            shift = zoom_level - current
+            min_x, min_y = self.min_x << shift, self.min_y << shift
+            max_x, max_y = ((self.max_x + 1) << shift) - 1, ((self.max_y + 1) << shift) - 1
+
+        return Grid(vertex=(min_x, min_y), width=max_x - min_x, height=max_y - min_y, zoom_level=zoom_level)
+
+    def pyramid(self, min_zoom, max_zoom):
+        """ `at_zoom` for each zoom level from `min_zoom` to `max_zoom`, inclusive """
+        for zoom_level in range(min_zoom, max_zoom + 1):
+            yield self.at_zoom(zoom_level)
+
+    def index(self, tile):
+        """ Position of `tile` in iteration order """
+        if tile not in self:
+            raise ValueError('{} is not in grid'.format(tile))
+
+        x, y = tile
+        return (y - self.__start_y) * self.__columns + (x - self.__start_x)
+
+
+class GridShard(object):
+    """ Contiguous run of a `Grid`, from row-major position `start` up to, but excluding, `stop` """
+
+    def __init__(self, grid, start, stop):
+        if not isinstance(grid, Grid):
+            raise TypeError('Did not provide valid grid type')
+
+        self.grid = grid
+        self.start = max(start, 0)
+        self.stop = min(max(stop, self.start), len(grid))
+
+    def __repr__(self):
+        return '<GridShard of {} [{}:{}]>'.format(self.grid, self.start, self.stop)
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __contains__(self, tile):
+        return tile in self.grid and self.start <= self.grid.index(tile) < self.stop
+
+    def __iter__(self):
+        return _walk(self.grid.vertex, self.grid.columns, self.start, self.stop)
+
+    def chunks(self, size=None, backend=None):
+        """ Same as `Grid.chunks`, limited to this shard; row blocks are cut at the shard bounds """
+        if size is not None and size < 1:
+            raise ValueError('Chunk size must be positive')
+
+        return _chunks(self.grid.vertex, self.grid.columns, self.start, self.stop, size, backend)
+
+
+class GridSlice(object):
+    """
+    Lazy slice of a `Grid`: the tiles at row-major positions `start`, `start + step`, ... up to, but excluding,
+    `stop`. Like `range`, it only holds its bounds; indexing and slicing again are computed.
+    """
+
+    def __init__(self, grid, start, stop, step=1):
+        if not isinstance(grid, Grid):
+            raise TypeError('Did not provide valid grid type')
+        if step == 0:
+            raise ValueError('Slice step cannot be zero')
+
+        self.grid = grid
+        self.start = start
+        self.step = step
+        self.__length = max(0, (stop - start + step - (1 if step > 0 else -1)) // step)
+        self.stop = start + self.__length * step
+
+    def __repr__(self):
+        return '<GridSlice of {} [{}:{}:{}]>'.format(self.grid, self.start, self.stop, self.step)
+
+    def __len__(self):
+        return self.__length
+
+    def __contains__(self, tile):
+        if tile not in self.grid:
+            return False
+
+        offset = self.grid.index(tile) - self.start
+        return offset % self.step == 0 and 0 <= offset // self.step < self.__length
+
+    def __iter__(self):
+        if self.step == 1:
+            return _walk(self.grid.vertex, self.grid.columns, self.start, self.stop)
+        return (self.grid[self.start + i * self.step] for i in range(self.__length))
 
-        return current_x, current_y
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.__length)
+            return GridSlice(self.grid, self.start + start * self.step, self.start + stop * self.step,
+                             step * self.step)
 
-    def __next__(self):
-        """ Python3 iterative """
-        return self.__iterate()
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError('GridSlice index out of range')
 
-    def next(self):
-        """ Python2 iterative """
-        return self.__iterate()
+        return self.grid[self.start + index * self.step]
@@ -0,0 +1,244 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Per-tile point density histograms, for rendering heatmap tiles.
+
+Each active tile holds a `resolution` x `resolution` grid of counts, one bin per `256 / resolution` pixels, in rows
+from the top of the tile. Pixels are those of `Point` at each zoom level, computed a chunk of points at a time
+through the `webmercator.batch` backends. Only tiles that received points are kept: each starts as a sparse
+mapping of its occupied bins and becomes a dense array of `4 * resolution ** 2` bytes once more than 1/32 of its
+bins are occupied, so memory follows the active tiles and their occupied bins, plus one chunk of input. Heatmaps
+pickle, so workers can each aggregate part of a stream and the parent `merge` their results.
+"""
+from array import array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from webmercator.batch import PointArray, get_backend
+
+# unsigned 32-bit counts
+COUNT_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+
+class Heatmap(object):
+    """
+    Histograms of points per tile, at one or more zoom levels
+
+    :param zoom_levels: a zoom level, or several, to aggregate at once
+    :param resolution: bins per tile side, a power of two up to 256
+    :param backend: 'numpy' or 'array', see `webmercator.batch.get_backend`
+    """
+
+    def __init__(self, zoom_levels, resolution=256, backend=None):
+        zoom_levels = (zoom_levels,) if isinstance(zoom_levels, int) else tuple(sorted(set(zoom_levels)))
+        if not zoom_levels or any(not 1 <= z <= 23 for z in zoom_levels):
+            raise ValueError('Zoom levels must be within 1..23')
+        if resolution < 1 or resolution > 256 or resolution & (resolution - 1):
+            raise ValueError('Resolution must be a power of two from 1 to 256, not {}'.format(resolution))
+
+        self.__zoom_levels = zoom_levels
+        self.__resolution = resolution
+        self.__shift = 8 - (resolution.bit_length() - 1)
+        self.__dense_after = resolution ** 2 // 32
+        self._backend = get_backend(backend)
+        self.__histograms = {}
+        self.__count = 0
+
+    def __repr__(self):
+        return '<Heatmap of {} points in {} tiles, zoom_levels: {}>'.format(self.count, len(self), self.zoom_levels)
+
+    def __len__(self):
+        return len(self.__histograms)
+
+    def __contains__(self, tile):
+        return tile in self.__histograms
+
+    def __iter__(self):
+        return iter(self.__histograms)
+
+    @property
+    def zoom_levels(self):
+        return self.__zoom_levels
+
+    @property
+    def resolution(self):
+        return self.__resolution
+
+    @property
+    def backend(self):
+        return self._backend.name
+
+    @property
+    def count(self):
+        """ Points added """
+        return self.__count
+
+    def _empty(self):
+        cells = self.__resolution ** 2
+        if self._backend.name == 'numpy':
+            return numpy.zeros(cells, dtype=numpy.uint32)
+        return array(COUNT_TYPECODE, [0]) * cells
+
+    def _dense(self, histogram):
+        """ Dense counts of a stored histogram, sparse ({bin: count}) or already dense """
+        if not isinstance(histogram, dict):
+            return histogram
+
+        dense = self._empty()
+        for cell, count in histogram.items():
+            dense[cell] = count
+        return dense
+
+    def _accumulate(self, tile, bins, counts):
+        """ Add `counts` to `bins` of a tile, keeping it sparse while few of its bins are occupied """
+        histogram = self.__histograms.get(tile)
+        if histogram is None:
+            histogram = self.__histograms[tile] = {}
+
+        if isinstance(histogram, dict):
+            if len(histogram) + len(bins) <= self.__dense_after:
+                for cell, count in zip(bins, counts):
+                    histogram[cell] = histogram.get(cell, 0) + count
+                return
+            histogram = self.__histograms[tile] = self._dense(histogram)
+
+        if self._backend.name == 'numpy':
+            histogram[numpy.asarray(bins, dtype=numpy.int64)] += numpy.asarray(counts, dtype=numpy.uint32)
+        else:
+            for cell, count in zip(bins, counts):
+                histogram[cell] += count
+
+    def add(self, points):
+        """ Count every point of a `PointArray` """
+        if not isinstance(points, PointArray):
+            raise TypeError("Did not provide valid point array type")
+
+        backend, shift, resolution = self._backend, self.__shift, self.__resolution
+        if points.backend != backend.name:
+            points = PointArray(latitude=points.latitude, longitude=points.longitude, backend=backend.name,
+                                precision=points.precision)
+
+        for z in self.__zoom_levels:
+            # clamp like `Point._tile_in_range`, as the east and south map edges land one pixel past the last tile
+            last = 256 * 2 ** z - 1
+            pixel_x = backend.clip(backend.pixel_x(points.longitude, z), 0, last)
+            pixel_y = backend.clip(backend.pixel_y(points.latitude, z), 0, last)
+
+            if backend.name == 'numpy':
+                self._add_numpy(pixel_x, pixel_y, z)
+                continue
+
+            tiles = {}
+            for x, y in zip(pixel_x, pixel_y):
+                bins = tiles.get((x >> 8, y >> 8))
+                if bins is None:
+                    bins = tiles[(x >> 8, y >> 8)] = {}
+                cell = ((y & 255) >> shift) * resolution + ((x & 255) >> shift)
+                bins[cell] = bins.get(cell, 0) + 1
+
+            for (tile_x, tile_y), bins in tiles.items():
+                self._accumulate((tile_x, tile_y, z), list(bins), list(bins.values()))
+
+        self.__count += len(points)
+
+    def _add_numpy(self, pixel_x, pixel_y, z):
+        cells = self.__resolution ** 2
+        bins = ((pixel_y & 255) >> self.__shift) * self.__resolution + ((pixel_x & 255) >> self.__shift)
+        keys = (((pixel_x >> 8) << z) | (pixel_y >> 8)) * cells + bins
+
+        # sorted distinct (tile, bin) keys, so each tile's bins are one contiguous run
+        keys, counts = numpy.unique(keys, return_counts=True)
+        tiles, bins = numpy.divmod(keys, cells)
+        starts = numpy.flatnonzero(numpy.diff(tiles)) + 1
+        for start, stop in zip([0] + starts.tolist(), starts.tolist() + [len(keys)]):
+            tile = int(tiles[start])
+            self._accumulate((tile >> z, tile & ((1 << z) - 1), z), bins[start:stop].tolist(),
+                             counts[start:stop].tolist())
+
+    def add_stream(self, coordinates, chunk_size=65536):
+        """
+        Count (latitude, longitude) pairs from any iterable, `chunk_size` at a time
+
+        :return: number of points added
+        """
+        if chunk_size < 1:
+            raise ValueError('Chunk size must be positive')
+
+        added = 0
+        latitudes, longitudes = [], []
+        for latitude, longitude in coordinates:
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+            if len(latitudes) == chunk_size:
+                self.add(PointArray(latitude=latitudes, longitude=longitudes, backend=self.backend))
+                added += chunk_size
+                latitudes, longitudes = [], []
+
+        if latitudes:
+            self.add(PointArray(latitude=latitudes, longitude=longitudes, backend=self.backend))
+            added += len(latitudes)
+        return added
+
+    def histogram(self, tile_x, tile_y, zoom_level):
+        """ Counts of an active tile, `resolution` rows of `resolution` bins; raises KeyError for other tiles """
+        return self._dense(self.__histograms[(tile_x, tile_y, zoom_level)])
+
+    def pop(self, tile_x, tile_y, zoom_level):
+        """ Counts of an active tile, releasing them """
+        return self._dense(self.__histograms.pop((tile_x, tile_y, zoom_level)))
+
+    def items(self):
+        """ Stream ((tile_x, tile_y, zoom_level), counts) of every active tile """
+        for tile, histogram in self.__histograms.items():
+            yield tile, self._dense(histogram)
+
+    def merge(self, other):
+        """ Add the counts of another `Heatmap` of the same resolution, e.g. from another worker """
+        if not isinstance(other, Heatmap):
+            raise TypeError("Did not provide valid heatmap type")
+        if other.resolution != self.resolution:
+            raise ValueError('Resolutions differ: {} != {}'.format(self.resolution, other.resolution))
+
+        for tile, histogram in other.__histograms.items():
+            if isinstance(histogram, dict):
+                self._accumulate(tile, list(histogram), list(histogram.values()))
+                continue
+
+            mine = self._dense(self.__histograms.get(tile, {}))
+            if self._backend.name == 'numpy':
+                mine += numpy.asarray(histogram, dtype=numpy.uint32)
+            else:
+                for cell, count in enumerate(histogram):
+                    if count:
+                        mine[cell] += int(count)
+            self.__histograms[tile] = mine
+
+        self.__zoom_levels = tuple(sorted(set(self.__zoom_levels) | set(other.zoom_levels)))
+        self.__count += other.count
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
@@ -0,0 +1,326 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+In-memory spatial index of identified points, bucketed by tile.
+
+Each tile at the index zoom level holds parallel arrays of its points' coordinates. Radius queries visit only
+the tiles a `BoundingBox` disc touches; nearest queries walk rings of tiles outward from the query tile until no
+unvisited tile can hold anything closer.
+"""
+from __future__ import division
+
+import heapq
+import math
+from array import array
+
+from webmercator.batch import PointArray
+from webmercator.box import BoundingBox
+from webmercator.point import Point
+from webmercator.shapes import _latitude_of_row_edge
+from webmercator.util import EARTH_RADIUS_MILES
+
+
+class _Bucket(object):
+    """ Points of one tile: ids, plus latitude, longitude (radians) and cos(latitude) as parallel arrays """
+
+    __slots__ = ('ids', 'latitude', 'longitude', 'cos_latitude')
+
+    def __init__(self):
+        self.ids = []
+        self.latitude = array('d')
+        self.longitude = array('d')
+        self.cos_latitude = array('d')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, identifier, latitude, longitude):
+        self.ids.append(identifier)
+        self.latitude.append(latitude)
+        self.longitude.append(longitude)
+        self.cos_latitude.append(math.cos(latitude))
+
+    def set(self, position, latitude, longitude):
+        self.latitude[position] = latitude
+        self.longitude[position] = longitude
+        self.cos_latitude[position] = math.cos(latitude)
+
+    def pop(self, position):
+        """ Remove the point at `position` by moving the last point into its place; returns the moved id or None """
+        last = len(self.ids) - 1
+        moved = None
+        if position != last:
+            moved = self.ids[position] = self.ids[last]
+            self.latitude[position] = self.latitude[last]
+            self.longitude[position] = self.longitude[last]
+            self.cos_latitude[position] = self.cos_latitude[last]
+
+        self.ids.pop()
+        self.latitude.pop()
+        self.longitude.pop()
+        self.cos_latitude.pop()
+        return moved
+
+    def haversines(self, latitude, longitude, cos_latitude):
+        """ Haversine of the angular distance from a point, in radians, to each point of the bucket """
+        sin, lat, lon, cos_lat = math.sin, self.latitude, self.longitude, self.cos_latitude
+        for i in range(len(self.ids)):
+            d_lat, d_lon = sin((lat[i] - latitude) / 2), sin((lon[i] - longitude) / 2)
+            yield self.ids[i], d_lat * d_lat + cos_latitude * cos_lat[i] * d_lon * d_lon
+
+
+def _distance(haversine):
+    """ Miles, from the haversine of an angular distance """
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(max(haversine, 0), 1)))
+
+
+def _haversine(distance):
+    """ Haversine of the angular distance covered by `distance` miles """
+    return math.sin(min(max(distance, 0) / EARTH_RADIUS_MILES, math.pi) / 2) ** 2
+
+
+class TileIndex(object):
+    """
+    Points, each under a hashable id, bucketed by the tile containing them at `zoom_level`.
+
+    Tiles are those of `Point` (`tile_x`/`tile_y`, clamped to the map). Distances are great-circle miles, as for
+    `BoundingBox`. Pick a zoom level where a typical query radius spans a handful of tiles.
+    """
+
+    def __init__(self, zoom_level=14):
+        if not 0 <= zoom_level <= 23:
+            raise ValueError('Zoom level {} is outside 0..23'.format(zoom_level))
+
+        self.__zoom_level = zoom_level
+        self.__buckets = {}
+        self.__where = {}
+
+        # `Point` rounds pixels, so a point may sit in a bucket up to half a pixel from its true tile
+        self._slack = math.pi * EARTH_RADIUS_MILES / (256 * 2 ** zoom_level)
+
+    def __repr__(self):
+        return '<TileIndex of {} points in {} tiles, zoom_level: {}>'.format(len(self), len(self.__buckets),
+                                                                             self.zoom_level)
+
+    def __len__(self):
+        return len(self.__where)
+
+    def __contains__(self, identifier):
+        return identifier in self.__where
+
+    @property
+    def zoom_level(self):
+        return self.__zoom_level
+
+    @property
+    def tiles(self):
+        """ (tile_x, tile_y) of every non-empty bucket """
+        return list(self.__buckets)
+
+    def tile_of(self, identifier):
+        """ (tile_x, tile_y) of the bucket holding `identifier` """
+        return self.__where[identifier][0]
+
+    def location(self, identifier):
+        """ (latitude, longitude) of `identifier` """
+        tile, position = self.__where[identifier]
+        bucket = self.__buckets[tile]
+        return math.degrees(bucket.latitude[position]), math.degrees(bucket.longitude[position])
+
+    def _tile(self, latitude, longitude):
+        return Point(latitude=latitude, longitude=longitude, zoom_level=self.zoom_level)._tile_in_range()
+
+    def _add(self, identifier, tile, latitude, longitude):
+        bucket = self.__buckets.get(tile)
+        if bucket is None:
+            bucket = self.__buckets[tile] = _Bucket()
+
+        self.__where[identifier] = (tile, len(bucket))
+        bucket.append(identifier, math.radians(latitude), math.radians(longitude))
+
+    def load(self, identifiers, latitudes, longitudes, backend=None):
+        """
+        Bulk insert, projecting every point in one `PointArray` pass
+
+        :param identifiers: sequence of new, distinct ids
+        :param latitudes: sequence of latitudes, same length
+        :param longitudes: sequence of longitudes, same length
+        :param backend: `PointArray` backend name, defaults to the fastest available
+        """
+        identifiers = list(identifiers)
+        points = PointArray(latitude=latitudes, longitude=longitudes, zoom_level=self.zoom_level, backend=backend)
+        if len(identifiers) != len(points):
+            raise ValueError("Ids and coordinates differ in length: {} != {}".format(len(identifiers), len(points)))
+
+        if len(set(identifiers)) != len(identifiers) or any(i in self.__where for i in identifiers):
+            raise ValueError('Ids must be distinct and not already indexed')
+
+        tile_x, tile_y = (column.tolist() for column in points._tiles_in_range())
+        latitudes, longitudes = points.latitude.tolist(), points.longitude.tolist()
+        for i, identifier in enumerate(identifiers):
+            self._add(identifier, (tile_x[i], tile_y[i]), latitudes[i], longitudes[i])
+
+    def insert(self, identifier, latitude, longitude):
+        """ Add one point; use `move` for ids already indexed """
+        if identifier in self.__where:
+            raise ValueError('{!r} is already indexed'.format(identifier))
+
+        pt = Point(latitude=latitude, longitude=longitude, zoom_level=self.zoom_level)
+        self._add(identifier, pt._tile_in_range(), pt.latitude, pt.longitude)
+
+    def move(self, identifier, latitude, longitude):
+        """ Update the position of an indexed point, in place when it stays within its tile """
+        tile, position = self.__where[identifier]
+        pt = Point(latitude=latitude, longitude=longitude, zoom_level=self.zoom_level)
+        if pt._tile_in_range() == tile:
+            self.__buckets[tile].set(position, math.radians(pt.latitude), math.radians(pt.longitude))
+        else:
+            self.delete(identifier)
+            self._add(identifier, pt._tile_in_range(), pt.latitude, pt.longitude)
+
+    def delete(self, identifier):
+        """ Remove a point; raises KeyError when it is not indexed """
+        tile, position = self.__where.pop(identifier)
+        bucket = self.__buckets[tile]
+        moved = bucket.pop(position)
+        if moved is not None:
+            self.__where[moved] = (tile, position)
+        if not len(bucket):
+            del self.__buckets[tile]
+
+    def _query_point(self, point):
+        if not isinstance(point, Point):
+            raise TypeError("Did not provide valid point type")
+
+        latitude = math.radians(point.latitude)
+        return latitude, math.radians(point.longitude), math.cos(latitude)
+
+    def _spans(self, point, radius):
+        """ Tile runs of the disc, widened by the bucket slack, from the `BoundingBox` of the query """
+        bb = BoundingBox(point, radius=radius + self._slack, zoom_level=self.zoom_level)
+        return bb.disc_spans()
+
+    def within(self, point, radius):
+        """
+        Every point within `radius` miles of `point`
+
+        :return: list of (id, distance in miles), in no particular order
+        """
+        latitude, longitude, cos_latitude = self._query_point(point)
+        limit = _haversine(radius)
+        buckets = self.__buckets
+
+        spans = list(self._spans(point, radius))
+        if sum(stop - start + 1 for _, start, stop in spans) > len(buckets):
+            # fewer buckets than tiles in range: check each bucket against the runs instead
+            rows = {}
+            for y, start, stop in spans:
+                rows.setdefault(y, []).append((start, stop))
+            candidates = [b for (x, y), b in buckets.items() if any(s <= x <= e for s, e in rows.get(y, ()))]
+        else:
+            candidates = [buckets[(x, y)] for y, start, stop in spans for x in range(start, stop + 1)
+                          if (x, y) in buckets]
+
+        found = []
+        for bucket in candidates:
+            for identifier, haversine in bucket.haversines(latitude, longitude, cos_latitude):
+                if haversine <= limit:
+                    found.append((identifier, _distance(haversine)))
+        return found
+
+    def _ring(self, center_x, center_y, ring):
+        """ Tiles at Chebyshev distance `ring` from the center tile, wrapping columns and clipping rows """
+        tiles = 2 ** self.zoom_level
+        for y in range(max(center_y - ring, 0), min(center_y + ring, tiles - 1) + 1):
+            if ring and abs(y - center_y) != ring:
+                columns = (center_x - ring, center_x + ring)
+            else:
+                columns = range(center_x - ring, center_x + ring + 1)
+            for x in columns:
+                yield x % tiles, y
+
+    def _outside_bound(self, point, center_x, center_y, ring):
+        """ Lower bound, in miles, of the distance from `point` to any point bucketed beyond `ring` """
+        tiles = 2 ** self.zoom_level
+        map_size = 256 * tiles
+        latitude = math.radians(point.latitude)
+
+        bounds = [float('inf')]
+        if center_y - ring > 0:
+            bounds.append(_latitude_of_row_edge((center_y - ring) * 256, map_size) - latitude)
+        if center_y + ring < tiles - 1:
+            bounds.append(latitude - _latitude_of_row_edge((center_y + ring + 1) * 256, map_size))
+        if 2 * ring + 1 < tiles:
+            west = (center_x - ring) * 360 / tiles - 180
+            east = (center_x + ring + 1) * 360 / tiles - 180
+            d_lon = math.radians(min(point.longitude - west, east - point.longitude, 90))
+            bounds.append(math.asin(math.cos(latitude) * math.sin(d_lon)))
+
+        return max(min(bounds) * EARTH_RADIUS_MILES - self._slack, 0)
+
+    def nearest(self, point, k=1):
+        """
+        The `k` indexed points closest to `point`, expanding outward one ring of tiles at a time
+
+        Falls back to checking every remaining bucket once a ring would hold more tiles than there are buckets.
+
+        :return: list of (id, distance in miles), nearest first
+        """
+        latitude, longitude, cos_latitude = self._query_point(point)
+        if k < 1:
+            return []
+
+        buckets = self.__buckets
+        tiles = 2 ** self.zoom_level
+        center_x, center_y = self._tile(point.latitude, point.longitude)
+
+        heap = []  # max-heap on haversine, through negation; the counter breaks ties between unorderable ids
+        counter = [0]
+
+        def visit(bucket):
+            for identifier, haversine in bucket.haversines(latitude, longitude, cos_latitude):
+                counter[0] += 1
+                if len(heap) < k:
+                    heapq.heappush(heap, (-haversine, counter[0], identifier))
+                elif haversine < -heap[0][0]:
+                    heapq.heapreplace(heap, (-haversine, counter[0], identifier))
+
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 >= len(buckets):
+                for (x, y), bucket in buckets.items():
+                    d_x = min((x - center_x) % tiles, (center_x - x) % tiles)
+                    if d_x >= ring or abs(y - center_y) >= ring:
+                        visit(bucket)
+                break
+
+            for tile in self._ring(center_x, center_y, ring):
+                bucket = buckets.get(tile)
+                if bucket is not None:
+                    visit(bucket)
+
+            if len(heap) == k and _distance(-heap[0][0]) <= self._outside_bound(point, center_x, center_y, ring):
+                break
+            ring += 1
+
+        return [(identifier, _distance(-negated)) for negated, _, identifier in sorted(heap, reverse=True)]
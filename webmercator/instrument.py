@@ -0,0 +1,275 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Opt-in timing of conversion and coverage hot paths.
+
+`enable` wraps the operations in `OPERATIONS` (`Point` conversions, `BoundingBox` vertices and extents, `Grid`
+iteration, tile coverage, batch conversions, cluster queries, expiry) and reports each call to every sink as
+`sink(operation, seconds, items)`. Sinks are plain callables: a `Stats` object aggregates in process, a `LogSink`
+logs each event, and any other function forwards events elsewhere, e.g. to a metrics client.
+
+`items` counts the tiles an operation enumerated; for batch conversions it is the number of points or records.
+Operations that return iterators are reported once, when the iterator is exhausted or closed, with the time spent
+producing items, not the time the caller spent between them. Timings are inclusive: `point.tile_x` also reports
+the `point.pixel_x` it reads.
+
+Nothing is wrapped until `enable` is called, and `disable` restores the original functions, so instrumentation
+costs nothing when it is off. Functions are wrapped where they are defined (class attributes, module attributes):
+names bound with `from webmercator.tiles import coverage` before `enable` stay unwrapped.
+"""
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from webmercator import buffers, expiry, shapes, tiles
+from webmercator.batch import BoundingBoxArray, PointArray
+from webmercator.box import BoundingBox
+from webmercator.cluster import ClusterIndex
+from webmercator.grid import Grid
+from webmercator.point import Point
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+def _one(item):
+    return 1
+
+
+def _span(item):
+    return item[-1] - item[-2] + 1
+
+
+def _length(value):
+    return len(value)
+
+
+# operation: (owner, attribute, kind, item count of a result, of the new object, or of each item of an iterator)
+_TARGETS = (
+    ('point.init', Point, '__init__', 'init', None),
+    ('point.meter_x', Point, 'meter_x', 'property', None),
+    ('point.meter_y', Point, 'meter_y', 'property', None),
+    ('point.pixel_x', Point, 'pixel_x', 'property', None),
+    ('point.pixel_y', Point, 'pixel_y', 'property', None),
+    ('point.tile_x', Point, 'tile_x', 'property', None),
+    ('point.tile_y', Point, 'tile_y', 'property', None),
+    ('point.quadkey', Point, 'quadkey', 'property', None),
+    ('box.vertices', BoundingBox, '_bound_vertices', 'call', None),
+    ('box.extents', BoundingBox, '_compute_extents', 'call', None),
+    ('box.tile_grid', BoundingBox, 'tile_grid', 'property', _length),
+    ('box.tile_grids_at', BoundingBox, 'tile_grids_at', 'call', lambda grids: sum(len(g) for g in grids)),
+    ('box.tile_set', BoundingBox, 'tile_set', 'call', _length),
+    ('box.coverage', BoundingBox, 'coverage', 'iterator', _one),
+    ('box.disc_spans', BoundingBox, 'disc_spans', 'iterator', _span),
+    ('box.metatiles', BoundingBox, 'metatiles', 'iterator', lambda meta: len(meta[2])),
+    ('grid.iter', Grid, '__iter__', 'iterator', _one),
+    ('grid.walk', Grid, 'walk', 'iterator', _one),
+    ('grid.chunks', Grid, 'chunks', 'iterator', lambda chunk: len(chunk[0])),
+    ('grid.quadkeys', Grid, 'quadkeys', 'iterator', _one),
+    ('tiles.coverage', tiles, 'coverage', 'iterator', _one),
+    ('shapes.disc_spans', shapes, 'disc_spans', 'iterator', _span),
+    ('shapes.polygon_spans', shapes, 'polygon_spans', 'iterator', _span),
+    ('shapes.polyline_spans', shapes, 'polyline_spans', 'iterator', _span),
+    ('batch.points', PointArray, '__init__', 'init', _length),
+    ('batch.tile_x', PointArray, 'tile_x', 'property', _length),
+    ('batch.tile_y', PointArray, 'tile_y', 'property', _length),
+    ('batch.pixel_x', PointArray, 'pixel_x', 'property', _length),
+    ('batch.pixel_y', PointArray, 'pixel_y', 'property', _length),
+    ('batch.boxes', BoundingBoxArray, '__init__', 'init', _length),
+    ('buffers.convert_into', buffers, 'convert_into', 'call', int),
+    ('cluster.clusters', ClusterIndex, 'clusters', 'call', _length),
+    ('cluster.tile_clusters', ClusterIndex, 'tile_clusters', 'call', _length),
+    ('expiry.changed_tiles', expiry, 'changed_tiles', 'call', _length),
+    ('expiry.expiry_spans', expiry, 'expiry_spans', 'iterator', _span),
+)
+
+OPERATIONS = tuple(target[0] for target in _TARGETS)
+
+_lock = threading.Lock()
+_sinks = []
+_originals = []
+
+
+def _emit(operation, seconds, items):
+    for sink in _sinks:
+        sink(operation, seconds, items)
+
+
+def _timed_call(operation, function, count):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = _clock()
+        result = function(*args, **kwargs)
+        _emit(operation, _clock() - start, count(result) if count else 0)
+        return result
+    return wrapper
+
+
+def _timed_init(operation, function, count):
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        start = _clock()
+        function(self, *args, **kwargs)
+        _emit(operation, _clock() - start, count(self) if count else 0)
+    return wrapper
+
+
+def _timed_items(operation, iterator, seconds, count):
+    items = 0
+    try:
+        while True:
+            start = _clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                seconds += _clock() - start
+                break
+            seconds += _clock() - start
+            items += count(item)
+            yield item
+    finally:
+        _emit(operation, seconds, items)
+
+
+def _timed_iterator(operation, function, count):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # called eagerly, so arguments are still checked when the operation is called rather than first iterated
+        start = _clock()
+        iterator = iter(function(*args, **kwargs))
+        return _timed_items(operation, iterator, _clock() - start, count)
+    return wrapper
+
+
+def _wrap(operation, original, kind, count):
+    if kind == 'property':
+        return property(_timed_call(operation, original.fget, count), original.fset, original.fdel, original.__doc__)
+    if kind == 'iterator':
+        return _timed_iterator(operation, original, count)
+    if kind == 'init':
+        return _timed_init(operation, original, count)
+    return _timed_call(operation, original, count)
+
+
+def _selected(operation, operations):
+    return operations is None or any(operation == name or operation.startswith(name + '.') for name in operations)
+
+
+def enable(*sinks, **kwargs):
+    """
+    Start reporting operations to `sinks`, replacing any sinks given before
+
+    :param sinks: callables taking (operation, seconds, items), e.g. `Stats` or `LogSink` instances
+    :param operations: names from `OPERATIONS`, or prefixes such as 'box', to wrap; defaults to all
+    """
+    operations = kwargs.pop('operations', None)
+    if kwargs:
+        raise TypeError('Unexpected keyword arguments: {}'.format(', '.join(sorted(kwargs))))
+    if not sinks:
+        raise ValueError('Provide at least one sink')
+    if any(not callable(sink) for sink in sinks):
+        raise TypeError('Sinks must be callable')
+    if operations is not None:
+        operations = [operations] if isinstance(operations, str) else list(operations)
+        unknown = [name for name in operations if not any(_selected(op, [name]) for op in OPERATIONS)]
+        if unknown:
+            raise ValueError('Unknown operations: {}'.format(', '.join(unknown)))
+
+    with _lock:
+        _restore()
+        _sinks[:] = sinks
+        for operation, owner, attribute, kind, count in _TARGETS:
+            if _selected(operation, operations):
+                original = vars(owner)[attribute]
+                _originals.append((owner, attribute, original))
+                setattr(owner, attribute, _wrap(operation, original, kind, count))
+
+
+def _restore():
+    while _originals:
+        owner, attribute, original = _originals.pop()
+        setattr(owner, attribute, original)
+
+
+def disable():
+    """ Stop reporting, restoring every wrapped function """
+    with _lock:
+        _restore()
+        del _sinks[:]
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+@contextmanager
+def recording(operations=None):
+    """ Collect into a new `Stats` for the duration of a `with` block, replacing any enabled sinks """
+    stats = Stats()
+    enable(stats, operations=operations)
+    try:
+        yield stats
+    finally:
+        disable()
+
+
+class Stats(object):
+    """ Sink keeping calls, seconds and items per operation; safe to share between threads """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def __repr__(self):
+        return '<Stats of {} operations>'.format(len(self._totals))
+
+    def __call__(self, operation, seconds, items):
+        with self._lock:
+            totals = self._totals.get(operation)
+            if totals is None:
+                totals = self._totals[operation] = [0, 0.0, 0]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += items
+
+    def snapshot(self):
+        """ {operation: {'calls': int, 'seconds': float, 'items': int}}, for export """
+        with self._lock:
+            return dict((operation, {'calls': calls, 'seconds': seconds, 'items': items})
+                        for operation, (calls, seconds, items) in self._totals.items())
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+
+class LogSink(object):
+    """ Sink logging one record per event """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.level = level
+
+    def __call__(self, operation, seconds, items):
+        self.logger.log(self.level, '%s: %d items in %.6fs', operation, items, seconds)
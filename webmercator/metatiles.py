@@ -0,0 +1,77 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Metatiles: square blocks of `size` x `size` tiles, aligned to the tile origin, rendered and stored as one unit.
+
+Metatile (meta_x, meta_y) at a zoom level holds tiles `meta_x * size` to `meta_x * size + size - 1` across, and the
+same down. Everything is computed from range bounds, so covering a `Grid` never groups tiles one by one.
+"""
+from webmercator.grid import Grid
+
+
+def _check_size(size):
+    if size < 1:
+        raise ValueError('Metatile size must be positive')
+
+
+def metatile(tile_x, tile_y, size=8):
+    """ (meta_x, meta_y) of the metatile holding a tile """
+    _check_size(size)
+    return tile_x // size, tile_y // size
+
+
+def metatile_grid(meta_x, meta_y, size=8, zoom_level=None):
+    """ Grid of the tiles of one metatile, clipped to the map when the zoom level is known """
+    _check_size(size)
+    min_x, min_y = meta_x * size, meta_y * size
+    max_x, max_y = min_x + size - 1, min_y + size - 1
+    if zoom_level is not None:
+        last = 2 ** zoom_level - 1
+        max_x, max_y = min(max_x, last), min(max_y, last)
+
+    return Grid(vertex=(min_x, min_y), width=max_x - min_x, height=max_y - min_y, zoom_level=zoom_level)
+
+
+def metatile_range(grid, size=8):
+    """ Grid of the distinct metatiles covering a tile `Grid`, at the same zoom level """
+    _check_size(size)
+    if not len(grid):
+        return Grid(vertex=grid.vertex, width=-1, height=-1, zoom_level=grid.zoom_level)
+
+    min_x, min_y = metatile(grid.min_x, grid.min_y, size)
+    max_x, max_y = metatile(grid.max_x, grid.max_y, size)
+    return Grid(vertex=(min_x, min_y), width=max_x - min_x, height=max_y - min_y, zoom_level=grid.zoom_level)
+
+
+def metatiles(grid, size=8, order='row'):
+    """
+    Stream the metatiles covering a tile `Grid`, each once, with the part of the grid inside it
+
+    :param order: order of the metatiles, see `Grid.walk`
+    :return: generator of (meta_x, meta_y, Grid of the covered tiles within that metatile)
+    """
+    for meta_x, meta_y in metatile_range(grid, size).walk(order):
+        min_x, min_y = max(meta_x * size, grid.min_x), max(meta_y * size, grid.min_y)
+        max_x, max_y = min(meta_x * size + size - 1, grid.max_x), min(meta_y * size + size - 1, grid.max_y)
+        yield meta_x, meta_y, Grid(vertex=(min_x, min_y), width=max_x - min_x, height=max_y - min_y,
+                                   zoom_level=grid.zoom_level)
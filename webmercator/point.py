@@ -23,20 +23,37 @@
 from __future__ import division
 import math
 
-from webmercator.util import EARTH_CIRCUMFERENCE_METERS, EARTH_RADIUS_METERS, MERCATOR_MAX_LATITUDE
+from webmercator import quadkey
+from webmercator.precision import EXACT, get_precision
+from webmercator.util import EARTH_CIRCUMFERENCE_METERS, EARTH_RADIUS_METERS
 
 
 class Point(object):
+    """
+    Geographic point and its Web Mercator meter, pixel and tile coordinates.
+
+    Derived coordinates are computed on first read and cached until `latitude`, `longitude` or `zoom_level` change.
+    The `precision` keyword picks how coordinates are rounded and wrapped, see `webmercator.precision`.
+    """
+
+    __slots__ = ('__latitude', '__longitude', '__zoom_level', '__meter_x', '__meter_y', '__pixel_x', '__pixel_y',
+                 '__precision')
+
+    # Decimal digits of the 'exact' precision policy, kept for compatibility only; `webmercator.precision.EXACT`
+    # does the rounding, and changing these does not affect it.
 
     # nanometer (nm)
-    metric_exp = 9
+    metric_exp = EXACT.metric_digits
 
     # qualitative scale that can be identified: specialized surveying (e.g. tectonic plate mapping)
-    decimal_degree_exp = 8
+    decimal_degree_exp = EXACT.degree_digits
 
     def __init__(self, **kwargs):
+        self.__precision = get_precision(kwargs.get('precision'))
         self.__latitude = None
         self.__longitude = None
+        self.__meter_x = self.__meter_y = None
+        self.__pixel_x = self.__pixel_y = None
         if 'latitude' in kwargs and 'longitude' in kwargs:
             self.latitude = kwargs['latitude']
             self.longitude = kwargs['longitude']
@@ -59,9 +76,17 @@ class Point(object):
             self.tile_x = kwargs['tile_x']
             self.tile_y = kwargs['tile_y']
 
+        if 'quadkey' in kwargs:
+            self.quadkey = kwargs['quadkey']
+
     def __repr__(self):
         return '<Point at ({}, {})>'.format(self.longitude, self.latitude)
 
+    @property
+    def precision(self):
+        """ `Precision` policy applied to coordinates set on this point """
+        return self.__precision
+
     @property
     def latitude(self):
         return self.__latitude
@@ -69,8 +94,8 @@ class Point(object):
     @latitude.setter
     def latitude(self, value):
         """ Set latitude, even given out of bounds value """
-        self.__latitude = round(min(max(value, -1 * MERCATOR_MAX_LATITUDE), MERCATOR_MAX_LATITUDE),
-                                self.decimal_degree_exp)
+        self.__latitude = self.__precision.latitude(value)
+        self.__meter_y = self.__pixel_y = None
 
     @property
     def longitude(self):
@@ -79,20 +104,28 @@ class Point(object):
     @longitude.setter
     def longitude(self, value):
         """ Set longitude, even given out of bounds value """
-        while value < -180:
-            value += 360
+        self.__longitude = self.__precision.longitude(value)
+        self.__meter_x = self.__pixel_x = None
 
-        while value > 180:
-            value -= 360
+    @property
+    def latitude_e7(self):
+        """ Latitude in integer 1e-7 degree steps """
+        if self.__latitude is not None:
+            return int(round(self.__latitude * 10 ** 7))
 
-        self.__longitude = round(value, self.decimal_degree_exp)
+    @property
+    def longitude_e7(self):
+        """ Longitude in integer 1e-7 degree steps """
+        if self.__longitude is not None:
+            return int(round(self.__longitude * 10 ** 7))
 
     @property
     def meter_x(self):
-        """ Rounds to nearest nm """
-        if self.longitude is not None:
-            meter_x = (self.longitude / 360) * EARTH_CIRCUMFERENCE_METERS
-            return round(meter_x, self.metric_exp)
+        """ Rounds to nearest nm, or as the precision policy says """
+        if self.__meter_x is None and self.__longitude is not None:
+            meter_x = (self.__longitude / 360) * EARTH_CIRCUMFERENCE_METERS
+            self.__meter_x = self.__precision.meters(meter_x)
+        return self.__meter_x
 
     @meter_x.setter
     def meter_x(self, value):
@@ -101,10 +134,11 @@ class Point(object):
 
     @property
     def meter_y(self):
-        """ Rounds to nearest nm """
-        if self.latitude is not None:
-            meter_y = (math.log(math.tan(math.pi / 4 + ((self.latitude * math.pi) / 180) / 2))) * EARTH_RADIUS_METERS
-            return round(meter_y, self.metric_exp)
+        """ Rounds to nearest nm, or as the precision policy says """
+        if self.__meter_y is None and self.__latitude is not None:
+            meter_y = (math.log(math.tan(math.pi / 4 + ((self.__latitude * math.pi) / 180) / 2))) * EARTH_RADIUS_METERS
+            self.__meter_y = self.__precision.meters(meter_y)
+        return self.__meter_y
 
     @meter_y.setter
     def meter_y(self, value):
@@ -122,11 +156,13 @@ class Point(object):
     @zoom_level.setter
     def zoom_level(self, value):
         self.__zoom_level = min(max(value, 1), 23)
+        self.__pixel_x = self.__pixel_y = None
 
     @property
     def pixel_x(self):
-        if self.longitude is not None:
-            return round(((self.longitude + 180) / 360) * 256 * 2 ** self.zoom_level)
+        if self.__pixel_x is None and self.__longitude is not None:
+            self.__pixel_x = round(((self.__longitude + 180) / 360) * 256 * 2 ** self.__zoom_level)
+        return self.__pixel_x
 
     @pixel_x.setter
     def pixel_x(self, value):
@@ -135,9 +171,10 @@ class Point(object):
 
     @property
     def pixel_y(self):
-        if self.latitude is not None:
-            sin_lat = math.sin(math.radians(self.latitude))
-            return round((0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * self.map_size)
+        if self.__pixel_y is None and self.__latitude is not None:
+            sin_lat = math.sin(math.radians(self.__latitude))
+            self.__pixel_y = round((0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * self.map_size)
+        return self.__pixel_y
 
     @pixel_y.setter
     def pixel_y(self, value):
@@ -145,8 +182,9 @@ class Point(object):
 
     @property
     def tile_x(self):
-        if self.pixel_x is not None:
-            return int(self.pixel_x / 256)
+        pixel_x = self.pixel_x
+        if pixel_x is not None:
+            return int(pixel_x / 256)
 
     @tile_x.setter
     def tile_x(self, value):
@@ -154,8 +192,9 @@ class Point(object):
 
     @property
     def tile_y(self):
-        if self.pixel_y is not None:
-            return int(self.pixel_y / 256)
+        pixel_y = self.pixel_y
+        if pixel_y is not None:
+            return int(pixel_y / 256)
 
     @tile_y.setter
     def tile_y(self, value):
@@ -170,3 +209,38 @@ class Point(object):
     def meters_per_tile(self):
         """Return meters per tile (Web Mercator meters, not real world meters)"""
         return self.meters_per_pixel * 256
+
+    def _tile_in_range(self):
+        """ Tile x/y clamped to the tile range, as the east and south map edges land one past the last tile """
+        last = 2 ** self.zoom_level - 1
+        return min(max(self.tile_x, 0), last), min(max(self.tile_y, 0), last)
+
+    @property
+    def quadkey(self):
+        """ Bing Maps quadkey of the tile containing this point """
+        if self.longitude is not None and self.latitude is not None:
+            tile_x, tile_y = self._tile_in_range()
+            return quadkey.to_quadkey(tile_x, tile_y, self.zoom_level)
+
+    @quadkey.setter
+    def quadkey(self, value):
+        """ Move to the upper-left corner of a tile; the zoom level becomes the quadkey length """
+        tile_x, tile_y, zoom_level = quadkey.from_quadkey(value)
+        if zoom_level < 1:
+            raise ValueError('Quadkey must have at least one digit')
+
+        self.zoom_level = zoom_level
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+
+    @property
+    def tile_key(self):
+        """ Packed 64-bit key (zoom level and Morton code) of the tile containing this point """
+        if self.longitude is not None and self.latitude is not None:
+            tile_x, tile_y = self._tile_in_range()
+            return quadkey.pack(tile_x, tile_y, self.zoom_level)
+
+    def distance_to(self, other, units='miles'):
+        """ Great-circle distance to another `Point`, see `webmercator.distance` """
+        from webmercator.distance import distance
+        return distance(self, other, units)
@@ -0,0 +1,178 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Bing Maps quadkeys and packed integer tile keys.
+
+A quadkey digit holds one bit of `tile_y` and one bit of `tile_x`, so the whole quadkey is the Morton code
+(bit interleave) of the tile written in base 4. A packed tile key stores the zoom level in bits 58-62 above
+the Morton code, which makes it a positive 64-bit integer that sorts by zoom level, then Z-order.
+"""
+
+PACKED_ZOOM_SHIFT = 58
+PACKED_MORTON_MASK = (1 << PACKED_ZOOM_SHIFT) - 1
+
+# masks to spread the low 32 bits of a value onto the even bits of a 64-bit value, widest step first
+SPREAD_STEPS = (
+    (16, 0x0000FFFF0000FFFF),
+    (8, 0x00FF00FF00FF00FF),
+    (4, 0x0F0F0F0F0F0F0F0F),
+    (2, 0x3333333333333333),
+    (1, 0x5555555555555555),
+)
+
+# the reverse walk, gathering the even bits back into the low 32 bits
+COMPACT_STEPS = (
+    (1, 0x3333333333333333),
+    (2, 0x0F0F0F0F0F0F0F0F),
+    (4, 0x00FF00FF00FF00FF),
+    (8, 0x0000FFFF0000FFFF),
+    (16, 0x00000000FFFFFFFF),
+)
+
+_HEX_TO_QUAD = dict((c, '{}{}'.format(i // 4, i % 4)) for i, c in enumerate('0123456789abcdef'))
+
+
+def spread_bits(value):
+    """ Move bit `i` of a 32-bit value to bit `2i` """
+    value &= 0xFFFFFFFF
+    for shift, mask in SPREAD_STEPS:
+        value = (value | (value << shift)) & mask
+    return value
+
+
+def compact_bits(value):
+    """ Inverse of `spread_bits`: move bit `2i` to bit `i` """
+    value &= 0x5555555555555555
+    for shift, mask in COMPACT_STEPS:
+        value = (value | (value >> shift)) & mask
+    return value
+
+
+def interleave(tile_x, tile_y):
+    """ Morton code of a tile; `tile_x` on the even bits, `tile_y` on the odd bits """
+    return spread_bits(tile_x) | (spread_bits(tile_y) << 1)
+
+
+def deinterleave(code):
+    """ (tile_x, tile_y) of a Morton code """
+    return compact_bits(code), compact_bits(code >> 1)
+
+
+def _check_tile(tile_x, tile_y, zoom_level):
+    if not 0 <= zoom_level <= 23:
+        raise ValueError('Zoom level {} is outside 0..23'.format(zoom_level))
+
+    size = 1 << zoom_level
+    if not (0 <= tile_x < size and 0 <= tile_y < size):
+        raise ValueError('Tile ({}, {}) is outside zoom level {}'.format(tile_x, tile_y, zoom_level))
+
+
+def morton_to_quadkey(code, zoom_level):
+    """ Quadkey string of a Morton code; each hex digit is two base 4 digits """
+    if not zoom_level:
+        return ''
+    return ''.join(_HEX_TO_QUAD[c] for c in format(code, 'x')).rjust(zoom_level, '0')[-zoom_level:]
+
+
+def quadkey_to_morton(quadkey):
+    """ (Morton code, zoom level) of a quadkey string """
+    if quadkey.lstrip('0123'):
+        raise ValueError('Invalid quadkey `{}`'.format(quadkey))
+    return (int(quadkey, 4) if quadkey else 0), len(quadkey)
+
+
+def to_quadkey(tile_x, tile_y, zoom_level):
+    """
+    Quadkey of a tile
+
+    :return: string of `zoom_level` base 4 digits
+    """
+    _check_tile(tile_x, tile_y, zoom_level)
+    return morton_to_quadkey(interleave(tile_x, tile_y), zoom_level)
+
+
+def from_quadkey(quadkey):
+    """
+    Tile of a quadkey
+
+    :return: (tile_x, tile_y, zoom_level)
+    """
+    code, zoom_level = quadkey_to_morton(quadkey)
+    if zoom_level > 23:
+        raise ValueError('Zoom level {} is outside 0..23'.format(zoom_level))
+
+    tile_x, tile_y = deinterleave(code)
+    return tile_x, tile_y, zoom_level
+
+
+def pack(tile_x, tile_y, zoom_level):
+    """ Packed 64-bit tile key: zoom level in the top bits, Morton code below """
+    _check_tile(tile_x, tile_y, zoom_level)
+    return (zoom_level << PACKED_ZOOM_SHIFT) | interleave(tile_x, tile_y)
+
+
+def unpack(key):
+    """
+    Tile of a packed tile key
+
+    :return: (tile_x, tile_y, zoom_level)
+    """
+    tile_x, tile_y = deinterleave(key & PACKED_MORTON_MASK)
+    return tile_x, tile_y, key >> PACKED_ZOOM_SHIFT
+
+
+def _backend(name):
+    # imported here, as the batch module builds on `Point`, which uses this module
+    from webmercator.batch import get_backend
+    return get_backend(name)
+
+
+def pack_array(tile_x, tile_y, zoom_level, backend=None):
+    """ Packed tile keys for columns of tiles; `zoom_level` may be a scalar or a column """
+    backend = _backend(backend)
+    return backend.pack(backend.interleave(tile_x, tile_y), zoom_level)
+
+
+def unpack_array(keys, backend=None):
+    """ (tile_x, tile_y, zoom_level) columns of packed tile keys """
+    backend = _backend(backend)
+    codes, zoom_levels = backend.unpack(keys)
+    tile_x, tile_y = backend.deinterleave(codes)
+    return tile_x, tile_y, zoom_levels
+
+
+def quadkeys(tile_x, tile_y, zoom_level, backend=None):
+    """ List of quadkeys for columns of tiles at one zoom level """
+    for x, y in ((min(tile_x), min(tile_y)), (max(tile_x), max(tile_y))) if len(tile_x) else ():
+        _check_tile(x, y, zoom_level)
+
+    codes = _backend(backend).interleave(tile_x, tile_y)
+    return [morton_to_quadkey(int(code), zoom_level) for code in codes]
+
+
+def from_quadkeys(keys, backend=None):
+    """ (tile_x, tile_y, zoom_level) columns of a sequence of quadkeys """
+    backend = _backend(backend)
+    codes, zoom_levels = zip(*[quadkey_to_morton(k) for k in keys]) if len(keys) else ((), ())
+    tile_x, tile_y = backend.deinterleave(backend.ints(codes))
+    return tile_x, tile_y, backend.ints(zoom_levels)
@@ -0,0 +1,287 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Tile coverage of polylines and polygons by scanline rasterization.
+
+Vertices are projected with `Point` pixel math, then edges are walked tile by tile and polygon interiors are
+filled row by row. Work and memory grow with the perimeter, plus the tiles written out; the bounding rectangle
+is never enumerated. Coverage is computed in Web Mercator space, so shapes should not cross the antimeridian.
+
+Results are runs of `(tile_y, min_tile_x, max_tile_x)`, inclusive and sorted by row then column, or the
+individual `(tile_x, tile_y)` tiles of those runs.
+"""
+from __future__ import division
+
+import math
+
+from webmercator.point import Point
+from webmercator.util import EARTH_RADIUS_MILES, MERCATOR_MAX_LATITUDE
+
+
+def _project(points, zoom_level):
+    """ Fractional tile coordinates of each `Point` at `zoom_level` """
+    projected = []
+    for p in points:
+        if not isinstance(p, Point):
+            raise TypeError("Did not provide valid point type")
+
+        p = Point(latitude=p.latitude, longitude=p.longitude, zoom_level=zoom_level, precision=p.precision)
+        projected.append((p.pixel_x / 256, p.pixel_y / 256))
+    return projected
+
+
+def _edge_tiles(x0, y0, x1, y1):
+    """ Every tile a segment passes through, walking one tile boundary at a time """
+    tx, ty = int(math.floor(x0)), int(math.floor(y0))
+    end_x, end_y = int(math.floor(x1)), int(math.floor(y1))
+    dx, dy = x1 - x0, y1 - y0
+
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    t_delta_x = abs(1 / dx) if dx else float('inf')
+    t_delta_y = abs(1 / dy) if dy else float('inf')
+    t_max_x = ((tx + 1 - x0) if dx > 0 else (x0 - tx)) * t_delta_x if dx else float('inf')
+    t_max_y = ((ty + 1 - y0) if dy > 0 else (y0 - ty)) * t_delta_y if dy else float('inf')
+
+    yield tx, ty
+    # a fixed step count, and never stepping past the end column or row, keeps rounding error from looping forever
+    for _ in range(abs(end_x - tx) + abs(end_y - ty)):
+        if ty == end_y or (tx != end_x and t_max_x < t_max_y):
+            tx += step_x
+            t_max_x += t_delta_x
+        else:
+            ty += step_y
+            t_max_y += t_delta_y
+        yield tx, ty
+
+
+def _boundary(paths):
+    """ Row -> set of tile columns touched by the segments of `paths` """
+    rows = {}
+    for path in paths:
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            for x, y in _edge_tiles(x0, y0, x1, y1):
+                rows.setdefault(y, set()).add(x)
+    return rows
+
+
+def _runs(columns):
+    """ Sorted inclusive runs of a set of columns """
+    runs = []
+    for x in sorted(columns):
+        if runs and x == runs[-1][1] + 1:
+            runs[-1][1] = x
+        else:
+            runs.append([x, x])
+    return runs
+
+
+def _merge(runs):
+    merged = []
+    for start, stop in sorted(runs):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], stop)
+        else:
+            merged.append([start, stop])
+    return merged
+
+
+def _interior(rings, min_row, max_row):
+    """ Row -> runs of tiles whose centers lie inside `rings` (even-odd rule), using an active edge list """
+    edges = []
+    for ring in rings:
+        for (x0, y0), (x1, y1) in zip(ring, ring[1:]):
+            if y0 != y1:
+                edges.append((min(y0, y1), max(y0, y1), x0, y0, (x1 - x0) / (y1 - y0)))
+    edges.sort()
+
+    rows = {}
+    active, pending = [], 0
+    for row in range(min_row, max_row + 1):
+        center = row + 0.5
+        while pending < len(edges) and edges[pending][0] <= center:
+            active.append(edges[pending])
+            pending += 1
+        active = [e for e in active if e[1] > center]
+
+        crossings = sorted(x0 + (center - y0) * slope for _, _, x0, y0, slope in active)
+        runs = []
+        for left, right in zip(crossings[::2], crossings[1::2]):
+            start, stop = int(math.ceil(left - 0.5)), int(math.floor(right - 0.5))
+            if start <= stop:
+                runs.append([start, stop])
+        if runs:
+            rows[row] = runs
+    return rows
+
+
+def _clip(runs_by_row, zoom_level):
+    last = 2 ** zoom_level - 1
+    for y in sorted(runs_by_row):
+        if not 0 <= y <= last:
+            continue
+        for start, stop in runs_by_row[y]:
+            start, stop = max(start, 0), min(stop, last)
+            if start <= stop:
+                yield y, start, stop
+
+
+def _closed(ring):
+    return ring if ring[0] == ring[-1] else ring + ring[:1]
+
+
+def polyline_spans(points, zoom_level):
+    """
+    Runs of tiles crossed by a polyline
+
+    :param points: sequence of `Point` vertices
+    :param zoom_level: zoom level of the tiles
+    :return: generator of (tile_y, min_tile_x, max_tile_x), inclusive
+    """
+    path = _project(points, zoom_level)
+    if len(path) == 1:
+        path = path * 2
+
+    boundary = _boundary([path]) if path else {}
+    return _clip(dict((y, _runs(xs)) for y, xs in boundary.items()), zoom_level)
+
+
+def polygon_spans(exterior, zoom_level, holes=()):
+    """
+    Runs of tiles intersecting a polygon
+
+    A tile is covered when a ring passes through it or its center lies inside the polygon, so every tile that
+    intersects the polygon is returned, and tiles wholly inside a hole are not.
+
+    :param exterior: sequence of `Point` vertices; the ring is closed implicitly
+    :param zoom_level: zoom level of the tiles
+    :param holes: sequences of `Point` vertices, one per hole
+    :return: generator of (tile_y, min_tile_x, max_tile_x), inclusive
+    """
+    rings = [_closed(_project(ring, zoom_level)) for ring in [exterior] + list(holes) if len(ring)]
+    if not rings:
+        return iter(())
+
+    boundary = _boundary(rings)
+    interior = _interior(rings, min(boundary), max(boundary))
+
+    rows = {}
+    for y, xs in boundary.items():
+        rows[y] = _merge(_runs(xs) + interior.get(y, []))
+    return _clip(rows, zoom_level)
+
+
+def _latitude_of_row_edge(pixel_y, map_size):
+    """ Latitude, in radians, of a pixel row edge (the `Point.pixel_y` setter, without rounding) """
+    return math.radians(90 - 360 * math.atan(math.exp(-1 * (0.5 - pixel_y / map_size) * 2 * math.pi)) / math.pi)
+
+
+def _row_of_latitude(latitude, tiles):
+    """ Tile row of a latitude, in radians (the `Point.pixel_y` getter, without rounding) """
+    latitude = min(max(math.degrees(latitude), -1 * MERCATOR_MAX_LATITUDE), MERCATOR_MAX_LATITUDE)
+    sin_lat = math.sin(math.radians(latitude))
+    row = int(math.floor((0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * tiles))
+    return min(max(row, 0), tiles - 1)
+
+
+def disc_spans(center, radius, zoom_level):
+    """
+    Runs of tiles intersecting the great-circle disc of `radius` miles around `center`
+
+    Each row takes the widest longitude span of the disc within that row's latitude band, found in closed form.
+    The disc reaches slightly past the four compass points `BoundingBox` uses at high latitudes, so a run may end
+    one tile outside `BoundingBox.tile_grid`. Discs crossing the antimeridian give two runs in the rows concerned.
+
+    :param center: `Point` at the center of the disc
+    :param radius: distance in miles, as for `BoundingBox`
+    :param zoom_level: zoom level of the tiles
+    :return: generator of (tile_y, min_tile_x, max_tile_x), inclusive
+    """
+    if not isinstance(center, Point):
+        raise TypeError("Did not provide valid point type")
+
+    tiles = 2 ** zoom_level
+    map_size = 256 * tiles
+    delta = max(radius, 0) / EARTH_RADIUS_MILES
+    latitude, longitude = math.radians(center.latitude), center.longitude
+
+    north, south = min(latitude + delta, math.pi / 2), max(latitude - delta, -math.pi / 2)
+
+    # latitude where the disc is widest; a disc holding a pole is widest at that pole
+    if math.cos(delta) > abs(math.sin(latitude)):
+        widest = math.asin(math.sin(latitude) / math.cos(delta))
+    else:
+        widest = math.copysign(math.pi / 2, latitude)
+
+    for row in range(_row_of_latitude(north, tiles), _row_of_latitude(south, tiles) + 1):
+        top = math.pi / 2 if row == 0 else _latitude_of_row_edge(row * 256, map_size)
+        bottom = -math.pi / 2 if row == tiles - 1 else _latitude_of_row_edge((row + 1) * 256, map_size)
+        high, low = min(top, north), max(bottom, south)
+        if low > high:
+            continue
+
+        phi = min(max(widest, low), high)
+        cos_product = math.cos(latitude) * math.cos(phi)
+        if cos_product <= 0:
+            half_width = math.pi
+        else:
+            ratio = (math.cos(delta) - math.sin(latitude) * math.sin(phi)) / cos_product
+            half_width = math.acos(min(max(ratio, -1), 1))
+
+        if half_width >= math.pi:
+            yield row, 0, tiles - 1
+            continue
+
+        west = int(math.floor((longitude - math.degrees(half_width) + 180) / 360 * tiles))
+        east = int(math.floor((longitude + math.degrees(half_width) + 180) / 360 * tiles))
+        if east - west >= tiles - 1:
+            yield row, 0, tiles - 1
+        elif west < 0:
+            yield row, 0, east
+            yield row, west + tiles, tiles - 1
+        elif east >= tiles:
+            yield row, 0, east - tiles
+            yield row, west, tiles - 1
+        else:
+            yield row, west, east
+
+
+def disc_tiles(center, radius, zoom_level):
+    """ (tile_x, tile_y) of every tile intersecting a great-circle disc, row by row """
+    return _expand(disc_spans(center, radius, zoom_level))
+
+
+def _expand(spans):
+    for y, start, stop in spans:
+        for x in range(start, stop + 1):
+            yield x, y
+
+
+def polyline_tiles(points, zoom_level):
+    """ (tile_x, tile_y) of every tile crossed by a polyline, row by row """
+    return _expand(polyline_spans(points, zoom_level))
+
+
+def polygon_tiles(exterior, zoom_level, holes=()):
+    """ (tile_x, tile_y) of every tile intersecting a polygon, row by row """
+    return _expand(polygon_spans(exterior, zoom_level, holes))
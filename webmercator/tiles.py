@@ -0,0 +1,236 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Tile pyramid navigation: parents, children and descendants of (tile_x, tile_y, zoom_level) tiles.
+
+Also tile envelopes, in degrees, Web Mercator meters and pixels. Degrees and pixels are the values `Point` gives for
+the corners; meters are the exact projection of the tile edges, rounded to 1 nm, rather than the meters of those
+corner points, which carry the rounding of their degrees.
+"""
+from __future__ import division
+
+import math
+from collections import OrderedDict
+
+from webmercator.grid import Grid
+from webmercator.precision import EXACT
+from webmercator.util import EARTH_CIRCUMFERENCE_METERS
+
+
+def _check_zoom(zoom_level):
+    if not 0 <= zoom_level <= 23:
+        raise ValueError('Zoom level {} is outside 0..23'.format(zoom_level))
+
+
+def parent(tile_x, tile_y, zoom_level, parent_zoom=None):
+    """
+    Tile containing this one at a lower zoom level
+
+    :param parent_zoom: zoom level of the parent, defaults to one level up
+    :return: (tile_x, tile_y, zoom_level)
+    """
+    parent_zoom = zoom_level - 1 if parent_zoom is None else parent_zoom
+    _check_zoom(parent_zoom)
+    if parent_zoom > zoom_level:
+        raise ValueError('Parent zoom level {} is below zoom level {}'.format(parent_zoom, zoom_level))
+
+    shift = zoom_level - parent_zoom
+    return tile_x >> shift, tile_y >> shift, parent_zoom
+
+
+def children(tile_x, tile_y, zoom_level):
+    """ The four tiles one zoom level down, in quadkey order """
+    _check_zoom(zoom_level + 1)
+    x, y = tile_x << 1, tile_y << 1
+    z = zoom_level + 1
+    return [(x, y, z), (x + 1, y, z), (x, y + 1, z), (x + 1, y + 1, z)]
+
+
+def descendant_grid(tile_x, tile_y, zoom_level, descendant_zoom):
+    """ Grid of every tile under this one at `descendant_zoom` """
+    _check_zoom(descendant_zoom)
+    if descendant_zoom < zoom_level:
+        raise ValueError('Descendant zoom level {} is above zoom level {}'.format(descendant_zoom, zoom_level))
+
+    return Grid(vertex=(tile_x, tile_y), width=0, height=0, zoom_level=zoom_level).at_zoom(descendant_zoom)
+
+
+def descendants(tile_x, tile_y, zoom_level, max_zoom, min_zoom=None):
+    """
+    Stream the tiles under this one from `min_zoom` (default: one level down) to `max_zoom`
+
+    :return: generator of (tile_x, tile_y, zoom_level), zoom level by zoom level
+    """
+    min_zoom = zoom_level + 1 if min_zoom is None else max(min_zoom, zoom_level)
+    for z in range(min_zoom, max_zoom + 1):
+        for x, y in descendant_grid(tile_x, tile_y, zoom_level, z):
+            yield x, y, z
+
+
+def coverage(grid, min_zoom, max_zoom, order='row'):
+    """
+    Stream the tiles covering a zoom-aware `Grid` at every zoom level from `min_zoom` to `max_zoom`
+
+    :param order: order of the tiles within each zoom level, see `Grid.walk`
+    :return: generator of (tile_x, tile_y, zoom_level), zoom level by zoom level
+    """
+    for level in grid.pyramid(min_zoom, max_zoom):
+        for x, y in level.walk(order):
+            yield x, y, level.zoom_level
+
+
+def _check_tile(tile_x, tile_y, zoom_level):
+    _check_zoom(zoom_level)
+    tiles = 2 ** zoom_level
+    if not (0 <= tile_x < tiles and 0 <= tile_y < tiles):
+        raise ValueError('Tile ({}, {}) is outside zoom level {}'.format(tile_x, tile_y, zoom_level))
+    return tiles
+
+
+def pixel_bounds(tile_x, tile_y, zoom_level):
+    """ (min_pixel_x, min_pixel_y, max_pixel_x, max_pixel_y) of the tile edges; pixel y grows southward """
+    _check_tile(tile_x, tile_y, zoom_level)
+    return tile_x * 256, tile_y * 256, (tile_x + 1) * 256, (tile_y + 1) * 256
+
+
+def meter_bounds(tile_x, tile_y, zoom_level):
+    """ (min_meter_x, min_meter_y, max_meter_x, max_meter_y) of the tile edges """
+    tiles = _check_tile(tile_x, tile_y, zoom_level)
+
+    def meters(edge):
+        return round(edge * EARTH_CIRCUMFERENCE_METERS, EXACT.metric_digits)
+
+    return (meters(tile_x / tiles - 0.5), meters(0.5 - (tile_y + 1) / tiles),
+            meters((tile_x + 1) / tiles - 0.5), meters(0.5 - tile_y / tiles))
+
+
+def geo_bounds(tile_x, tile_y, zoom_level):
+    """
+    (min_latitude, max_latitude, min_longitude, max_longitude) of the tile edges, ordered as `BoundingBox.extents`
+
+    Same values as the `Point(tile_x=..., tile_y=...)` corners, without building points; zoom level 0 included.
+    """
+    tiles = _check_tile(tile_x, tile_y, zoom_level)
+
+    def longitude(edge):
+        return round(360 * (edge / tiles - 0.5), EXACT.degree_digits)
+
+    def latitude(edge):
+        return round(90 - 360 * math.atan(math.exp(-1 * (0.5 - edge / tiles) * 2 * math.pi)) / math.pi,
+                     EXACT.degree_digits)
+
+    return latitude(tile_y + 1), latitude(tile_y), longitude(tile_x), longitude(tile_x + 1)
+
+
+class TileBoundsCache(object):
+    """
+    Bounded LRU cache in front of `geo_bounds`, `meter_bounds` and `pixel_bounds`, for tiles requested repeatedly
+
+    :param maxsize: envelopes kept, least recently used evicted first; None for no bound
+    """
+
+    def __init__(self, maxsize=4096):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('Cache size must be positive')
+
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.__entries = OrderedDict()
+
+    def __repr__(self):
+        return '<TileBoundsCache {}/{}, hits: {}, misses: {}>'.format(len(self), self.maxsize, self.hits,
+                                                                      self.misses)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def clear(self):
+        self.__entries.clear()
+        self.hits = self.misses = 0
+
+    def _lookup(self, bounds, tile_x, tile_y, zoom_level):
+        key = (bounds, tile_x, tile_y, zoom_level)
+        entries = self.__entries
+        if key in entries:
+            self.hits += 1
+            value = entries[key] = entries.pop(key)
+            return value
+
+        value = bounds(tile_x, tile_y, zoom_level)
+        self.misses += 1
+        entries[key] = value
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return value
+
+    def geo_bounds(self, tile_x, tile_y, zoom_level):
+        return self._lookup(geo_bounds, tile_x, tile_y, zoom_level)
+
+    def meter_bounds(self, tile_x, tile_y, zoom_level):
+        return self._lookup(meter_bounds, tile_x, tile_y, zoom_level)
+
+    def pixel_bounds(self, tile_x, tile_y, zoom_level):
+        return self._lookup(pixel_bounds, tile_x, tile_y, zoom_level)
+
+
+def _lowest(values):
+    return values.min() if hasattr(values, 'min') else min(values)
+
+
+def _highest(values):
+    return values.max() if hasattr(values, 'max') else max(values)
+
+
+def _edges(tile_x, tile_y, zoom_level, backend):
+    # imported here, as the batch module builds on top of this one
+    from webmercator.batch import get_backend
+
+    _check_zoom(zoom_level)
+    backend = get_backend(backend)
+    tile_x, tile_y = backend.ints(tile_x), backend.ints(tile_y)
+    for x, y in ((_lowest(tile_x), _lowest(tile_y)), (_highest(tile_x), _highest(tile_y))) if len(tile_x) else ():
+        _check_tile(x, y, zoom_level)
+
+    west, east = backend.tile_edges(tile_x)
+    north, south = backend.tile_edges(tile_y)
+    return backend, west, north, east, south
+
+
+def pixel_bounds_array(tile_x, tile_y, zoom_level, backend=None):
+    """ `pixel_bounds` of many tiles at one zoom level, as four arrays """
+    _, west, north, east, south = _edges(tile_x, tile_y, zoom_level, backend)
+    return west, north, east, south
+
+
+def meter_bounds_array(tile_x, tile_y, zoom_level, backend=None):
+    """ `meter_bounds` of many tiles at one zoom level, as four arrays """
+    backend, west, north, east, south = _edges(tile_x, tile_y, zoom_level, backend)
+    return (backend.meter_x_from_pixel_x(west, zoom_level), backend.meter_y_from_pixel_y(south, zoom_level),
+            backend.meter_x_from_pixel_x(east, zoom_level), backend.meter_y_from_pixel_y(north, zoom_level))
+
+
+def geo_bounds_array(tile_x, tile_y, zoom_level, backend=None):
+    """ `geo_bounds` of many tiles at one zoom level, as four arrays """
+    backend, west, north, east, south = _edges(tile_x, tile_y, zoom_level, backend)
+    return (backend.latitude_from_pixel_y(south, zoom_level), backend.latitude_from_pixel_y(north, zoom_level),
+            backend.longitude_from_pixel_x(west, zoom_level), backend.longitude_from_pixel_x(east, zoom_level))
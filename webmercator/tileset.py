@@ -0,0 +1,306 @@
+# MIT License
+#
+# Copyright (c) 2018 Republic Wireless
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Compact, immutable sets of tiles, stored as runs of columns per row.
+
+Memory grows with the number of runs, roughly the height of a shape times its holes and notches, never with its
+area. Set algebra merges the runs of each row, so combining coverage never touches individual tiles.
+"""
+import heapq
+from array import array
+from bisect import bisect_right
+
+from webmercator.grid import Grid
+
+try:
+    array('q')
+    _TYPECODE = 'q'
+except ValueError:  # pragma: no cover
+    _TYPECODE = 'l'
+
+
+def _pairs(runs):
+    """ (start, stop) pairs of a flat run array """
+    return zip(runs[::2], runs[1::2])
+
+
+def _coalesce(pairs):
+    """ Flat run array of sorted (start, stop) pairs, merging overlapping and adjacent runs """
+    runs = array(_TYPECODE)
+    for start, stop in pairs:
+        if runs and start <= runs[-1] + 1:
+            if stop > runs[-1]:
+                runs[-1] = stop
+        else:
+            runs.append(start)
+            runs.append(stop)
+    return runs
+
+
+def _intersect(a, b):
+    runs = array(_TYPECODE)
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start, stop = max(a[i], b[j]), min(a[i + 1], b[j + 1])
+        if start <= stop:
+            runs.append(start)
+            runs.append(stop)
+        if a[i + 1] < b[j + 1]:
+            i += 2
+        else:
+            j += 2
+    return runs
+
+
+def _subtract(a, b):
+    runs = array(_TYPECODE)
+    j = 0
+    for start, stop in _pairs(a):
+        while j < len(b) and b[j + 1] < start:
+            j += 2
+
+        k = j
+        while k < len(b) and b[k] <= stop:
+            if b[k] > start:
+                runs.append(start)
+                runs.append(b[k] - 1)
+            start = max(start, b[k + 1] + 1)
+            k += 2
+
+        if start <= stop:
+            runs.append(start)
+            runs.append(stop)
+    return runs
+
+
+def _count(runs):
+    return sum(runs[1::2]) - sum(runs[::2]) + len(runs) // 2
+
+
+class TileSet(object):
+    """
+    Immutable set of (tile_x, tile_y) tiles, optionally at a known `zoom_level`.
+
+    Built from `(tile_y, min_tile_x, max_tile_x)` spans, as `webmercator.shapes` returns them, or with `from_grid`,
+    `from_grids` and `from_tiles`. Supports `|`, `&`, `-` and `^`, `len`, membership and row-major iteration, the
+    order of `Grid`.
+    """
+
+    def __init__(self, spans=(), zoom_level=None):
+        self.zoom_level = zoom_level
+
+        by_row = {}
+        for y, start, stop in spans:
+            if start <= stop:
+                by_row.setdefault(y, []).append((start, stop))
+
+        self.__rows = dict((y, _coalesce(sorted(pairs))) for y, pairs in by_row.items())
+        self.__size = None
+
+    @classmethod
+    def _from_rows(cls, rows, zoom_level):
+        tile_set = cls(zoom_level=zoom_level)
+        tile_set.__rows = dict((y, runs) for y, runs in rows.items() if runs)
+        return tile_set
+
+    @classmethod
+    def from_grid(cls, grid):
+        """ Every tile of a `Grid`, at its zoom level """
+        return cls.from_grids([grid])
+
+    @classmethod
+    def from_grids(cls, grids, zoom_level=None):
+        """ Union of many `Grid` ranges in one pass, at their shared zoom level unless given """
+        grids = list(grids)
+        if zoom_level is None:
+            zoom_level = _shared_zoom(*(g.zoom_level for g in grids))
+
+        spans = ((y, g.min_x, g.max_x) for g in grids if len(g) for y in range(g.min_y, g.max_y + 1))
+        return cls(spans, zoom_level)
+
+    @classmethod
+    def from_tiles(cls, tiles, zoom_level=None):
+        """ From an iterable of (tile_x, tile_y) """
+        return cls(((y, x, x) for x, y in tiles), zoom_level)
+
+    def __repr__(self):
+        return '<TileSet of {} tiles in {} runs, zoom_level: {}>'.format(len(self), self.run_count, self.zoom_level)
+
+    def __len__(self):
+        if self.__size is None:
+            self.__size = sum(_count(runs) for runs in self.__rows.values())
+        return self.__size
+
+    def __bool__(self):
+        return bool(self.__rows)
+
+    __nonzero__ = __bool__
+
+    def __contains__(self, tile):
+        try:
+            x, y = tile
+        except (TypeError, ValueError):
+            return False
+
+        runs = self.__rows.get(y)
+        if runs is None:
+            return False
+
+        # index of the last run boundary at or before x; inside a run when it is a start
+        i = bisect_right(runs, x) - 1
+        return i >= 0 and (i % 2 == 0 or runs[i] == x)
+
+    def __iter__(self):
+        for y, start, stop in self.spans():
+            for x in range(start, stop + 1):
+                yield x, y
+
+    def __eq__(self, other):
+        if not isinstance(other, TileSet):
+            return NotImplemented
+        return self.zoom_level == other.zoom_level and self.__rows == other.__rows
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash((self.zoom_level, tuple(self.spans())))
+
+    @property
+    def run_count(self):
+        """ Number of runs stored, the measure of memory use """
+        return sum(len(runs) // 2 for runs in self.__rows.values())
+
+    @property
+    def bounds(self):
+        """ Smallest `Grid` holding every tile """
+        if not self.__rows:
+            return Grid(vertex=(0, 0), width=-1, height=-1, zoom_level=self.zoom_level)
+
+        min_x = min(runs[0] for runs in self.__rows.values())
+        max_x = max(runs[-1] for runs in self.__rows.values())
+        min_y, max_y = min(self.__rows), max(self.__rows)
+        return Grid(vertex=(min_x, min_y), width=max_x - min_x, height=max_y - min_y, zoom_level=self.zoom_level)
+
+    def spans(self):
+        """ Runs as (tile_y, min_tile_x, max_tile_x), inclusive and sorted by row then column """
+        for y in sorted(self.__rows):
+            for start, stop in _pairs(self.__rows[y]):
+                yield y, start, stop
+
+    def spans_at(self, zoom_level):
+        """
+        Runs of the set at another zoom level, streamed in `spans` order: parents when zooming out, every child when
+        zooming in. Only one source row is expanded at a time, so large zoom-ins use little memory.
+        """
+        if self.zoom_level is None:
+            raise ValueError('Tile set has no zoom level')
+
+        if zoom_level >= self.zoom_level:
+            shift = zoom_level - self.zoom_level
+            for y in sorted(self.__rows):
+                runs = [((start << shift), ((stop + 1) << shift) - 1) for start, stop in _pairs(self.__rows[y])]
+                for child_y in range(y << shift, (y + 1) << shift):
+                    for start, stop in runs:
+                        yield child_y, start, stop
+            return
+
+        shift = self.zoom_level - zoom_level
+        parent_y, pairs = None, []
+        for y in sorted(self.__rows) + [None]:
+            if y is None or y >> shift != parent_y:
+                for start, stop in _pairs(_coalesce(sorted(pairs))):
+                    yield parent_y, start, stop
+                if y is None:
+                    break
+                parent_y, pairs = y >> shift, []
+
+            pairs.extend((start >> shift, stop >> shift) for start, stop in _pairs(self.__rows[y]))
+
+    def at_zoom(self, zoom_level):
+        """ The set at another zoom level, by bit shifts only, as `Grid.at_zoom` """
+        return TileSet(self.spans_at(zoom_level), zoom_level)
+
+    def grids(self):
+        """ Disjoint `Grid` rectangles covering the set, stacking identical runs of consecutive rows """
+        open_runs = {}
+        for y in sorted(self.__rows) + [None]:
+            current = list(_pairs(self.__rows[y])) if y is not None else []
+            for run in sorted(open_runs):
+                top, last = open_runs[run]
+                if run not in current or last != y - 1:
+                    del open_runs[run]
+                    yield Grid(vertex=(run[0], top), width=run[1] - run[0], height=last - top,
+                               zoom_level=self.zoom_level)
+
+            for run in current:
+                top = open_runs[run][0] if run in open_runs else y
+                open_runs[run] = (top, y)
+
+    def _zoom_with(self, other):
+        if not isinstance(other, TileSet):
+            raise TypeError('Did not provide valid tile set type')
+        return _shared_zoom(self.zoom_level, other.zoom_level)
+
+    def union(self, other):
+        zoom_level = self._zoom_with(other)
+        rows = dict(self.__rows)
+        for y, runs in other.__rows.items():
+            rows[y] = _coalesce(heapq.merge(_pairs(rows[y]), _pairs(runs))) if y in rows else runs
+        return TileSet._from_rows(rows, zoom_level)
+
+    def intersection(self, other):
+        zoom_level = self._zoom_with(other)
+        common = set(self.__rows).intersection(other.__rows)
+        return TileSet._from_rows(dict((y, _intersect(self.__rows[y], other.__rows[y])) for y in common), zoom_level)
+
+    def difference(self, other):
+        zoom_level = self._zoom_with(other)
+        rows = dict(self.__rows)
+        for y in set(rows).intersection(other.__rows):
+            rows[y] = _subtract(rows[y], other.__rows[y])
+        return TileSet._from_rows(rows, zoom_level)
+
+    def symmetric_difference(self, other):
+        return self.difference(other).union(other.difference(self))
+
+    def isdisjoint(self, other):
+        return not self.intersection(other)
+
+    def issubset(self, other):
+        return not self.difference(other)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+    __le__ = issubset
+
+
+def _shared_zoom(*zoom_levels):
+    """ The one zoom level among those known """
+    known = set(z for z in zoom_levels if z is not None)
+    if len(known) > 1:
+        raise ValueError('Tile sets are at different zoom levels: {}'.format(sorted(known)))
+    return known.pop() if known else None
@@ -28,4 +28,6 @@ RAD_METERS = EARTH_RADIUS_METERS  # deprecated
 EARTH_CIRCUMFERENCE_METERS = EARTH_RADIUS_METERS * 2 * math.pi
 CIRC_METERS = EARTH_CIRCUMFERENCE_METERS  # deprecated
 
+EARTH_RADIUS_MILES = 3959.0
+
 MERCATOR_MAX_LATITUDE = 85.05112878